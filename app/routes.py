@@ -1,9 +1,13 @@
-from flask import Blueprint, render_template, request, jsonify, session, send_file, url_for
-from app.utils.search import get_search_results
-from app.utils.topic_modeling import perform_lda, generate_lda_model, preprocess_text
+from flask import Blueprint, render_template, request, jsonify, session, send_file
+from app.settings import get_config, get_config_error
+from app.utils.search import get_search_results, get_search_cache_stats
+from app.utils.search_providers import get_provider, get_fanout_provider_names
+from app.utils.topic_modeling import generate_document_topics, preprocess_many, get_lemma_cache_stats
 from app.utils.content_extractor import extract_content
+from app.utils.deadline import create_request_deadline
+from app.utils.token_cache import get_token_cache_stats
+from app.utils.dedup import remove_near_duplicates
 import json
-import importlib.util
 import traceback
 import io
 import os
@@ -19,31 +23,29 @@ main = Blueprint('main', __name__)
 def get_api_status():
     """API 키 상태를 확인하고 반환합니다."""
     try:
-        spec = importlib.util.spec_from_file_location("config", "config.py")
-        config = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(config)
+        config = get_config()
+        config_error = get_config_error()
+        if config_error:
+            return {"status": "error", "message": f"설정 파일 로드 중 오류: {config_error}"}
         
         # 사용 중인 검색 API 확인
         search_api = getattr(config, "SEARCH_API", "serpapi").lower()
         
-        if search_api == "google_cse":
-            api_key = getattr(config, "GOOGLE_API_KEY", "")
-            cse_id = getattr(config, "GOOGLE_CSE_ID", "")
-            
-            if not api_key or api_key == "여기에_당신의_GOOGLE_API_키를_입력하세요":
-                return {"status": "error", "message": "Google API 키가 설정되지 않았습니다."}
-            
-            if not cse_id or cse_id == "여기에_당신의_검색엔진_ID를_입력하세요":
-                return {"status": "error", "message": "Google 검색 엔진 ID가 설정되지 않았습니다."}
+        if search_api == "fanout":
+            # 여러 API를 동시에 사용하는 경우 하나 이상 설정되어 있으면 됨
+            providers = [get_provider(name, config) for name in get_fanout_provider_names(config)]
+            messages = [provider.check() for provider in providers]
+            if all(messages):
+                return {"status": "error", "message": " ".join(messages) or "fanout 모드에서 사용할 검색 API가 없습니다."}
                 
-            return {"status": "ok", "api": "google_cse"}
-        else:
-            api_key = getattr(config, "SERPAPI_KEY", "")
+            return {"status": "ok", "api": "fanout"}
+        
+        provider = get_provider(search_api, config)
+        message = provider.check()
+        if message:
+            return {"status": "error", "message": message}
             
-            if not api_key or api_key == "여기에_당신의_SERPAPI_키를_입력하세요":
-                return {"status": "error", "message": "SerpAPI 키가 설정되지 않았습니다."}
-                
-            return {"status": "ok", "api": "serpapi"}
+        return {"status": "ok", "api": provider.name}
             
     except Exception as e:
         return {"status": "error", "message": f"설정 파일 로드 중 오류: {str(e)}"}
@@ -73,85 +75,111 @@ def search():
     
     print(f"검색 요청 처리 중: 쿼리='{query}', 언어='{language}'")
     
+    # 요청 전체 시간 예산 (검색/추출/모델링 단계에 나누어 사용)
+    deadline = create_request_deadline()
+    
     try:
         # 검색 결과 가져오기 (10개로 제한)
-        results = get_search_results(query, language, num_results=40)
+        deadline.start_stage('search')
+        results = get_search_results(query, language, num_results=40, deadline=deadline)
         print(f"검색 결과 {len(results)}개를 가져왔습니다.")
         
         if not results:
-            if api_status["api"] == "google_cse":
+            if api_status["api"] == "fanout":
+                return jsonify({"error": "SerpAPI와 Google Custom Search API 모두에서 검색 결과를 가져올 수 없습니다. API 설정을 확인하세요."}), 500
+            elif api_status["api"] == "replay":
+                return jsonify({"error": "이 검색어에 대한 녹화된 검색 결과가 없습니다. REPLAY_DIR과 REPLAY_MATCH 설정을 확인하세요."}), 500
+            elif api_status["api"] == "google_cse":
                 return jsonify({"error": "Google Custom Search API에서 검색 결과를 가져올 수 없습니다. API 키와 검색 엔진 ID를 확인하세요."}), 500
             else:
                 return jsonify({"error": "SerpAPI에서 검색 결과를 가져올 수 없습니다. API 키를 확인하세요."}), 500
         
-        # 검색 결과를 JSON 파일로 저장
+        # 검색 결과를 JSON 파일로 저장 (녹화본 재생 중에는 같은 결과를 다시 녹화하지 않음)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         result_filename = f"{query}_{timestamp}"
-        search_results_file = os.path.join(RESULTS_DIR, f"{result_filename}_search_results.json")
-        
-        with open(search_results_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        search_results_file = None
+        if api_status["api"] != "replay":
+            search_results_file = os.path.join(RESULTS_DIR, f"{result_filename}_search_results.json")
+            with open(search_results_file, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
         
-        # 검색 결과에서 콘텐츠 추출
-        content_list = extract_content(results)
-        print(f"추출된 콘텐츠 길이: {len(content_list)}")
+        # 검색 결과에서 콘텐츠 추출 (목표 문서 수가 모이거나 예산이 끝나면 중단)
+        deadline.start_stage('extraction')
+        documents = extract_content(results, deadline)
+        print(f"추출된 콘텐츠 길이: {len(documents)}")
         
         # 추출된 콘텐츠를 JSON 파일로 저장
-        content_data = [{"url": result.get("url", ""), "content_preview": content[:500]} 
-                       for result, content in zip(results[:len(content_list)], content_list)]
+        content_data = [document.to_dict() for document in documents]
         
         content_file = os.path.join(RESULTS_DIR, f"{result_filename}_extracted_content.json")
         with open(content_file, 'w', encoding='utf-8') as f:
             json.dump(content_data, f, ensure_ascii=False, indent=2)
         
-        if not content_list:
+        if not documents:
             return jsonify({"error": "검색 결과에서 콘텐츠를 추출할 수 없습니다."}), 500
         
         # 주제 모델링
-        num_topics = 5  # 항상 5개 토픽으로 고정
+        deadline.start_stage('modeling')
+        num_topics = 5  # 기본 5개 토픽 (LDA_AUTO_TOPICS가 켜져 있으면 후보 중에서 선택)
         print(f"LDA 모델링 중... 주제 수: {num_topics}")
         
         # 유효한 콘텐츠만 필터링
-        valid_content_list = []
-        valid_urls = []
-        for i, (content, result) in enumerate(zip(content_list, results)):
-            if isinstance(content, str) and len(content.strip()) > 100:
-                valid_content_list.append(content)
-                valid_urls.append(result.get("url", ""))
+        valid_documents = [document for document in documents if len(document.content.strip()) > 100]
         
         # 콘텐츠가 없으면 오류 반환
-        if not valid_content_list:
+        if not valid_documents:
             return jsonify({"error": "유효한 콘텐츠를 추출할 수 없습니다."}), 500
+        
+        # 거의 같은 문서(전재·미러 페이지)는 묶음마다 하나만 남김
+        kept_indices, duplicate_clusters = remove_near_duplicates([document.content for document in valid_documents])
+        duplicates = [
+            {
+                "kept": valid_documents[cluster["kept"]].url,
+                "dropped": [valid_documents[i].url for i in cluster["dropped"]],
+                "similarity": cluster["similarity"]
+            }
+            for cluster in duplicate_clusters
+        ]
+        valid_documents = [valid_documents[i] for i in kept_indices]
+        if duplicates:
+            print(f"거의 같은 문서 {len(duplicate_clusters)}개 묶음에서 "
+                  f"{sum(len(cluster['dropped']) for cluster in duplicate_clusters)}개 제거")
             
-        # 각 콘텐츠를 개별적으로 전처리하고 결과 토큰을 합침
+        # 모든 콘텐츠를 작업 프로세스 풀에서 함께 전처리하고 결과 토큰을 합침
+        # (예산이 끝나면 이미 전처리한 문서로만 모델링)
         all_tokens = []
         token_analysis = {}
-        processed_contents = []
+        processed_documents = []
+        token_lists = preprocess_many([document.content for document in valid_documents], language,
+                                      timeout=deadline.stage_remaining())
         
-        for i, content in enumerate(valid_content_list):
-            try:
-                tokens = preprocess_text(content, language)
-                if tokens and len(tokens) > 5:  # 최소 토큰 수 확인
-                    all_tokens.extend(tokens)
-                    processed_contents.append(tokens)
-                    # 토큰 빈도 분석 저장
-                    token_freq = {}
-                    for token in tokens:
-                        if token in token_freq:
-                            token_freq[token] += 1
-                        else:
-                            token_freq[token] = 1
-                    token_analysis[f"content_{i+1}"] = {
-                        "tokens_count": len(tokens),
-                        "top_tokens": sorted(token_freq.items(), key=lambda x: x[1], reverse=True)[:20]
-                    }
-                    print(f"콘텐츠 #{i+1}: {len(tokens)}개 토큰 추출")
-                else:
-                    print(f"콘텐츠 #{i+1}: 토큰 추출 실패 또는 토큰 부족")
-                    processed_contents.append([])
-            except Exception as e:
-                print(f"콘텐츠 #{i+1} 처리 중 오류: {str(e)}")
-                processed_contents.append([])
+        for i, (document, tokens) in enumerate(zip(valid_documents, token_lists)):
+            if tokens is None:
+                continue
+            
+            processed_documents.append(document)
+            document.tokens = []
+            if tokens and len(tokens) > 5:  # 최소 토큰 수 확인
+                all_tokens.extend(tokens)
+                document.tokens = tokens
+                # 토큰 빈도 분석 저장
+                token_freq = {}
+                for token in tokens:
+                    if token in token_freq:
+                        token_freq[token] += 1
+                    else:
+                        token_freq[token] = 1
+                token_analysis[f"content_{i+1}"] = {
+                    "tokens_count": len(tokens),
+                    "top_tokens": sorted(token_freq.items(), key=lambda x: x[1], reverse=True)[:20]
+                }
+                print(f"콘텐츠 #{i+1}: {len(tokens)}개 토큰 추출")
+            else:
+                print(f"콘텐츠 #{i+1}: 토큰 추출 실패 또는 토큰 부족")
+        
+        if len(processed_documents) < len(valid_documents):
+            deadline.note_cut('modeling', 'deadline',
+                              skipped_documents=len(valid_documents) - len(processed_documents))
         
         print(f"전처리된 텍스트 길이: {len(all_tokens)} 토큰")
         
@@ -169,8 +197,15 @@ def search():
         if len(all_tokens) < 10:
             return jsonify({"error": "추출된 콘텐츠가 주제 모델링에 충분하지 않습니다."}), 500
         
-        # 토픽 모델링 수행 - 무조건 5개 토픽으로 설정
-        topics = generate_lda_model(all_tokens, 5, language)
+        # 토픽 모델링 수행
+        # 문서별 코퍼스로 모델을 한 번 학습하여 토픽과 URL별 토픽 분포를 함께 계산
+        # (모델링 단계 예산이 끝나면 반복 학습을 더 하지 않음)
+        topics, doc_topic_lists, lda_training = generate_document_topics(
+            [document.tokens for document in processed_documents], num_topics, language,
+            timeout=deadline.stage_remaining())
+        if lda_training.get("timed_out"):
+            deadline.note_cut('modeling', 'deadline', skipped='lda_passes',
+                              passes_run=lda_training["passes_run"], max_passes=lda_training["max_passes"])
         
         if not topics:
             return jsonify({"error": "주제 모델링을 생성할 수 없습니다."}), 500
@@ -183,48 +218,24 @@ def search():
             topic_data.append({
                 "id": topic_id,
                 "keywords": keywords,
-                "weight": weight
+                "weight": float(weight)
             })
             
-        # 각 URL별 토픽 분포 계산
+        # 각 URL별 토픽 분포 정리
         url_topic_distribution = []
-        
-        # LDA 모델을 재활용하여 각 문서에 대한 토픽 분포 계산
-        from gensim import corpora, models
-        
-        # 사전 생성
-        dictionary = corpora.Dictionary(processed_contents)
-        dictionary.filter_extremes(no_below=1, no_above=0.9)
-        
-        # 각 문서를 BoW로 변환
-        corpus = [dictionary.doc2bow(text) for text in processed_contents]
-        
-        # LDA 모델 훈련
-        lda_model = models.LdaModel(
-            corpus=corpus,
-            id2word=dictionary,
-            num_topics=5,
-            passes=15,
-            iterations=50,
-            alpha='auto'
-        )
-        
-        # 각 문서의 토픽 분포 계산
-        for i, (url, doc_bow) in enumerate(zip(valid_urls, corpus)):
-            if not doc_bow:  # 빈 BoW인 경우 건너뜀
+        for document, doc_topics in zip(processed_documents, doc_topic_lists):
+            if doc_topics is None:  # 빈 BoW인 경우 건너뜀
                 continue
-                
-            doc_topics = lda_model.get_document_topics(doc_bow)
             
             # 토픽 분포 정보 저장
             url_data = {
-                "url": url,
-                "title": next((r.get("title", "") for r in results if r.get("url") == url), ""),
+                "url": document.url,
+                "title": document.title,
                 "topic_distribution": [
                     {"topic_id": topic_id, "weight": float(weight)}
                     for topic_id, weight in doc_topics
                 ],
-                "content_preview": valid_content_list[i][:300] + "..." if i < len(valid_content_list) else ""
+                "content_preview": document.preview[:300] + "..."
             }
             url_topic_distribution.append(url_data)
         
@@ -239,13 +250,20 @@ def search():
                 "top_tokens": top_tokens[:50]
             },
             "url_topic_distribution": url_topic_distribution,  # URL별 토픽 분포 정보 추가
+            "lda_training": lda_training,  # 학습 엔진, 실제 반복 횟수, 수렴 여부, 자동 선택한 토픽 수 후보별 점수
+            "duplicates": duplicates,  # 제거된 거의 같은 문서 묶음
+            "search_cache": get_search_cache_stats(),  # 검색 결과 캐시 적중/실패 통계
+            "token_cache": get_token_cache_stats(),  # 전처리 결과(토큰) 캐시 적중/실패 통계
+            "deadline": deadline.report(),  # 단계별 시간 예산과 생략된 작업
             "timestamp": timestamp,
             "saved_files": {
-                "search_results": os.path.basename(search_results_file),
+                "search_results": os.path.basename(search_results_file) if search_results_file else None,
                 "extracted_content": os.path.basename(content_file),
                 "analysis_result": f"{result_filename}_lda_analysis.json"
             }
         }
+        if language == 'en':
+            result_data["lemma_cache"] = get_lemma_cache_stats()  # 표제어 캐시 적중률 (요청 간 누적)
         
         # LDA 분석 결과 저장
         analysis_file = os.path.join(RESULTS_DIR, f"{result_filename}_lda_analysis.json")
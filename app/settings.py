@@ -0,0 +1,130 @@
+import importlib.util
+import json
+import os
+import threading
+import time
+
+# 설정 파일 경로 (빈 문자열이면 파일을 읽지 않고 환경 변수만 사용)
+CONFIG_PATH = os.environ.get('SEOX_CONFIG_PATH', 'config.py')
+
+# SEOX_<이름> 환경 변수가 config.py의 <이름> 값을 덮어씀 (예: SEOX_SERPAPI_KEY)
+ENV_PREFIX = 'SEOX_'
+_RESERVED_ENV = {'SEOX_CONFIG_PATH', 'SEOX_CONFIG_CHECK_INTERVAL'}
+
+# 파일 수정 시각 확인 간격(초) - 요청마다 stat 호출을 하지 않도록 제한
+CHECK_INTERVAL = float(os.environ.get('SEOX_CONFIG_CHECK_INTERVAL', '2'))
+
+
+class Settings:
+    """
+    설정 값 스냅샷
+
+    config.py 모듈처럼 getattr(settings, "SERPAPI_KEY", "") 형태로 사용합니다.
+    다시 로드될 때는 새 객체가 만들어지므로 한 요청 안에서는 값이 바뀌지 않습니다.
+    """
+
+    def __init__(self, values=None):
+        self.__dict__.update(values or {})
+
+    def __repr__(self):
+        return f"Settings({sorted(self.__dict__)})"
+
+
+_lock = threading.Lock()
+_settings = None
+_load_error = None
+_mtime = None
+_last_check = 0.0
+
+
+def _parse_env_value(value):
+    """환경 변수 값 변환 (숫자/불리언/리스트는 JSON으로 해석, 나머지는 문자열)"""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _env_overrides():
+    return {
+        name[len(ENV_PREFIX):]: _parse_env_value(value)
+        for name, value in os.environ.items()
+        if name.startswith(ENV_PREFIX) and name not in _RESERVED_ENV
+    }
+
+
+def _read_config_file(path):
+    """config.py를 실행하여 대문자 이름의 설정 값만 추출"""
+    spec = importlib.util.spec_from_file_location("config", path)
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    return {name: value for name, value in vars(config).items() if name.isupper()}
+
+
+def _reload(mtime):
+    global _settings, _load_error, _mtime
+
+    values = {}
+    if mtime is not None:
+        try:
+            values = _read_config_file(CONFIG_PATH)
+            _load_error = None
+        except Exception as e:
+            print(f"config.py 파일을 로드하는 중 오류 발생: {str(e)}")
+            # 이전에 정상적으로 로드한 설정이 있으면 계속 사용
+            if _settings is not None and _load_error is None:
+                _mtime = mtime
+                return
+            _load_error = str(e)
+    elif CONFIG_PATH:
+        _load_error = f"설정 파일을 찾을 수 없습니다: {CONFIG_PATH}"
+    else:
+        _load_error = None
+
+    overrides = _env_overrides()
+    values.update(overrides)
+    if overrides and _load_error and mtime is None:
+        # 환경 변수만으로 설정하는 경우 파일이 없어도 오류가 아님
+        _load_error = None
+
+    _settings = Settings(values)
+    _mtime = mtime
+
+
+def get_config():
+    """
+    현재 설정 반환
+
+    최초 호출 시 config.py를 로드하여 메모리에 보관하고, 이후에는
+    CHECK_INTERVAL마다 파일 수정 시각만 확인하여 바뀐 경우에만 다시 로드합니다.
+
+    Returns:
+        Settings: 설정 값 객체
+    """
+    global _last_check
+
+    now = time.monotonic()
+    if _settings is not None and now - _last_check < CHECK_INTERVAL:
+        return _settings
+
+    with _lock:
+        if _settings is not None and now - _last_check < CHECK_INTERVAL:
+            return _settings
+        _last_check = now
+
+        mtime = None
+        if CONFIG_PATH:
+            try:
+                mtime = os.path.getmtime(CONFIG_PATH)
+            except OSError:
+                mtime = None
+
+        if _settings is None or mtime != _mtime:
+            _reload(mtime)
+        return _settings
+
+
+def get_config_error():
+    """마지막 설정 로드 오류 메시지 반환 (오류가 없으면 None)"""
+    get_config()
+    return _load_error
@@ -0,0 +1,165 @@
+import logging
+import threading
+import time
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+class BrowserPoolTimeout(Exception):
+    """대기 시간 안에 사용할 수 있는 브라우저가 없을 때 발생"""
+
+
+class BrowserPoolClosed(Exception):
+    """close()로 종료된 풀에서 브라우저를 꺼내려 할 때 발생"""
+
+
+class BrowserPool:
+    """
+    재사용 가능한 헤드리스 브라우저 풀
+
+    브라우저는 필요할 때 최대 max_size개까지 생성되어 여러 URL과 요청에서 재사용됩니다.
+    모든 브라우저가 사용 중이면 acquire()는 반환될 때까지 대기합니다.
+    꺼내기 전에 상태를 확인하여 응답하지 않는 브라우저는 폐기하고, max_pages개의
+    페이지를 처리한 브라우저는 메모리 누적을 막기 위해 새 브라우저로 교체합니다.
+    """
+
+    def __init__(self, factory, max_size=3, max_pages=50, acquire_timeout=60):
+        """
+        Args:
+            factory (callable): 새 WebDriver를 생성하는 함수
+            max_size (int): 최대 브라우저 수
+            max_pages (int): 브라우저 하나가 처리할 최대 페이지 수 (이후 재시작)
+            acquire_timeout (float): 브라우저를 기다리는 최대 시간(초)
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.acquire_timeout = acquire_timeout
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._pages = {}  # id(driver) -> 처리한 페이지 수
+        self._size = 0
+        self._closed = False
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            return driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _discard(self, driver):
+        """브라우저를 종료하고 풀 크기에서 제외"""
+        self._quit(driver)
+        with self._cond:
+            self._pages.pop(id(driver), None)
+            self._size -= 1
+            self._cond.notify()
+
+    def acquire(self, timeout=None):
+        """
+        사용 가능한 브라우저를 꺼냄 (없으면 새로 만들거나 반환될 때까지 대기)
+
+        Raises:
+            BrowserPoolTimeout: 대기 시간 안에 브라우저를 얻지 못한 경우
+            BrowserPoolClosed: 풀이 종료된 경우 (종료 후에는 새 브라우저를 만들지 않음)
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            driver = None
+            create = False
+
+            with self._cond:
+                while not self._closed and not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BrowserPoolTimeout(f"{timeout}초 안에 사용할 수 있는 브라우저가 없습니다.")
+                    self._cond.wait(remaining)
+
+                if self._closed:
+                    raise BrowserPoolClosed("브라우저 풀이 종료되었습니다.")
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    # 생성은 락 밖에서 하되 자리는 먼저 확보
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    driver = self.factory()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    closed = self._closed
+                    if not closed:
+                        self._pages[id(driver)] = 0
+                if closed:
+                    # 만드는 동안 풀이 종료됨
+                    self._discard(driver)
+                    raise BrowserPoolClosed("브라우저 풀이 종료되었습니다.")
+                logger.info(f"새 브라우저 시작 (풀 크기: {self._size}/{self.max_size})")
+                return driver
+
+            if self._is_healthy(driver):
+                return driver
+
+            logger.warning("응답하지 않는 브라우저를 폐기합니다.")
+            self._discard(driver)
+
+    def release(self, driver, broken=False):
+        """
+        사용한 브라우저를 풀에 반환
+
+        Args:
+            driver: acquire()로 얻은 WebDriver
+            broken (bool): 오류로 상태를 신뢰할 수 없으면 True (브라우저를 폐기)
+        """
+        with self._cond:
+            pages = self._pages.get(id(driver), 0) + 1
+            self._pages[id(driver)] = pages
+
+        if broken or self._closed or pages >= self.max_pages:
+            if pages >= self.max_pages:
+                logger.info(f"브라우저가 {pages}개 페이지를 처리하여 재시작합니다.")
+            self._discard(driver)
+            return
+
+        # 다음 사용자가 이전 페이지 상태를 보지 않도록 정리
+        try:
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+        except Exception:
+            self._discard(driver)
+            return
+
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    def close(self):
+        """대기 중인 모든 브라우저 종료 (사용 중인 브라우저는 반환될 때 종료)"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+    def stats(self):
+        with self._cond:
+            return {"size": self._size, "idle": len(self._idle), "max_size": self.max_size}
@@ -1,5 +1,4 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
 import re
 import time
 import random
@@ -14,12 +13,41 @@ from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 import socket
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import atexit
+import threading
+from functools import lru_cache
 from tqdm import tqdm
+from app.settings import get_config
+from app.utils.browser_pool import BrowserPool, BrowserPoolClosed, BrowserPoolTimeout
+from app.utils.content_quality import evaluate_content_quality
+from app.utils.document import Document
+from app.utils.domain_stats import DomainSuffixSet, get_domain_stats
+from app.utils.fetch_engine import get_fetch_engine
+from app.utils.html_parser import extract_text_from_html
+from app.utils.page_cache import get_page_cache
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+# Selenium 브라우저 풀 (get_browser_pool()로 생성)
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
+
+# 렌더링 대기 시 확인할 기본 콘텐츠 영역 선택자
+DEFAULT_RENDER_SELECTORS = ['article', 'main', '[role="main"]']
+
+# 렌더링 상태 확인 스크립트: [readyState, 콘텐츠 영역 텍스트 길이, 선택자 일치 여부]
+_RENDER_PROBE_SCRIPT = """
+var selectors = arguments[0] || [];
+var target = null;
+for (var i = 0; i < selectors.length; i++) {
+    var el = document.querySelector(selectors[i]);
+    if (el && el.textContent && el.textContent.trim().length > 0) { target = el; break; }
+}
+var node = target || document.body;
+return [document.readyState, node ? node.textContent.length : 0, target !== null];
+"""
+
 # 다양한 사용자 에이전트 목록
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
@@ -49,15 +77,29 @@ EXCLUDED_DOMAINS = [
     'spotify.com', 'soundcloud.com',  # 오디오
     'instagram.com', 'pinterest.com', 'flickr.com'  # 이미지
 ]
+EXCLUDED_DOMAIN_INDEX = DomainSuffixSet(EXCLUDED_DOMAINS)
 
 # 추출 제외 파일 확장자
-EXCLUDED_EXTENSIONS = [
+EXCLUDED_EXTENSIONS = {
     '.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx',
     '.zip', '.rar', '.tar', '.gz', '.7z',
     '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg',
     '.mp3', '.mp4', '.avi', '.mov', '.flv', '.wmv',
     '.exe', '.dll', '.iso', '.dmg'
-]
+}
+
+# URL에 포함되면 제외하는 키워드
+EXCLUDED_URL_KEYWORDS = (
+    'pdf', 'download', 'scholar', 'journal', 'thesis',
+    'dissertation', 'paper', 'citation', 'citations',
+    'doi', 'isbn', 'issn', 'publication'
+)
+
+# 동적 콘텐츠가 많은 사이트 (도메인 기록이 없을 때 바로 Selenium으로 처리)
+DYNAMIC_CONTENT_DOMAINS = DomainSuffixSet([
+    'lilys.ai', 'tistory.com', 'medium.com', 'velog.io', 'github.io',
+    'notion.site', 'substack.com', 'hashnode.com'
+])
 
 def get_random_user_agent():
     """무작위 사용자 에이전트 반환"""
@@ -76,6 +118,7 @@ def filter_search_results(search_results, max_results=30):
     """
     filtered_results = []
     skipped_count = 0
+    domain_stats = get_domain_stats()
     
     for result in search_results:
         # 최대 결과 수 제한
@@ -93,27 +136,30 @@ def filter_search_results(search_results, max_results=30):
         domain = parsed_url.netloc.lower()
         path = parsed_url.path.lower()
         
-        # 1. 도메인 기반 필터링
-        if any(excluded in domain for excluded in EXCLUDED_DOMAINS):
+        # 1. 도메인 기반 필터링 (도메인 접미사 인덱스 조회)
+        if domain in EXCLUDED_DOMAIN_INDEX:
             logger.info(f"제외 도메인으로 건너뜀: {domain} - {url}")
             skipped_count += 1
             continue
             
         # 2. 파일 확장자 기반 필터링
-        if any(path.endswith(ext) for ext in EXCLUDED_EXTENSIONS):
+        if os.path.splitext(path)[1] in EXCLUDED_EXTENSIONS:
             logger.info(f"제외 파일 형식으로 건너뜀: {path} - {url}")
             skipped_count += 1
             continue
             
         # 3. URL에 특정 키워드가 포함된 경우 필터링
-        exclude_keywords = ['pdf', 'download', 'scholar', 'journal', 'thesis', 
-                           'dissertation', 'paper', 'citation', 'citations',
-                           'doi', 'isbn', 'issn', 'publication']
-        
-        if any(keyword in url.lower() for keyword in exclude_keywords):
+        url_lower = url.lower()
+        if any(keyword in url_lower for keyword in EXCLUDED_URL_KEYWORDS):
             logger.info(f"제외 키워드 포함으로 건너뜀: {url}")
             skipped_count += 1
             continue
+        
+        # 4. 과거 추출이 거의 항상 실패한 도메인 필터링
+        if domain_stats is not None and domain_stats.should_skip(domain):
+            logger.info(f"추출 실패 이력으로 건너뜀: {domain} - {url}")
+            skipped_count += 1
+            continue
             
         # 모든 필터 통과
         filtered_results.append(result)
@@ -177,11 +223,128 @@ def is_binary_content(content_type, content):
                 return True
         return True
 
+# 텍스트 콘텐츠 유형으로 잘못 표시된 바이너리를 판별할 파일 시그니처
+MISLABELED_BINARY_SIGNATURES = (
+    b'%PDF-', b'\x89PNG', b'\xff\xd8\xff', b'GIF8', b'PK\x03\x04', b'\x1f\x8b\x08',
+    b'BZh', b'RIFF', b'\x00\x00\x00'
+)
+
+def is_text_content(content_type, head):
+    """스트리밍 다운로드 중 본문 앞부분으로 텍스트 콘텐츠인지 판별 (FetchEngine sniff 함수)"""
+    if head.startswith(MISLABELED_BINARY_SIGNATURES):
+        return False
+    return not is_binary_content(content_type, head)
+
 def is_port_in_use(port):
     """지정된 포트가 사용 중인지 확인"""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         return s.connect_ex(('localhost', port)) == 0
 
+@lru_cache(maxsize=1)
+def get_chromedriver_path():
+    """ChromeDriver 설치 경로 (프로세스당 한 번만 확인)"""
+    return ChromeDriverManager().install()
+
+def create_chrome_driver():
+    """브라우저 풀에서 사용할 헤드리스 Chrome 생성"""
+    # Selenium 옵션 설정
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument(f'user-agent={get_random_user_agent()}')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--disable-notifications')
+    options.add_argument('--lang=ko-KR,ko;q=0.9')
+    
+    service = Service(get_chromedriver_path())
+    return webdriver.Chrome(service=service, options=options)
+
+def get_browser_pool():
+    """
+    공유 브라우저 풀 반환 (최초 호출 시 생성, 브라우저는 필요할 때 시작)
+    
+    config.py 설정:
+        BROWSER_POOL_SIZE: 최대 브라우저 수 (기본값: 3)
+        BROWSER_MAX_PAGES: 브라우저 재시작 전 최대 페이지 수 (기본값: 50)
+        BROWSER_ACQUIRE_TIMEOUT: 브라우저 대기 최대 시간(초, 기본값: 60)
+    """
+    global _browser_pool
+    
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            config = get_config()
+            _browser_pool = BrowserPool(
+                create_chrome_driver,
+                max_size=int(getattr(config, "BROWSER_POOL_SIZE", 3)),
+                max_pages=int(getattr(config, "BROWSER_MAX_PAGES", 50)),
+                acquire_timeout=float(getattr(config, "BROWSER_ACQUIRE_TIMEOUT", 60))
+            )
+            atexit.register(_browser_pool.close)
+        return _browser_pool
+
+def wait_for_render(driver, selectors, max_wait=None, poll_interval=0.25, stable_polls=3):
+    """
+    페이지 렌더링 완료 대기
+    
+    document.readyState가 'complete'가 된 뒤 콘텐츠 영역(selectors 중 처음으로
+    텍스트가 있는 요소, 없으면 body)의 텍스트 길이가 stable_polls번 연속으로
+    변하지 않으면 바로 반환합니다. 지연 로딩 콘텐츠를 위해 로드 완료 시 한 번
+    페이지 끝까지 스크롤합니다. max_wait초가 지나면 상태와 관계없이 반환합니다.
+    
+    Args:
+        driver: Selenium WebDriver
+        selectors (list): 콘텐츠 영역 CSS 선택자 목록 (우선순위 순)
+        max_wait (float): 최대 대기 시간(초), None이면 RENDER_MAX_WAIT 설정 (기본값: 8)
+        poll_interval (float): 확인 간격(초)
+        stable_polls (int): 안정화로 판단할 연속 동일 측정 횟수
+        
+    Returns:
+        bool: 제한 시간 안에 콘텐츠가 안정화되었으면 True
+    """
+    if max_wait is None:
+        max_wait = float(getattr(get_config(), "RENDER_MAX_WAIT", 8))
+    deadline = time.monotonic() + max_wait
+    
+    last_length = -1
+    unchanged = 0
+    scrolled = False
+    
+    while time.monotonic() < deadline:
+        try:
+            ready_state, text_length, matched = driver.execute_script(_RENDER_PROBE_SCRIPT, selectors)
+        except Exception as e:
+            logger.warning(f"렌더링 상태 확인 중 오류: {str(e)}")
+            return False
+        
+        if ready_state == 'complete':
+            if not scrolled:
+                # 지연 로딩 콘텐츠 로드 유도 후 맨 위로 복귀
+                try:
+                    driver.execute_script(
+                        "window.scrollTo(0, document.body ? document.body.scrollHeight : 0);"
+                        "window.scrollTo(0, 0);"
+                    )
+                except Exception as e:
+                    logger.warning(f"스크롤 중 오류: {str(e)}")
+                scrolled = True
+            
+            if text_length > 0 and text_length == last_length:
+                unchanged += 1
+                if unchanged >= stable_polls:
+                    logger.info(f"렌더링 안정화 확인: 텍스트 {text_length}자"
+                                f"{' (콘텐츠 선택자 일치)' if matched else ''}")
+                    return True
+            else:
+                unchanged = 0
+        
+        last_length = text_length
+        time.sleep(poll_interval)
+    
+    logger.info(f"렌더링 대기 시간 {max_wait}초 초과, 현재 상태로 추출")
+    return False
+
 def extract_with_selenium(url, timeout=20):
     """
     Selenium을 사용하여 JavaScript가 렌더링된 페이지에서 콘텐츠 추출
@@ -194,20 +357,10 @@ def extract_with_selenium(url, timeout=20):
         str: 추출된 텍스트 콘텐츠 또는 None
     """
     driver = None
+    broken = False
     domain = urlparse(url).netloc
     
     try:
-        # Selenium 옵션 설정
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument(f'user-agent={get_random_user_agent()}')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--disable-notifications')
-        options.add_argument('--lang=ko-KR,ko;q=0.9')
-        
         # 특정 사이트별 맞춤 설정
         is_special_site = False
         special_selectors = []
@@ -227,31 +380,29 @@ def extract_with_selenium(url, timeout=20):
             ]
             logger.info(f"특수 사이트 감지됨: {domain}, 맞춤 처리 적용")
         
-        # WebDriver 설정
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
+        # 브라우저 풀에서 실행 중인 브라우저를 빌림 (모두 사용 중이면 대기)
+        try:
+            driver = get_browser_pool().acquire()
+        except BrowserPoolTimeout as e:
+            logger.warning(f"Selenium 브라우저 대기 시간 초과 ({url}): {str(e)}")
+            return None
+        except BrowserPoolClosed:
+            logger.warning(f"종료 중이므로 Selenium을 사용하지 않습니다: {url}")
+            return None
+        
+        # URL마다 사용자 에이전트를 바꿔 요청
+        try:
+            driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': get_random_user_agent()})
+        except Exception as e:
+            logger.warning(f"사용자 에이전트 변경 실패: {str(e)}")
         driver.set_page_load_timeout(timeout)
         
         # 페이지 로드
         logger.info(f"Selenium으로 URL 접근: {url}")
         driver.get(url)
         
-        # 페이지 완전 로드를 위한 대기
-        time.sleep(3)  # 기본 대기 시간
-        
-        # 페이지 스크롤 (동적 로딩 콘텐츠 로드 유도)
-        try:
-            scroll_height = 300
-            for i in range(4):  # 4번 스크롤
-                driver.execute_script(f"window.scrollTo(0, {scroll_height});")
-                scroll_height += 800
-                time.sleep(0.5)
-            
-            # 페이지 맨 위로 스크롤
-            driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
-        except Exception as e:
-            logger.warning(f"스크롤 중 오류: {str(e)}")
+        # 콘텐츠가 나타나고 더 이상 변하지 않을 때까지 대기 (고정 대기 대신)
+        wait_for_render(driver, special_selectors or DEFAULT_RENDER_SELECTORS)
         
         # 특수 사이트 맞춤 처리
         if is_special_site and special_selectors:
@@ -268,291 +419,221 @@ def extract_with_selenium(url, timeout=20):
                     logger.warning(f"특수 선택자 '{selector}' 처리 중 오류: {str(e)}")
         
         # 일반 처리
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        
-        # 불필요한 요소 제거
-        for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'iframe', 'form']):
-            element.extract()
-        
-        # 메인 콘텐츠 영역 찾기
-        main_content = None
-        content_candidates = [
-            soup.find('article'),
-            soup.find('main'),
-            soup.find(id=re.compile('content|article|main', re.I)),
-            soup.find(class_=re.compile('content|article|main|post', re.I)),
-            soup.find('div', id=re.compile('content|article|main|post', re.I)),
-            soup.find('div', class_=re.compile('content|article|main|post', re.I)),
-            soup.body
-        ]
-        
-        # 첫 번째 유효한 요소 선택
-        for candidate in content_candidates:
-            if candidate:
-                main_content = candidate
-                break
-        
-        # 텍스트 추출
-        if main_content:
-            text = main_content.get_text(separator=' ', strip=True)
-        else:
-            text = soup.get_text(separator=' ', strip=True)
-            
-        # 텍스트 정리
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n+', '\n', text)
-        text = re.sub(r'[\x00-\x1F\x7F]', '', text)
-        text = re.sub(r'', '', text)
+        text = extract_text_from_html(driver.page_source)
         
         return text if text and len(text.strip()) > 100 else None
         
-    except (TimeoutException, WebDriverException) as e:
+    except TimeoutException as e:
+        logger.error(f"Selenium 오류 ({url}): {str(e)}")
+        return None
+    except WebDriverException as e:
+        # 브라우저 상태를 신뢰할 수 없으므로 풀에 돌려보내지 않고 폐기
+        broken = True
         logger.error(f"Selenium 오류 ({url}): {str(e)}")
         return None
     finally:
-        # 드라이버 종료
+        # 브라우저를 종료하지 않고 풀에 반환
         if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+            get_browser_pool().release(driver, broken=broken)
+
+def build_request_headers(domain):
+    """크롬 브라우저를 흉내 내는 요청 헤더 생성"""
+    headers = {
+        'User-Agent': get_random_user_agent(),
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+        'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Sec-Fetch-User': '?1',
+        'Cache-Control': 'max-age=0'
+    }
+    
+    # 차단 우회를 위한 Referer 추가 (검색 엔진에서 온 것처럼)
+    if 'google.com' not in domain and 'naver.com' not in domain:
+        headers['Referer'] = 'https://www.google.com/'
+    
+    return headers
 
-def evaluate_content_quality(content):
+def decode_html(content, content_type, url=''):
     """
-    추출된 콘텐츠의 품질을 평가
+    응답 본문을 텍스트로 디코딩
     
     Args:
-        content (str): 평가할 텍스트 콘텐츠
+        content (bytes): 응답 본문
+        content_type (str): Content-Type 헤더 값 (소문자)
+        url (str): 로그용 URL
         
     Returns:
-        float: 품질 점수 (0.0 ~ 1.0)
+        str: 디코딩된 HTML
     """
-    if not content or len(content) < 100:
-        return 0.0
-        
-    # 점수 계산
-    score = 1.0
-    
-    # 1. 텍스트 길이 체크 (길수록 더 좋음)
-    length = len(content)
-    if length < 500:
-        score *= 0.5
-    elif length < 1000:
-        score *= 0.7
-    elif length < 2000:
-        score *= 0.9
-    
-    # 2. 줄바꿈 비율 확인 (정상 텍스트는 줄바꿈이 적절함)
-    newline_ratio = content.count('\n') / max(1, length)
-    if newline_ratio > 0.2:  # 줄바꿈이 너무 많음
-        score *= 0.7
-    elif newline_ratio < 0.01:  # 줄바꿈이 거의 없음
-        score *= 0.8
-        
-    # 3. 특수문자 비율 확인 (너무 높으면 깨진 텍스트 가능성)
-    special_char_count = sum(1 for c in content if not c.isalnum() and not c.isspace())
-    special_char_ratio = special_char_count / max(1, length)
-    if special_char_ratio > 0.3:
-        score *= 0.5
-    elif special_char_ratio > 0.2:
-        score *= 0.7
-        
-    # 4. 단어 수 확인
-    words = content.split()
-    word_count = len(words)
-    if word_count < 100:
-        score *= 0.6
-    elif word_count < 200:
-        score *= 0.8
-    
-    # 5. 평균 단어 길이 (너무 길거나 짧으면 의심)
-    avg_word_length = sum(len(w) for w in words) / max(1, word_count)
-    if avg_word_length > 15 or avg_word_length < 2:
-        score *= 0.7
-        
-    # 6. 인코딩 문제 감지 (깨진 텍스트에 자주 나타나는 패턴)
-    encoding_issues = re.findall(r'[\uFFFD\u001A\u001C\u001D\u001E\u001F]', content)
-    if len(encoding_issues) > 10:
-        score *= 0.5
-    elif len(encoding_issues) > 5:
-        score *= 0.7
-        
-    # 7. HTML 태그 감지 (제대로 처리되지 않은 HTML)
-    if re.search(r'<[a-zA-Z]+[^>]*>.*?</[a-zA-Z]+>', content):
-        score *= 0.7
-        
-    # 8. 비정상적인 문자 반복 감지
-    unusual_repeats = re.findall(r'(.)\1{5,}', content)
-    if unusual_repeats:
-        score *= 0.8
-    
-    return max(0.0, min(1.0, score))  # 0.0 ~ 1.0 사이로 제한
+    try:
+        if 'charset' in content_type:
+            # 헤더에서 인코딩 정보 추출
+            encoding = re.search(r'charset=([^\s;]+)', content_type).group(1)
+        else:
+            # 자동 인코딩 감지
+            detection = chardet.detect(content[:4096])
+            encoding = detection['encoding'] if detection['confidence'] > 0.7 else 'utf-8'
+        
+        # 인코딩 적용하여 텍스트로 변환
+        return content.decode(encoding, errors='replace')
+    except (UnicodeDecodeError, LookupError, TypeError):
+        # 인코딩 오류 시 UTF-8로 시도
+        logger.warning(f"인코딩 오류, UTF-8로 시도: {url}")
+        return content.decode('utf-8', errors='replace')
 
-def process_url(result):
+def parse_response_body(url, content, content_type):
+    """응답 본문을 검사·디코딩하여 텍스트 추출 (바이너리면 None) - 파싱 스레드에서 실행"""
+    # 바이너리 콘텐츠 확인
+    if is_binary_content(content_type, content[:4096]):
+        logger.warning(f"바이너리 콘텐츠 감지됨: {url} - 건너뜁니다")
+        return None
+    
+    # 인코딩 감지 및 텍스트로 변환
+    html_content = decode_html(content, content_type, url)
+    return extract_text_from_html(html_content)
+
+async def extract_rendered_text(engine, url, timeout=20):
     """
-    단일 URL 처리 함수 - 병렬 처리용
+    Selenium 렌더링 텍스트 추출 (페이지 캐시에 렌더링 결과가 있으면 재사용)
+    
+    Args:
+        engine (FetchEngine): HTTP 요청 엔진 (렌더링 스레드 풀 사용)
+        url (str): 콘텐츠를 추출할 URL
+        timeout (int): 페이지 로드 대기 시간(초)
+        
+    Returns:
+        str: 추출된 텍스트 콘텐츠 또는 None
+    """
+    cache = get_page_cache()
+    if cache is not None:
+        text = await engine.run_blocking(cache.get_rendered_text, url)
+        if text is not None:
+            logger.info(f"캐시된 렌더링 결과 사용: {url}")
+            return text
+    
+    text = await engine.run_blocking(extract_with_selenium, url, timeout, pool='render')
+    
+    if text and cache is not None:
+        await engine.run_blocking(cache.set_rendered_text, url, text)
+    return text
+
+def record_domain_outcome(domain, outcome):
+    """도메인별 추출 결과 기록 (DOMAIN_STATS_ENABLED가 False이면 무시)"""
+    domain_stats = get_domain_stats()
+    if domain_stats is not None:
+        domain_stats.record(domain, outcome)
+
+async def extract_with_rendering(engine, result, domain, threshold, timings, timeout=20):
+    """Selenium 렌더링으로 추출하고 품질을 평가하여 결과 기록"""
+    url = result['url']
+    
+    started_at = time.monotonic()
+    text = await extract_rendered_text(engine, url, timeout=timeout)
+    timings['render'] = time.monotonic() - started_at
+    
+    if text and len(text.strip()) > 100:
+        # 콘텐츠 품질 평가
+        quality_score = evaluate_content_quality(text)
+        
+        # 품질 기준 충족 시 추가
+        if quality_score >= threshold:
+            logger.info(f"Selenium 추출 성공: {url} ({len(text)} 문자, 품질 점수: {quality_score:.2f})")
+            record_domain_outcome(domain, 'render_ok')
+            return Document(url, result.get('title', ''), text, quality_score, 'render', timings=timings)
+        
+        logger.warning(f"낮은 품질 콘텐츠 건너뜀: {url} (품질 점수: {quality_score:.2f})")
+        record_domain_outcome(domain, 'low_quality')
+    else:
+        logger.warning(f"Selenium으로 추출된 콘텐츠가 너무 짧거나 비어 있음: {url}")
+        record_domain_outcome(domain, 'empty')
+    
+    return None
+
+async def process_url_async(result, engine):
+    """
+    단일 URL 처리 코루틴 - FetchEngine의 이벤트 루프에서 실행
+    
+    도메인별 추출 기록이 있으면 과거에 통한 가장 저렴한 방법(일반 요청 또는
+    Selenium)으로 바로 처리하고, 처리 결과를 다시 기록합니다.
     
     Args:
         result (dict): 처리할 검색 결과 항목
+        engine (FetchEngine): HTTP 요청 엔진
         
     Returns:
-        dict or None: 추출 결과가 있으면 결과 사전, 없으면 None
+        Document or None: 품질 기준을 통과한 문서, 없으면 None
     """
     try:
         url = result['url']
         domain = urlparse(url).netloc
+        timings = {}
         
         logger.info(f"URL에서 콘텐츠 추출 시도: {url}")
         
         # 헤더 설정 - 크롬 브라우저 에뮬레이션
-        headers = {
-            'User-Agent': get_random_user_agent(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0'
-        }
-        
-        # 차단 우회를 위한 Referer 추가 (검색 엔진에서 온 것처럼)
-        if 'google.com' not in domain and 'naver.com' not in domain:
-            headers['Referer'] = 'https://www.google.com/'
-        
-        # 동적 콘텐츠가 많은 특정 사이트 확인
-        is_dynamic_content_site = any(site in domain for site in [
-            'lilys.ai', 'tistory.com', 'medium.com', 'velog.io', 'github.io',
-            'notion.site', 'substack.com', 'hashnode.com'
-        ])
-        
-        # 특정 동적 사이트는 바로 Selenium으로 처리
-        if is_dynamic_content_site:
-            logger.info(f"동적 콘텐츠 사이트 감지됨: {domain}, Selenium으로 처리")
-            text = extract_with_selenium(url, timeout=25)
-            
-            if text and len(text.strip()) > 100:
-                # 콘텐츠 품질 평가
-                quality_score = evaluate_content_quality(text)
-                
-                # 품질 기준 충족 시 추가 (동적 사이트는 임계값 낮춤)
-                threshold = 0.4 if is_dynamic_content_site else 0.5
-                
-                if quality_score >= threshold:
-                    logger.info(f"Selenium 추출 성공: {url} ({len(text)} 문자, 품질 점수: {quality_score:.2f})")
-                    return {"url": url, "content": text, "score": quality_score}
-                else:
-                    logger.warning(f"낮은 품질 콘텐츠 건너뜀: {url} (품질 점수: {quality_score:.2f})")
-            else:
-                logger.warning(f"Selenium으로 추출된 콘텐츠가 너무 짧거나 비어 있음: {url}")
-                
-            return None
-            
-        # 일반 사이트는 requests로 먼저 시도
-        try:
-            # URL 콘텐츠 가져오기
-            response = requests.get(
-                url, 
-                headers=headers, 
-                timeout=15,
-                allow_redirects=True
-            )
-            
-            # 403 Forbidden이면 바로 건너뜀
-            if response.status_code == 403:
-                logger.warning(f"403 Forbidden 오류 발생: {url} - 건너뜁니다")
-                return None
-            
-            # 다른 상태 코드 오류면 건너뜀
-            if response.status_code != 200:
-                logger.warning(f"HTTP 오류 {response.status_code}: {url} - 건너뜁니다")
-                return None
-            
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"요청 오류 발생: {str(e)} - 건너뜁니다")
-            return None
+        headers = build_request_headers(domain)
         
-        # 콘텐츠 유형 확인
-        content_type = response.headers.get('Content-Type', '').lower()
+        # 동적 콘텐츠가 많은 특정 사이트 확인 (동적 사이트는 품질 임계값 낮춤)
+        is_dynamic_content_site = domain in DYNAMIC_CONTENT_DOMAINS
+        threshold = 0.4 if is_dynamic_content_site else 0.5
         
-        # 바이너리 콘텐츠 확인
-        if is_binary_content(content_type, response.content[:4096]):
-            logger.warning(f"바이너리 콘텐츠 감지됨: {url} - 건너뜁니다")
-            return None
+        # 도메인 기록이 없으면 정적 목록으로 추출 방법 결정
+        domain_stats = get_domain_stats()
+        strategy = domain_stats.preferred_strategy(domain) if domain_stats is not None else None
+        if strategy is None:
+            strategy = 'render' if is_dynamic_content_site else 'http'
         
-        # 인코딩 감지 및 텍스트로 변환
-        try:
-            if 'charset' in content_type:
-                # 헤더에서 인코딩 정보 추출
-                encoding = re.search(r'charset=([^\s;]+)', content_type).group(1)
-            else:
-                # 자동 인코딩 감지
-                detection = chardet.detect(response.content[:4096])
-                encoding = detection['encoding'] if detection['confidence'] > 0.7 else 'utf-8'
-            
-            # 인코딩 적용하여 텍스트로 변환
-            html_content = response.content.decode(encoding, errors='replace')
-        except (UnicodeDecodeError, LookupError):
-            # 인코딩 오류 시 UTF-8로 시도
-            logger.warning(f"인코딩 오류, UTF-8로 시도: {url}")
-            html_content = response.content.decode('utf-8', errors='replace')
-        
-        # BeautifulSoup으로 HTML 파싱
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # 불필요한 요소 제거
-        for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'iframe', 'form']):
-            element.extract()
-            
-        # 특정 클래스/ID를 가진 요소 찾기 (메인 콘텐츠일 가능성이 높은 부분)
-        main_content = None
-        
-        # 콘텐츠가 있을 가능성이 높은 요소들 우선순위대로 확인
-        content_candidates = [
-            soup.find('article'),
-            soup.find('main'),
-            soup.find(id=re.compile('content|article|main', re.I)),
-            soup.find(class_=re.compile('content|article|main|post', re.I)),
-            soup.find('div', id=re.compile('content|article|main|post', re.I)),
-            soup.find('div', class_=re.compile('content|article|main|post', re.I)),
-            soup.body
-        ]
-        
-        # 첫 번째 유효한 요소 선택
-        for candidate in content_candidates:
-            if candidate:
-                main_content = candidate
-                break
-                
-        # 텍스트 추출 및 정리
-        if main_content:
-            text = main_content.get_text(separator=' ', strip=True)
-        else:
-            text = soup.get_text(separator=' ', strip=True)
+        # 렌더링이 필요한 사이트는 바로 Selenium으로 처리
+        if strategy == 'render':
+            logger.info(f"동적 콘텐츠 사이트 감지됨: {domain}, Selenium으로 처리")
+            return await extract_with_rendering(engine, result, domain, threshold, timings,
+                                                timeout=25 if is_dynamic_content_site else 20)
             
-        # 줄 단위로 분할하고 앞뒤 공백 제거
-        lines = (line.strip() for line in text.splitlines())
+        # 일반 사이트는 HTTP 요청으로 먼저 시도 (앞부분으로 바이너리를 판별하여 다운로드 중단)
+        started_at = time.monotonic()
+        response = await engine.fetch(url, headers=headers, sniff=is_text_content)
+        timings['fetch'] = time.monotonic() - started_at
+        if response.cache_status in ('hit', 'revalidated'):
+            logger.info(f"페이지 캐시 사용 ({response.cache_status}): {url}")
+        
+        if response.error:
+            logger.warning(f"요청 오류 발생: {response.error} - 건너뜁니다")
+            if response.timed_out:
+                record_domain_outcome(domain, 'timeout')
+            elif response.status is None:
+                record_domain_outcome(domain, 'http_error')
+            return None
         
-        # 여러 줄의 제목을 한 줄로 합치기
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        if response.truncated:
+            logger.info(f"본문이 최대 크기를 넘어 앞부분만 사용: {url} ({len(response.body)} 바이트)")
         
-        # 빈 줄 제거
-        text = '\n'.join(chunk for chunk in chunks if chunk)
+        # 403 Forbidden이면 바로 건너뜀
+        if response.status == 403:
+            logger.warning(f"403 Forbidden 오류 발생: {url} - 건너뜁니다")
+            record_domain_outcome(domain, 'forbidden')
+            return None
         
-        # 텍스트 정리: 과도한 공백과 줄바꿈 제거
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n+', '\n', text)
+        # 다른 상태 코드 오류면 건너뜀
+        if response.status != 200:
+            logger.warning(f"HTTP 오류 {response.status}: {url} - 건너뜁니다")
+            # 404/410은 해당 URL만의 문제이므로 도메인 기록에 반영하지 않음
+            if response.status not in (404, 410):
+                record_domain_outcome(domain, 'http_error')
+            return None
         
-        # 특수 문자 및 이상한 유니코드 대체 문자 정리
-        text = re.sub(r'[\x00-\x1F\x7F]', '', text)  # 제어 문자 제거
-        text = re.sub(r'', '', text)  # 대체 문자 제거
+        # 콘텐츠 유형 확인 후 파싱 (CPU 작업이므로 파싱 스레드에서 실행)
+        content_type = response.headers.get('Content-Type', '').lower()
+        started_at = time.monotonic()
+        text = await engine.run_blocking(parse_response_body, url, response.body, content_type)
+        timings['parse'] = time.monotonic() - started_at
+        if text is None:
+            return None
         
         # 품질 평가 및 결과 필터링
         if text and len(text.strip()) > 100:  # 최소 텍스트 길이 요구
@@ -560,78 +641,129 @@ def process_url(result):
             quality_score = evaluate_content_quality(text)
             
             # 품질 기준 충족 시 추가
-            if quality_score >= 0.5:  # 품질 점수 임계값
+            if quality_score >= threshold:  # 품질 점수 임계값
                 logger.info(f"콘텐츠 추출 성공: {url} ({len(text)} 문자, 품질 점수: {quality_score:.2f})")
-                return {"url": url, "content": text, "score": quality_score}
-            else:
-                logger.warning(f"낮은 품질 콘텐츠 건너뜀: {url} (품질 점수: {quality_score:.2f})")
-        else:
-            # 텍스트가 짧거나 없는 경우 Selenium으로 재시도
-            logger.info(f"일반 요청으로 추출 실패, Selenium으로 재시도: {url}")
-            text = extract_with_selenium(url)
+                record_domain_outcome(domain, 'http_ok')
+                return Document(url, result.get('title', ''), text, quality_score, 'http',
+                                cache_status=response.cache_status, timings=timings)
             
-            if text and len(text.strip()) > 100:
-                # 콘텐츠 품질 평가
-                quality_score = evaluate_content_quality(text)
-                
-                # 품질 기준 충족 시 추가
-                if quality_score >= 0.5:
-                    logger.info(f"Selenium 추출 성공: {url} ({len(text)} 문자, 품질 점수: {quality_score:.2f})")
-                    return {"url": url, "content": text, "score": quality_score}
-                else:
-                    logger.warning(f"낮은 품질 콘텐츠 건너뜀: {url} (품질 점수: {quality_score:.2f})")
-            else:
-                logger.warning(f"추출된 콘텐츠가 너무 짧거나 비어 있음: {url}")
+            logger.warning(f"낮은 품질 콘텐츠 건너뜀: {url} (품질 점수: {quality_score:.2f})")
+            record_domain_outcome(domain, 'low_quality')
+            return None
         
-        return None
+        # 텍스트가 짧거나 없는 경우 Selenium으로 재시도
+        logger.info(f"일반 요청으로 추출 실패, Selenium으로 재시도: {url}")
+        return await extract_with_rendering(engine, result, domain, threshold, timings)
         
     except Exception as e:
         logger.error(f"콘텐츠 추출 오류 ({result.get('url', '알 수 없는 URL')}): {str(e)}")
         return None
 
-def extract_content(search_results):
+def process_url(result):
+    """
+    단일 URL 처리 함수 (동기 호출용 - 공유 FetchEngine에서 실행)
+    
+    Args:
+        result (dict): 처리할 검색 결과 항목
+        
+    Returns:
+        Document or None: 품질 기준을 통과한 문서, 없으면 None
+    """
+    engine = get_fetch_engine()
+    return engine.run(process_url_async(result, engine))
+
+async def extract_all_async(filtered_results, engine, target_count=None, timeout=None):
+    """
+    모든 URL을 동시에 처리하고 완료되는 순서대로 결과 수집
+    
+    품질 기준을 통과한 결과가 target_count개 모이거나 timeout이 지나면
+    남은 작업(Selenium 재시도 포함)을 취소합니다.
+    
+    Returns:
+        tuple: (Document 목록, 취소된 URL 목록, 중단 이유 - 'target', 'deadline' 또는 None)
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout is not None else None
+    
+    tasks = {asyncio.ensure_future(process_url_async(result, engine)): result for result in filtered_results}
+    pending = set(tasks)
+    results = []
+    stop_reason = None
+    
+    # 완료된 작업 처리 (tqdm으로 진행 상태 표시)
+    with tqdm(total=len(tasks), desc="콘텐츠 추출 중") as progress:
+        while pending:
+            remaining = deadline - loop.time() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                stop_reason = 'deadline'
+                break
+            
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                progress.update(1)
+                result = task.result()
+                if result:
+                    results.append(result)
+            
+            if target_count and len(results) >= target_count and pending:
+                stop_reason = 'target'
+                break
+    
+    # 남은 작업 취소 (이미 스레드에서 실행 중인 Selenium은 끝난 뒤 결과를 버림)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    
+    return results, [tasks[task]['url'] for task in pending], stop_reason
+
+def extract_content(search_results, deadline=None):
     """
     검색 결과 URL에서 콘텐츠 추출
     
     Args:
         search_results (list): 검색 결과 사전 목록
+        deadline (Deadline): 요청 시간 예산 (진행 중인 단계의 남은 시간 안에서 추출)
         
     Returns:
-        list: URL에서 추출한 텍스트 콘텐츠 목록
+        list: 추출한 Document 목록 (품질 점수 높은 순)
+    
+    config.py 설정:
+        EXTRACT_TARGET_DOCS: 품질 기준을 통과한 문서가 이 수만큼 모이면 나머지 추출 취소
+                             (기본값: 20, 0이면 모두 처리)
     """
     # 1. 검색 결과 필터링
     filtered_results = filter_search_results(search_results)
     
-    # 병렬 처리를 위한 변수
-    max_workers = min(10, len(filtered_results))  # 최대 10개 스레드, 또는 결과 수만큼
-    extracted_content = []
-    extracted_urls = []  # 추출에 성공한 URL 저장
+    target_count = int(getattr(get_config(), "EXTRACT_TARGET_DOCS", 20))
+    timeout = deadline.stage_remaining() if deadline is not None else None
     
-    # 병렬 URL 처리 실행
-    logger.info(f"병렬 처리로 {len(filtered_results)}개 URL에서 콘텐츠 추출 시작 (최대 {max_workers} 쓰레드 사용)")
-    results = []
+    # 공유 이벤트 루프에서 모든 URL을 동시에 처리 (연결 수는 엔진이 제한)
+    engine = get_fetch_engine()
+    logger.info(f"비동기 처리로 {len(filtered_results)}개 URL에서 콘텐츠 추출 시작 "
+                f"(전체 연결 {engine.max_connections}개, 호스트별 {engine.max_per_host}개)")
+    results, cancelled_urls, stop_reason = engine.run(
+        extract_all_async(filtered_results, engine, target_count, timeout))
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # URL 처리 작업 제출
-        future_to_url = {executor.submit(process_url, result): result for result in filtered_results}
-        
-        # 완료된 작업 처리 (tqdm으로 진행 상태 표시)
-        for future in tqdm(as_completed(future_to_url), total=len(filtered_results), desc="콘텐츠 추출 중"):
-            result = future.result()
-            if result:
-                results.append(result)
+    if cancelled_urls:
+        logger.info(f"{'목표 문서 수 도달' if stop_reason == 'target' else '시간 예산 초과'}로 "
+                    f"{len(cancelled_urls)}개 URL 추출 취소")
+        if deadline is not None:
+            deadline.note_cut('extraction', stop_reason, cancelled_urls=cancelled_urls,
+                              collected=len(results))
     
-    # 품질 점수 기준 정렬
-    results.sort(key=lambda x: x["score"], reverse=True)
+    # 이번 요청의 도메인별 결과를 파일에 저장
+    domain_stats = get_domain_stats()
+    if domain_stats is not None:
+        domain_stats.flush()
     
-    # 콘텐츠만 추출
-    extracted_content = [item["content"] for item in results]
-    extracted_urls = [item["url"] for item in results]
+    # 품질 점수 기준 정렬
+    results.sort(key=lambda document: document.score, reverse=True)
     
     # 품질 평가 요약 로깅
-    if extracted_content:
-        logger.info(f"총 {len(filtered_results)}개 URL 중 {len(extracted_content)}개 콘텐츠 추출 성공")
+    if results:
+        logger.info(f"총 {len(filtered_results)}개 URL 중 {len(results)}개 콘텐츠 추출 성공")
     else:
         logger.warning("추출된 콘텐츠 없음!")
         
-    return extracted_content
\ No newline at end of file
+    return results
@@ -0,0 +1,198 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# 깨진 텍스트에 자주 나타나는 문자 (대체 문자와 제어 문자)
+ENCODING_ISSUE_CHARS = '\uFFFD\u001A\u001C\u001D\u001E\u001F'
+
+# 처리되지 않은 HTML 태그 패턴
+HTML_TAG_PATTERN = re.compile(r'<[a-zA-Z]+[^>]*>.*?</[a-zA-Z]+>')
+
+# 이 횟수 이상 같은 문자가 연속되면 비정상 반복으로 판단 (줄바꿈 제외)
+REPEAT_RUN_LENGTH = 6
+
+# 문자 분류 비트
+ALNUM = 1
+SPACE = 2
+ENCODING_ISSUE = 4
+
+NEWLINE = ord('\n')
+BMP_SIZE = 0x10000
+
+# 한 번에 이어 붙여 처리할 최대 문자 수 (배열이 CPU 캐시에 머물 수 있는 크기)
+BATCH_CHARS = 256 * 1024
+
+
+def _char_flags(char):
+    return ((ALNUM if char.isalnum() else 0) | (SPACE if char.isspace() else 0)
+            | (ENCODING_ISSUE if char in ENCODING_ISSUE_CHARS else 0))
+
+
+@lru_cache(maxsize=None)
+def _char_flag_table():
+    """BMP 문자별 분류 비트 표 (최초 호출 시 한 번 생성)"""
+    return np.fromiter((_char_flags(chr(code)) for code in range(BMP_SIZE)), dtype=np.uint8, count=BMP_SIZE)
+
+
+def _classify(codes):
+    """코드 포인트 배열의 문자별 분류 비트 (BMP 밖 문자는 직접 판별)"""
+    table = _char_flag_table()
+    astral = codes >= BMP_SIZE
+    if not astral.any():
+        return table[codes]
+
+    flags = table[np.where(astral, 0, codes)]
+    positions = np.flatnonzero(astral)
+    values, inverse = np.unique(codes[positions], return_inverse=True)
+    flags[positions] = np.array([_char_flags(chr(code)) for code in values], dtype=np.uint8)[inverse]
+    return flags
+
+
+def _score(length, newline_count, special_char_count, word_count, word_chars,
+           encoding_issue_count, has_html_tag, has_repeat):
+    """특징값으로 품질 점수 계산 (evaluate_content_quality의 기준과 동일한 순서)"""
+    score = 1.0
+
+    # 1. 텍스트 길이 체크 (길수록 더 좋음)
+    if length < 500:
+        score *= 0.5
+    elif length < 1000:
+        score *= 0.7
+    elif length < 2000:
+        score *= 0.9
+
+    # 2. 줄바꿈 비율 확인 (정상 텍스트는 줄바꿈이 적절함)
+    newline_ratio = newline_count / max(1, length)
+    if newline_ratio > 0.2:  # 줄바꿈이 너무 많음
+        score *= 0.7
+    elif newline_ratio < 0.01:  # 줄바꿈이 거의 없음
+        score *= 0.8
+
+    # 3. 특수문자 비율 확인 (너무 높으면 깨진 텍스트 가능성)
+    special_char_ratio = special_char_count / max(1, length)
+    if special_char_ratio > 0.3:
+        score *= 0.5
+    elif special_char_ratio > 0.2:
+        score *= 0.7
+
+    # 4. 단어 수 확인
+    if word_count < 100:
+        score *= 0.6
+    elif word_count < 200:
+        score *= 0.8
+
+    # 5. 평균 단어 길이 (너무 길거나 짧으면 의심)
+    avg_word_length = word_chars / max(1, word_count)
+    if avg_word_length > 15 or avg_word_length < 2:
+        score *= 0.7
+
+    # 6. 인코딩 문제 감지 (깨진 텍스트에 자주 나타나는 패턴)
+    if encoding_issue_count > 10:
+        score *= 0.5
+    elif encoding_issue_count > 5:
+        score *= 0.7
+
+    # 7. HTML 태그 감지 (제대로 처리되지 않은 HTML)
+    if has_html_tag:
+        score *= 0.7
+
+    # 8. 비정상적인 문자 반복 감지
+    if has_repeat:
+        score *= 0.8
+
+    return max(0.0, min(1.0, score))  # 0.0 ~ 1.0 사이로 제한
+
+
+def _score_group(documents):
+    """이어 붙인 문서 묶음의 품질 점수 계산"""
+    codes = np.frombuffer(''.join(documents).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    flags = _classify(codes)
+    space = (flags & SPACE) != 0
+    special = (flags & (ALNUM | SPACE)) == 0
+    encoding_issue = (flags & ENCODING_ISSUE) != 0
+
+    # 같은 문자가 연속되는 위치: same[k]는 k번째와 k+1번째 문자가 같은 (줄바꿈이 아닌) 문자
+    same = (codes[1:] == codes[:-1]) & (codes[1:] != NEWLINE)
+
+    scores = []
+    start = 0
+    for document in documents:
+        end = start + len(document)
+        doc_space = space[start:end]
+
+        # 단어 수: 문서 처음이거나 공백 다음에 오는 공백 아닌 문자 수 (str.split()과 동일)
+        word_count = np.count_nonzero(doc_space[:-1] & ~doc_space[1:]) + (0 if doc_space[0] else 1)
+        word_chars = len(document) - np.count_nonzero(doc_space)
+
+        # 같은 문자가 REPEAT_RUN_LENGTH번 이상 연속되는 구간
+        repeat = same[start:end - 1]
+        for shift in range(1, REPEAT_RUN_LENGTH - 1):
+            repeat = repeat[:-1] & same[start + shift:end - 1]
+
+        # 닫는 태그가 없으면 HTML 태그 패턴은 일치할 수 없음
+        has_html_tag = '</' in document and HTML_TAG_PATTERN.search(document) is not None
+
+        scores.append(_score(
+            len(document),
+            document.count('\n'),
+            int(np.count_nonzero(special[start:end])),
+            int(word_count),
+            int(word_chars),
+            int(np.count_nonzero(encoding_issue[start:end])),
+            has_html_tag,
+            bool(repeat.any())
+        ))
+        start = end
+
+    return scores
+
+
+def evaluate_content_quality_batch(contents):
+    """
+    여러 콘텐츠의 품질을 한 번에 평가
+
+    문서들을 최대 BATCH_CHARS자 묶음으로 이어 붙여 문자 분류표 조회와 연속 문자
+    비교를 묶음마다 한 번에 수행하고, 문서별 구간에서 특수문자/공백/단어 수,
+    인코딩 문제 문자, 문자 반복을 벡터 연산으로 계산합니다. 짧은 문서가 많을수록
+    문서별 호출보다 빠릅니다.
+
+    Args:
+        contents (list): 평가할 텍스트 콘텐츠 목록
+
+    Returns:
+        list: 콘텐츠별 품질 점수 (0.0 ~ 1.0)
+    """
+    scores = [0.0] * len(contents)
+    group, group_indices, group_chars = [], [], 0
+
+    for i, content in enumerate(contents):
+        if not content or len(content) < 100:
+            continue
+        group.append(content)
+        group_indices.append(i)
+        group_chars += len(content)
+
+        if group_chars >= BATCH_CHARS:
+            for index, score in zip(group_indices, _score_group(group)):
+                scores[index] = score
+            group, group_indices, group_chars = [], [], 0
+
+    if group:
+        for index, score in zip(group_indices, _score_group(group)):
+            scores[index] = score
+
+    return scores
+
+
+def evaluate_content_quality(content):
+    """
+    추출된 콘텐츠의 품질을 평가
+
+    Args:
+        content (str): 평가할 텍스트 콘텐츠
+
+    Returns:
+        float: 품질 점수 (0.0 ~ 1.0)
+    """
+    return evaluate_content_quality_batch([content])[0]
@@ -0,0 +1,123 @@
+import logging
+import time
+
+from app.settings import get_config
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 요청 처리 단계와 기본 시간 배분 비율
+DEFAULT_STAGE_SHARES = {"search": 0.15, "extraction": 0.6, "modeling": 0.25}
+
+
+class Deadline:
+    """
+    요청 하나의 전체 처리 시간 예산
+
+    전체 시간을 검색, 콘텐츠 추출, 주제 모델링 단계에 비율대로 나눕니다.
+    각 단계의 예산은 시작 시점의 남은 시간을 남은 단계들의 비율로 나누어 정하므로,
+    앞 단계가 일찍 끝나면 남은 시간은 다음 단계로 넘어갑니다.
+    시간 제약 때문에 생략한 작업은 note_cut()으로 기록하여 응답에 포함합니다.
+    """
+
+    def __init__(self, seconds=None, shares=None):
+        """
+        Args:
+            seconds (float): 전체 시간 예산(초, None이면 제한 없음)
+            shares (dict): 단계 이름 -> 시간 배분 비율 (순서대로 진행)
+        """
+        self.seconds = seconds
+        self.shares = dict(shares or DEFAULT_STAGE_SHARES)
+        self.started_at = time.monotonic()
+        self.stages = {}
+        self.cuts = []
+        self._current = None
+
+    def remaining(self):
+        """전체 남은 시간(초, 제한이 없으면 None)"""
+        if self.seconds is None:
+            return None
+        return max(0.0, self.seconds - (time.monotonic() - self.started_at))
+
+    def expired(self):
+        return self.seconds is not None and self.remaining() <= 0
+
+    def start_stage(self, name):
+        """
+        단계 시작 - 이 단계에 쓸 수 있는 시간(초, 제한이 없으면 None) 반환
+        """
+        self.end_stage()
+
+        budget = None
+        remaining = self.remaining()
+        if remaining is not None:
+            names = list(self.shares)
+            later = names[names.index(name):] if name in self.shares else [name]
+            total_share = sum(self.shares.get(stage, 0) for stage in later)
+            budget = remaining * self.shares.get(name, 0) / total_share if total_share else remaining
+
+        self._current = name
+        self.stages[name] = {"budget": budget, "started_at": time.monotonic(), "elapsed": None}
+        return budget
+
+    def end_stage(self):
+        """진행 중인 단계 종료 (경과 시간 기록)"""
+        if self._current is None:
+            return
+        stage = self.stages[self._current]
+        stage["elapsed"] = time.monotonic() - stage["started_at"]
+        if stage["budget"] is not None and stage["elapsed"] > stage["budget"]:
+            logger.info(f"'{self._current}' 단계가 예산 {stage['budget']:.1f}초를 넘었습니다 "
+                        f"({stage['elapsed']:.1f}초)")
+        self._current = None
+
+    def stage_remaining(self):
+        """진행 중인 단계의 남은 시간(초, 제한이 없으면 None)"""
+        if self._current is None:
+            return self.remaining()
+        stage = self.stages[self._current]
+        if stage["budget"] is None:
+            return None
+        return max(0.0, stage["budget"] - (time.monotonic() - stage["started_at"]))
+
+    def stage_expired(self):
+        remaining = self.stage_remaining()
+        return remaining is not None and remaining <= 0
+
+    def note_cut(self, stage, reason, **details):
+        """시간 제약이나 조기 종료로 생략한 작업 기록"""
+        cut = {"stage": stage, "reason": reason}
+        cut.update(details)
+        self.cuts.append(cut)
+        logger.info(f"생략된 작업 ({stage}): {reason} {details}")
+
+    def report(self):
+        """응답에 포함할 단계별 예산/경과 시간과 생략된 작업 목록"""
+        self.end_stage()
+        return {
+            "budget": self.seconds,
+            "elapsed": round(time.monotonic() - self.started_at, 3),
+            "stages": {
+                name: {
+                    "budget": round(stage["budget"], 3) if stage["budget"] is not None else None,
+                    "elapsed": round(stage["elapsed"], 3) if stage["elapsed"] is not None else None
+                }
+                for name, stage in self.stages.items()
+            },
+            "cuts": self.cuts
+        }
+
+
+def create_request_deadline():
+    """
+    설정값으로 요청 시간 예산 생성
+
+    config.py 설정:
+        REQUEST_DEADLINE: 요청 전체 시간 예산(초, 기본값: 120, 0이나 None이면 제한 없음)
+        REQUEST_DEADLINE_SHARES: 단계별 시간 배분 비율
+                                 (기본값: {"search": 0.15, "extraction": 0.6, "modeling": 0.25})
+    """
+    config = get_config()
+    seconds = getattr(config, "REQUEST_DEADLINE", 120)
+    shares = getattr(config, "REQUEST_DEADLINE_SHARES", DEFAULT_STAGE_SHARES)
+    return Deadline(float(seconds) if seconds else None, shares)
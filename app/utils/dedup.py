@@ -0,0 +1,157 @@
+import logging
+from collections import defaultdict
+
+import numpy as np
+
+from app.settings import get_config
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 한 번에 해시할 최대 shingle 수 (num_perm x 청크 크기 행렬의 메모리 제한)
+SHINGLE_CHUNK = 4096
+
+MAX_HASH = np.uint32(0xFFFFFFFF)
+SHINGLE_PRIME = np.uint64(1099511628211)
+
+
+def _shingle_hashes(text, shingle_size):
+    """텍스트의 단어 n-gram(shingle) 해시 집합 (단어 해시를 벡터 연산으로 결합)"""
+    words = text.lower().split()
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+
+    word_hashes = np.fromiter(map(hash, words), dtype=np.int64, count=len(words)).view(np.uint64)
+    size = min(shingle_size, len(words))
+    count = len(words) - size + 1
+
+    shingles = word_hashes[:count].copy()
+    for offset in range(1, size):
+        shingles = shingles * SHINGLE_PRIME + word_hashes[offset:offset + count]
+    return np.unique(shingles)
+
+
+def minhash_signatures(texts, num_perm=128, shingle_size=3, seed=42):
+    """
+    텍스트별 MinHash 서명 계산
+
+    shingle 해시에 num_perm개의 무작위 곱셈-시프트 해시를 적용하고 각각의 최솟값을
+    서명으로 사용합니다. 두 서명에서 같은 값의 비율은 shingle 집합의 Jaccard 유사도 추정치입니다.
+
+    Returns:
+        numpy.ndarray: (문서 수, num_perm) 크기의 uint32 서명 행렬
+    """
+    rng = np.random.default_rng(seed)
+    multipliers = (rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1))[:, None]
+    offsets = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)[:, None]
+    shift = np.uint64(32)
+
+    signatures = np.full((len(texts), num_perm), MAX_HASH, dtype=np.uint32)
+    for row, text in enumerate(texts):
+        hashes = _shingle_hashes(text or '', shingle_size)
+        for start in range(0, len(hashes), SHINGLE_CHUNK):
+            chunk = hashes[None, start:start + SHINGLE_CHUNK]
+            # uint64 곱셈은 2^64로 나눈 나머지로 계산됨 (곱셈-시프트 해시)
+            permuted = ((chunk * multipliers + offsets) >> shift).astype(np.uint32)
+            np.minimum(signatures[row], permuted.min(axis=1), out=signatures[row])
+    return signatures
+
+
+def find_near_duplicates(texts, threshold=0.8, num_perm=128, bands=16, shingle_size=3):
+    """
+    MinHash LSH로 거의 같은 텍스트 묶음 찾기
+
+    서명을 bands개 구간으로 나누어 구간이 같은 문서끼리만 후보로 비교하므로
+    문서 수에 거의 비례하는 시간에 동작합니다. 후보 쌍은 추정 유사도가
+    threshold 이상일 때만 같은 묶음으로 합칩니다.
+
+    Args:
+        texts (list): 텍스트 목록
+        threshold (float): 중복으로 판단할 추정 Jaccard 유사도
+        num_perm (int): MinHash 해시 함수 수 (bands로 나누어떨어져야 함)
+        bands (int): LSH 구간 수
+        shingle_size (int): shingle 단어 수
+
+    Returns:
+        list: 묶음별 (문서 인덱스 목록, 대표 문서와의 최소 추정 유사도) - 인덱스는 오름차순
+    """
+    if len(texts) < 2:
+        return []
+
+    rows = num_perm // bands
+    signatures = minhash_signatures(texts, num_perm, shingle_size)
+
+    # 구간별 버킷에 문서를 넣어 후보 쌍 생성
+    candidates = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for index, signature in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+            if texts[index]:
+                buckets[signature.tobytes()].append(index)
+        for members in buckets.values():
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    candidates.add((members[i], members[j]))
+
+    # 유사도가 기준 이상인 후보 쌍을 union-find로 묶음
+    parent = list(range(len(texts)))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for i, j in candidates:
+        if np.mean(signatures[i] == signatures[j]) >= threshold:
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups = defaultdict(list)
+    for index in range(len(texts)):
+        groups[find(index)].append(index)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        similarity = min(float(np.mean(signatures[members[0]] == signatures[other])) for other in members[1:])
+        clusters.append((members, similarity))
+    clusters.sort(key=lambda cluster: cluster[0][0])
+    return clusters
+
+
+def remove_near_duplicates(texts):
+    """
+    거의 같은 텍스트를 묶음마다 하나만 남기고 제거
+
+    묶음에서는 인덱스가 가장 작은 문서(품질 점수 순으로 정렬된 목록이면 점수가 가장 높은 문서)를 남깁니다.
+
+    Returns:
+        tuple: (남길 인덱스 목록, 묶음 목록 [{"kept": 인덱스, "dropped": [인덱스...], "similarity": 값}])
+
+    config.py 설정:
+        DEDUP_ENABLED: 중복 제거 사용 여부 (기본값: True)
+        DEDUP_THRESHOLD: 중복으로 판단할 추정 유사도 (기본값: 0.8)
+        DEDUP_SHINGLE_SIZE: shingle 단어 수 (기본값: 3)
+    """
+    config = get_config()
+    if not getattr(config, "DEDUP_ENABLED", True):
+        return list(range(len(texts))), []
+
+    clusters = find_near_duplicates(
+        texts,
+        threshold=float(getattr(config, "DEDUP_THRESHOLD", 0.8)),
+        shingle_size=int(getattr(config, "DEDUP_SHINGLE_SIZE", 3))
+    )
+
+    dropped = set()
+    report = []
+    for members, similarity in clusters:
+        dropped.update(members[1:])
+        report.append({"kept": members[0], "dropped": members[1:], "similarity": round(similarity, 3)})
+
+    if dropped:
+        logger.info(f"거의 같은 문서 {len(dropped)}개 제거 ({len(clusters)}개 묶음)")
+    return [index for index in range(len(texts)) if index not in dropped], report
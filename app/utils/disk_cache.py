@@ -0,0 +1,196 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 캐시 파일 기본 위치 (프로젝트 루트의 cache/ 디렉토리)
+CACHE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'cache')
+
+
+class DiskCache:
+    """
+    디스크 기반 키-값 캐시
+
+    키는 SHA-256 해시로 변환되어 파일 이름으로 사용되며, 값은 bytes로 저장됩니다.
+    항목의 나이는 파일 수정 시각으로 판단하고(TTL), 항목 수 또는 전체 크기가
+    상한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+    """
+
+    def __init__(self, directory, ttl=None, max_entries=None, max_bytes=None, suffix='.bin'):
+        """
+        Args:
+            directory (str): 캐시 파일을 저장할 디렉토리
+            ttl (float): 항목 유효 시간(초), None이면 만료 없음
+            max_entries (int): 최대 항목 수, None이면 제한 없음
+            max_bytes (int): 최대 전체 크기(바이트), None이면 제한 없음
+            suffix (str): 캐시 파일 확장자
+        """
+        self.directory = os.path.abspath(directory)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+
+        self._lock = threading.Lock()
+        self._index = None  # 파일 이름 -> 크기 (오래 사용되지 않은 순서)
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def hash_key(key):
+        """캐시 키를 파일 이름용 해시로 변환"""
+        if not isinstance(key, bytes):
+            key = str(key).encode('utf-8')
+        return hashlib.sha256(key).hexdigest()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name[:2], name + self.suffix)
+
+    def _load_index(self):
+        """디스크의 기존 항목을 읽어 LRU 인덱스 구성 (최초 1회)"""
+        if self._index is not None:
+            return
+
+        entries = []
+        if os.path.isdir(self.directory):
+            for subdir in os.scandir(self.directory):
+                if not subdir.is_dir():
+                    continue
+                for entry in os.scandir(subdir.path):
+                    if not entry.name.endswith(self.suffix):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, entry.name[:-len(self.suffix)], stat.st_size))
+
+        entries.sort()
+        self._index = OrderedDict((name, size) for _, name, size in entries)
+        self._total_bytes = sum(size for _, _, size in entries)
+
+    def _forget(self, name):
+        size = self._index.pop(name, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _remove(self, name):
+        self._forget(name)
+        try:
+            os.remove(self._path(name))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """상한을 넘은 만큼 가장 오래 사용되지 않은 항목 삭제"""
+        while self._index and (
+            (self.max_entries is not None and len(self._index) > self.max_entries) or
+            (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+        ):
+            name = next(iter(self._index))
+            self._remove(name)
+            self.evictions += 1
+
+    def get(self, key, max_age=None):
+        """
+        캐시된 값 조회
+
+        Args:
+            key: 캐시 키
+            max_age (float): 이번 조회에 적용할 유효 시간(초), None이면 ttl 사용
+
+        Returns:
+            bytes or None: 캐시된 값 (없거나 만료되면 None)
+        """
+        name = self.hash_key(key)
+        path = self._path(name)
+        max_age = self.ttl if max_age is None else max_age
+
+        with self._lock:
+            self._load_index()
+            try:
+                if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+                    self._remove(name)
+                    self.misses += 1
+                    return None
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                self._forget(name)
+                self.misses += 1
+                return None
+
+            if name not in self._index:
+                self._total_bytes += len(data)
+            self._index[name] = len(data)
+            self._index.move_to_end(name)
+            self.hits += 1
+            return data
+
+    def set(self, key, data):
+        """값을 캐시에 저장 (같은 키의 기존 값은 덮어씀)"""
+        name = self.hash_key(key)
+        path = self._path(name)
+
+        with self._lock:
+            self._load_index()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # 임시 파일에 쓴 뒤 교체하여 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 함
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"캐시 저장 실패 ({self.directory}): {str(e)}")
+                return
+
+            self._forget(name)
+            self._index[name] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def delete(self, key):
+        """캐시 항목 삭제"""
+        with self._lock:
+            self._load_index()
+            self._remove(self.hash_key(key))
+
+    def get_json(self, key, max_age=None):
+        """JSON으로 저장된 값 조회"""
+        data = self.get(key, max_age=max_age)
+        if data is None:
+            return None
+        try:
+            return json.loads(data.decode('utf-8'))
+        except ValueError:
+            logger.warning(f"손상된 캐시 항목 삭제: {self.directory}")
+            self.delete(key)
+            return None
+
+    def set_json(self, key, value):
+        """값을 JSON으로 직렬화하여 저장"""
+        self.set(key, json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+    def stats(self):
+        """캐시 적중/실패 통계 반환"""
+        with self._lock:
+            self._load_index()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,41 @@
+# 결과 파일과 응답에 사용하는 미리보기 길이
+PREVIEW_LENGTH = 500
+
+
+class Document:
+    """
+    URL에서 추출한 문서 하나
+
+    추출(URL, 제목, 본문, 품질 점수, 추출 방법, 단계별 소요 시간)부터 전처리(토큰)까지
+    한 객체로 전달되므로 검색 결과와 본문 목록을 다시 맞춰 볼 필요가 없습니다.
+    """
+
+    __slots__ = ('url', 'title', 'content', 'score', 'strategy', 'cache_status', 'timings',
+                 'tokens', 'preview')
+
+    def __init__(self, url, title, content, score, strategy, cache_status=None, timings=None):
+        self.url = url
+        self.title = title
+        self.content = content
+        self.score = score
+        self.strategy = strategy  # 'http' 또는 'render'
+        self.cache_status = cache_status  # 페이지 캐시 사용 결과 (FetchResult.cache_status)
+        self.timings = timings if timings is not None else {}  # 단계 -> 소요 시간(초)
+        self.tokens = None  # 전처리 후 토큰 목록
+        self.preview = content[:PREVIEW_LENGTH]
+
+    def to_dict(self):
+        """결과 파일 저장용 사전 (본문 대신 미리보기 포함)"""
+        return {
+            "url": self.url,
+            "title": self.title,
+            "score": self.score,
+            "strategy": self.strategy,
+            "cache_status": self.cache_status,
+            "timings": {stage: round(seconds, 3) for stage, seconds in self.timings.items()},
+            "content_preview": self.preview
+        }
+
+    def __repr__(self):
+        return f"Document({self.url!r}, score={self.score:.2f}, strategy={self.strategy!r})"
+
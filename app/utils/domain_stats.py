@@ -0,0 +1,278 @@
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from app.settings import get_config
+from app.utils.disk_cache import CACHE_ROOT
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 기록하는 결과 종류
+OUTCOMES = (
+    'http_ok',       # 일반 HTTP 요청으로 충분한 품질의 콘텐츠 추출
+    'render_ok',     # Selenium 렌더링이 필요했고 성공
+    'forbidden',     # 403 응답
+    'timeout',       # 요청 시간 초과
+    'http_error',    # 그 밖의 HTTP/연결 오류
+    'low_quality',   # 품질 점수 미달
+    'empty'          # 렌더링 후에도 콘텐츠 없음
+)
+SUCCESS_OUTCOMES = ('http_ok', 'render_ok')
+# 페이지 내용에 따른 결과 - 사이트 도메인으로 합치지 않고 건너뛸지 판단할 때도 세지 않음
+CONTENT_OUTCOMES = ('low_quality',)
+
+# 서브도메인(또는 경로)마다 다른 사용자의 사이트인 호스팅 플랫폼 - 사이트 도메인으로 합치지 않음
+SHARED_HOSTING_DOMAINS = (
+    'tistory.com', 'blog.naver.com', 'cafe.naver.com', 'blog.me', 'blog.daum.net', 'brunch.co.kr',
+    'egloos.com', 'postype.com', 'velog.io', 'blogspot.com', 'wordpress.com', 'medium.com',
+    'tumblr.com', 'github.io', 'notion.site', 'wixsite.com', 'netlify.app', 'vercel.app', 'herokuapp.com'
+)
+
+# 2단계 국가 도메인 (예: example.co.kr)
+SECOND_LEVEL_LABELS = {'co', 'or', 'go', 'ac', 'ne', 're', 'pe', 'com', 'net', 'org', 'edu', 'gov'}
+
+# 프로세스 전체에서 공유하는 저장소 (get_domain_stats()로 생성)
+_domain_stats = None
+_domain_stats_lock = threading.Lock()
+
+
+def normalize_host(host):
+    """호스트 이름 정규화 (소문자, 포트와 www. 제거)"""
+    host = (host or '').lower().split(':', 1)[0].rstrip('.')
+    return host[4:] if host.startswith('www.') else host
+
+
+def is_ip_address(host):
+    return host.replace('.', '').isdigit() or ':' in host
+
+
+def host_suffixes(host):
+    """호스트와 상위 도메인을 구체적인 것부터 반환 (a.b.com -> a.b.com, b.com, com)"""
+    host = normalize_host(host)
+    if is_ip_address(host):
+        return [host]
+    labels = host.split('.')
+    return ['.'.join(labels[i:]) for i in range(len(labels)) if labels[i]]
+
+
+def site_domain(host):
+    """서브도메인을 제외한 사이트 도메인 (foo.tistory.com -> tistory.com, a.b.co.kr -> b.co.kr)"""
+    host = normalize_host(host)
+    if is_ip_address(host):
+        return host
+    labels = host.split('.')
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in SECOND_LEVEL_LABELS:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+class DomainSuffixSet:
+    """
+    도메인 접미사 집합
+
+    호스트의 라벨을 하나씩 떼어 가며 집합을 조회하므로 목록 크기와 관계없이
+    라벨 수만큼의 해시 조회로 일치 여부를 확인합니다 (blog.github.com은 github.com과 일치).
+    """
+
+    def __init__(self, domains=()):
+        self._domains = {normalize_host(domain) for domain in domains}
+
+    def match(self, host):
+        """일치하는 가장 구체적인 도메인 반환 (없으면 None)"""
+        for suffix in host_suffixes(host):
+            if suffix in self._domains:
+                return suffix
+        return None
+
+    def __contains__(self, host):
+        return self.match(host) is not None
+
+    def __len__(self):
+        return len(self._domains)
+
+
+class DomainStats:
+    """
+    도메인별 콘텐츠 추출 결과 저장소
+
+    URL을 처리한 결과(403, 시간 초과, 낮은 품질, HTTP로 충분했는지 렌더링이
+    필요했는지)를 호스트와 사이트 도메인 단위로 누적하여 JSON 파일에 보관합니다.
+    조회는 호스트에서 상위 도메인 순서로 표본이 충분한 첫 기록을 사용합니다.
+
+    공유 호스팅 플랫폼(SHARED_HOSTING_DOMAINS, 예: foo.tistory.com)은 서브도메인마다 다른 사이트이므로
+    플랫폼 도메인으로 합치거나 플랫폼 도메인 기록으로 대신 판단하지 않습니다.
+    낮은 품질은 페이지 내용의 문제이므로 사이트 도메인으로 합치지 않고 건너뛸지 판단할 때도 세지 않습니다.
+
+    최근 결과가 더 반영되도록 표본 수가 max_samples를 넘으면 모든 횟수를 절반으로 줄입니다.
+    """
+
+    def __init__(self, path, min_samples=3, skip_below=0.1, retry_after=7 * 86400,
+                 max_samples=50, max_domains=5000, flush_interval=30):
+        """
+        Args:
+            path (str): 저장 파일 경로
+            min_samples (int): 판단에 필요한 최소 표본 수
+            skip_below (float): 성공률이 이 값보다 낮으면 건너뜀
+            retry_after (float): 건너뛰는 도메인도 마지막 시도 후 이 시간(초)이 지나면 다시 시도
+            max_samples (int): 횟수를 절반으로 줄이는 기준 표본 수
+            max_domains (int): 보관할 최대 도메인 수 (오래된 기록부터 삭제)
+            flush_interval (float): 변경 사항을 파일에 쓰는 최소 간격(초)
+        """
+        self.path = path
+        self.min_samples = min_samples
+        self.skip_below = skip_below
+        self.retry_after = retry_after
+        self.max_samples = max_samples
+        self.max_domains = max_domains
+        self.flush_interval = flush_interval
+        self.shared_hosting = DomainSuffixSet(SHARED_HOSTING_DOMAINS)
+
+        self._lock = threading.Lock()
+        self._domains = {}
+        self._dirty = False
+        self._last_flush = time.time()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._domains = json.load(f).get('domains', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"도메인 통계 로드 실패 ({self.path}): {str(e)}")
+
+    def _record_key(self, key, outcome, now):
+        entry = self._domains.get(key)
+        if entry is None:
+            entry = self._domains[key] = {name: 0 for name in OUTCOMES}
+        entry[outcome] = entry.get(outcome, 0) + 1
+        entry['updated'] = now
+
+        if sum(entry.get(name, 0) for name in OUTCOMES) > self.max_samples:
+            for name in OUTCOMES:
+                entry[name] = entry.get(name, 0) // 2
+
+    def record(self, host, outcome):
+        """URL 처리 결과 기록"""
+        if outcome not in OUTCOMES:
+            raise ValueError(f"알 수 없는 결과 종류: {outcome}")
+
+        host = normalize_host(host)
+        if not host:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._record_key(host, outcome, now)
+            site = site_domain(host)
+            if site != host and outcome not in CONTENT_OUTCOMES and host not in self.shared_hosting:
+                self._record_key(site, outcome, now)
+            self._dirty = True
+
+        if now - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def lookup(self, host):
+        """표본이 충분한 가장 구체적인 도메인 기록 반환 (없으면 None)"""
+        host = normalize_host(host)
+        # 공유 호스팅 플랫폼의 사이트는 플랫폼 도메인과 그 상위 도메인 기록을 사용하지 않음
+        platform = self.shared_hosting.match(host)
+        with self._lock:
+            for suffix in host_suffixes(host):
+                if suffix == platform and suffix != host:
+                    break
+                entry = self._domains.get(suffix)
+                if entry and sum(entry.get(name, 0) for name in OUTCOMES) >= self.min_samples:
+                    return dict(entry)
+        return None
+
+    def should_skip(self, host):
+        """과거에 거의 항상 실패한 도메인이면 True (retry_after가 지나면 다시 시도)"""
+        entry = self.lookup(host)
+        if entry is None or time.time() - entry['updated'] >= self.retry_after:
+            return False
+
+        # 낮은 품질은 요청이 실패한 것이 아니므로 세지 않음
+        total = sum(entry.get(name, 0) for name in OUTCOMES if name not in CONTENT_OUTCOMES)
+        if total < self.min_samples:
+            return False
+        successes = sum(entry.get(name, 0) for name in SUCCESS_OUTCOMES)
+        return successes / total < self.skip_below
+
+    def preferred_strategy(self, host):
+        """
+        과거에 성공한 방법 중 가장 저렴한 추출 방법
+
+        Returns:
+            str or None: 'http', 'render' 또는 판단할 기록이 없으면 None
+        """
+        entry = self.lookup(host)
+        if entry is None:
+            return None
+
+        http_ok, render_ok = entry.get('http_ok', 0), entry.get('render_ok', 0)
+        if http_ok == 0 and render_ok == 0:
+            return None
+        # 일반 요청이 절반 이상 통했다면 렌더링 없이 먼저 시도
+        return 'http' if http_ok >= render_ok else 'render'
+
+    def flush(self):
+        """변경된 기록을 파일에 저장"""
+        with self._lock:
+            if not self._dirty:
+                return
+            if len(self._domains) > self.max_domains:
+                oldest = sorted(self._domains, key=lambda key: self._domains[key].get('updated', 0))
+                for key in oldest[:len(self._domains) - self.max_domains]:
+                    del self._domains[key]
+            data = json.dumps({"domains": self._domains}, ensure_ascii=False)
+            self._dirty = False
+            self._last_flush = time.time()
+
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # 임시 파일에 쓴 뒤 교체하여 반쯤 쓰인 파일을 읽지 않도록 함
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"도메인 통계 저장 실패 ({self.path}): {str(e)}")
+
+    def stats(self):
+        with self._lock:
+            return {"domains": len(self._domains)}
+
+
+def get_domain_stats():
+    """
+    공유 도메인 통계 저장소 반환 (DOMAIN_STATS_ENABLED가 False이면 None)
+
+    config.py 설정:
+        DOMAIN_STATS_PATH: 저장 파일 경로 (기본값: cache/domain_stats.json)
+        DOMAIN_STATS_MIN_SAMPLES: 판단에 필요한 최소 표본 수 (기본값: 3)
+        DOMAIN_STATS_SKIP_BELOW: 이 성공률 미만인 도메인은 건너뜀 (기본값: 0.1)
+        DOMAIN_STATS_RETRY_AFTER: 건너뛴 도메인을 다시 시도하기까지의 시간(초, 기본값: 7일)
+    """
+    global _domain_stats
+
+    config = get_config()
+    if not getattr(config, "DOMAIN_STATS_ENABLED", True):
+        return None
+
+    with _domain_stats_lock:
+        if _domain_stats is None:
+            _domain_stats = DomainStats(
+                getattr(config, "DOMAIN_STATS_PATH", os.path.join(CACHE_ROOT, 'domain_stats.json')),
+                min_samples=int(getattr(config, "DOMAIN_STATS_MIN_SAMPLES", 3)),
+                skip_below=float(getattr(config, "DOMAIN_STATS_SKIP_BELOW", 0.1)),
+                retry_after=float(getattr(config, "DOMAIN_STATS_RETRY_AFTER", 7 * 86400))
+            )
+            atexit.register(_domain_stats.flush)
+        return _domain_stats
@@ -0,0 +1,250 @@
+import asyncio
+import atexit
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+from multidict import CIMultiDict
+
+from app.settings import get_config
+from app.utils.page_cache import get_page_cache
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 프로세스 전체에서 공유하는 엔진 (get_fetch_engine()으로 생성)
+_engine = None
+_engine_lock = threading.Lock()
+
+# 스트리밍 다운로드 단위와 콘텐츠 판별에 사용하는 앞부분 크기
+CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 4096
+
+
+class FetchResult:
+    """HTTP 요청 결과 (오류가 발생하거나 본문이 거부되면 error에 메시지)"""
+
+    __slots__ = ('url', 'status', 'headers', 'body', 'error', 'cache_status', 'truncated', 'timed_out')
+
+    def __init__(self, url, status=None, headers=None, body=b'', error=None, cache_status=None,
+                 truncated=False, timed_out=False):
+        self.url = url
+        self.status = status
+        self.headers = headers if headers is not None else CIMultiDict()
+        self.body = body
+        self.error = error
+        self.cache_status = cache_status  # None, 'hit', 'revalidated', 'miss'
+        self.truncated = truncated  # 본문이 최대 크기에서 잘렸으면 True
+        self.timed_out = timed_out  # 시간 초과로 실패했으면 True
+
+
+class FetchEngine:
+    """
+    asyncio 기반 HTTP 요청 엔진
+
+    전용 스레드에서 이벤트 루프 하나를 실행하고, 모든 요청이 하나의 aiohttp
+    세션(keep-alive 연결 풀)을 공유합니다. 동시 연결 수는 전체(max_connections)와
+    호스트별(max_per_host)로 제한되며, 한도를 넘는 요청은 연결이 날 때까지 대기합니다.
+
+    본문은 스트리밍으로 받아 max_body_bytes에서 자르므로 URL 하나가 사용하는
+    대역폭과 메모리가 제한됩니다.
+
+    HTML 파싱이나 Selenium처럼 블로킹되는 작업은 run_blocking()으로 크기가 제한된
+    스레드 풀에서 실행하여 이벤트 루프를 막지 않도록 합니다.
+    """
+
+    def __init__(self, max_connections=100, max_per_host=4, timeout=15,
+                 parse_workers=None, render_workers=3, max_body_bytes=2 * 1024 * 1024):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.max_body_bytes = max_body_bytes
+
+        self._loop = asyncio.new_event_loop()
+        self._session = None
+        self._executors = {
+            'parse': ThreadPoolExecutor(max_workers=parse_workers or min(8, os.cpu_count() or 4),
+                                        thread_name_prefix='fetch-parse'),
+            'render': ThreadPoolExecutor(max_workers=render_workers,
+                                         thread_name_prefix='fetch-render')
+        }
+
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name='fetch-engine', daemon=True)
+        self._thread.start()
+
+    def _get_session(self):
+        # 세션은 반드시 이벤트 루프 스레드 안에서 생성
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=30
+            )
+            # total/connect 제한은 호스트별 연결 대기 시간까지 포함하므로, 같은 호스트의 요청이 많으면
+            # 뒤쪽 요청이 연결도 못 한 채 시간 초과됩니다. 대기 시간은 요청 단계 예산이 제한하고,
+            # 여기서는 연결, 읽기 간격, 연결 후 본문 수신 시간(_fetch_network)만 제한합니다.
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+            )
+        return self._session
+
+    async def fetch(self, url, headers=None, use_cache=True, sniff=None):
+        """
+        URL의 응답 본문을 가져옴 (페이지 캐시 사용)
+
+        캐시된 응답이 유효하면 네트워크 요청 없이 반환하고, 만료되었으면
+        ETag/Last-Modified로 조건부 요청을 보내 304 응답 시 캐시된 본문을 사용합니다.
+        최대 크기에서 잘린 본문은 캐시하지 않습니다.
+
+        Args:
+            url (str): 요청할 URL
+            headers (dict): 요청 헤더
+            use_cache (bool): 페이지 캐시 사용 여부
+            sniff (callable): sniff(content_type, 본문 앞부분)이 False를 반환하면
+                              나머지 본문을 받지 않고 중단 (200 응답에만 적용)
+
+        Returns:
+            FetchResult: 응답 상태, 헤더, 본문 (실패하거나 거부되면 error 설정)
+        """
+        cache = get_page_cache() if use_cache else None
+        cached = None
+
+        if cache is not None:
+            cached = await self.run_blocking(cache.lookup, url)
+            if cached is not None:
+                meta, body, fresh = cached
+                if fresh:
+                    return FetchResult(meta['final_url'], meta['status'],
+                                       CIMultiDict(meta['headers']), body, cache_status='hit')
+                headers = dict(headers or {}, **cache.conditional_headers(meta))
+
+        result = await self._fetch_network(url, headers, sniff)
+        if cache is None or result.error:
+            return result
+
+        if result.status == 304 and cached is not None:
+            meta, body, _ = cached
+            await self.run_blocking(cache.refresh, url, meta, result.headers)
+            return FetchResult(meta['final_url'], meta['status'],
+                               CIMultiDict(meta['headers']), body, cache_status='revalidated')
+
+        if result.status == 200 and not result.truncated:
+            await self.run_blocking(cache.store, url, result.url, result.status, result.headers, result.body)
+            result.cache_status = 'miss'
+        return result
+
+    async def _fetch_network(self, url, headers, sniff=None):
+        session = self._get_session()
+        try:
+            async with session.get(url, headers=headers, allow_redirects=True) as response:
+                # 응답 헤더를 받은 뒤부터 본문 수신 시간 제한
+                body_deadline = time.monotonic() + self.timeout
+                result = FetchResult(str(response.url), response.status, CIMultiDict(response.headers))
+                content_type = response.headers.get('Content-Type', '').lower()
+                if response.status != 200:
+                    sniff = None
+
+                chunks = []
+                size = 0
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if time.monotonic() > body_deadline:
+                        raise asyncio.TimeoutError()
+
+                    # 앞부분이 모이면 한 번만 검사하여 받을 필요가 없는 본문은 바로 중단
+                    if sniff is not None and size >= SNIFF_BYTES:
+                        if not sniff(content_type, b''.join(chunks)[:SNIFF_BYTES]):
+                            response.close()
+                            result.error = f"본문 거부됨 ({content_type or '콘텐츠 유형 없음'})"
+                            return result
+                        sniff = None
+
+                    if self.max_body_bytes and size >= self.max_body_bytes:
+                        # 나머지는 받지 않고 연결을 닫음
+                        result.truncated = size > self.max_body_bytes or not response.content.at_eof()
+                        if result.truncated:
+                            response.close()
+                            logger.info(f"본문이 {self.max_body_bytes}바이트를 넘어 잘림: {url}")
+                        break
+
+                body = b''.join(chunks)
+                if self.max_body_bytes:
+                    body = body[:self.max_body_bytes]
+
+                # 전체 본문이 SNIFF_BYTES보다 짧은 경우
+                if sniff is not None and not sniff(content_type, body[:SNIFF_BYTES]):
+                    result.error = f"본문 거부됨 ({content_type or '콘텐츠 유형 없음'})"
+                    return result
+
+                result.body = body
+                return result
+        except asyncio.TimeoutError:
+            return FetchResult(url, error=f"시간 초과 ({self.timeout}초)", timed_out=True)
+        except aiohttp.ClientError as e:
+            return FetchResult(url, error=str(e) or type(e).__name__)
+
+    async def run_blocking(self, func, *args, pool='parse'):
+        """블로킹 함수를 전용 스레드 풀('parse' 또는 'render')에서 실행"""
+        return await self._loop.run_in_executor(self._executors[pool], func, *args)
+
+    def submit(self, coro):
+        """다른 스레드에서 코루틴을 엔진의 이벤트 루프에 제출 (concurrent.futures.Future 반환)"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro, timeout=None):
+        """다른 스레드에서 코루틴을 실행하고 결과를 기다림"""
+        return self.submit(coro).result(timeout)
+
+    async def _close_session(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def close(self):
+        """세션과 스레드 풀을 정리하고 이벤트 루프 종료"""
+        if not self._loop.is_running():
+            return
+        try:
+            self.run(self._close_session(), timeout=5)
+        except Exception as e:
+            logger.warning(f"HTTP 세션 종료 중 오류: {str(e)}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+
+
+def get_fetch_engine():
+    """
+    공유 FetchEngine 반환 (최초 호출 시 생성)
+
+    config.py 설정:
+        FETCH_MAX_CONNECTIONS: 전체 동시 연결 수 (기본값: 100)
+        FETCH_MAX_PER_HOST: 호스트별 동시 연결 수 (기본값: 4)
+        FETCH_TIMEOUT: 연결, 읽기 간격, 응답 헤더 이후 본문 수신 제한 시간(초, 기본값: 15 - 호스트별 연결 대기 시간은 제외)
+        FETCH_PARSE_WORKERS: HTML 파싱 스레드 수 (기본값: CPU 수, 최대 8)
+        FETCH_RENDER_WORKERS: Selenium 렌더링 스레드 수 (기본값: 3)
+        FETCH_MAX_BODY_BYTES: URL당 최대 본문 크기 (기본값: 2MB, 넘는 부분은 잘라냄, 0이면 제한 없음)
+    """
+    global _engine
+
+    with _engine_lock:
+        if _engine is None:
+            config = get_config()
+            _engine = FetchEngine(
+                max_connections=int(getattr(config, "FETCH_MAX_CONNECTIONS", 100)),
+                max_per_host=int(getattr(config, "FETCH_MAX_PER_HOST", 4)),
+                timeout=float(getattr(config, "FETCH_TIMEOUT", 15)),
+                parse_workers=getattr(config, "FETCH_PARSE_WORKERS", None),
+                render_workers=int(getattr(config, "FETCH_RENDER_WORKERS", 3)),
+                max_body_bytes=int(getattr(config, "FETCH_MAX_BODY_BYTES", 2 * 1024 * 1024))
+            )
+            atexit.register(_engine.close)
+            logger.info(f"HTTP 요청 엔진 시작 (전체 연결 {_engine.max_connections}개, "
+                        f"호스트별 {_engine.max_per_host}개)")
+        return _engine
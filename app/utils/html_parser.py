@@ -0,0 +1,166 @@
+import logging
+import re
+
+from bs4 import BeautifulSoup
+
+from app.settings import get_config
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml이 없으면 BeautifulSoup 백엔드만 사용
+    lxml = None
+    etree = None
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 본문 추출 전에 제거할 요소
+REMOVED_TAGS = ('script', 'style', 'nav', 'footer', 'header', 'aside', 'iframe', 'form')
+
+# 메인 콘텐츠일 가능성이 높은 id/class 패턴
+MAIN_ID_PATTERN = re.compile('content|article|main', re.I)
+MAIN_CONTENT_PATTERN = re.compile('content|article|main|post', re.I)
+
+
+def _main_text_bs4(html_content):
+    """BeautifulSoup(html.parser)으로 메인 콘텐츠 영역의 텍스트 추출"""
+    # BeautifulSoup으로 HTML 파싱
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    # 불필요한 요소 제거
+    for element in soup(list(REMOVED_TAGS)):
+        element.extract()
+
+    # 특정 클래스/ID를 가진 요소 찾기 (메인 콘텐츠일 가능성이 높은 부분)
+    main_content = None
+
+    # 콘텐츠가 있을 가능성이 높은 요소들 우선순위대로 확인
+    content_candidates = [
+        soup.find('article'),
+        soup.find('main'),
+        soup.find(id=MAIN_ID_PATTERN),
+        soup.find(class_=MAIN_CONTENT_PATTERN),
+        soup.find('div', id=MAIN_CONTENT_PATTERN),
+        soup.find('div', class_=MAIN_CONTENT_PATTERN),
+        soup.body
+    ]
+
+    # 첫 번째 유효한 요소 선택
+    for candidate in content_candidates:
+        if candidate:
+            main_content = candidate
+            break
+
+    # 텍스트 추출
+    if main_content:
+        return main_content.get_text(separator=' ', strip=True)
+    return soup.get_text(separator=' ', strip=True)
+
+
+def _main_text_lxml(html_content):
+    """
+    lxml로 메인 콘텐츠 영역의 텍스트 추출 (BeautifulSoup 백엔드와 같은 규칙)
+
+    후보 요소(article, main, id/class 패턴 일치 요소)를 찾기 위해 트리를 한 번만
+    순회합니다. 첫 번째 article을 만나면 더 볼 필요가 없으므로 바로 멈춥니다.
+    """
+    try:
+        root = lxml.html.document_fromstring(html_content)
+    except (etree.ParserError, ValueError):
+        # 빈 문서나 인코딩 선언이 포함된 XHTML 문자열은 BeautifulSoup으로 처리
+        return _main_text_bs4(html_content)
+
+    # 불필요한 요소 제거 (뒤따르는 텍스트는 유지)
+    for element in list(root.iter(*REMOVED_TAGS)):
+        element.drop_tree()
+
+    # 우선순위: article, main, id 일치, class 일치, div id 일치, div class 일치
+    candidates = [None] * 6
+    for element in root.iter(etree.Element):
+        tag = element.tag
+        if tag == 'article':
+            candidates[0] = element
+            break
+        if tag == 'main' and candidates[1] is None:
+            candidates[1] = element
+
+        element_id = element.get('id')
+        if element_id:
+            if candidates[2] is None and MAIN_ID_PATTERN.search(element_id):
+                candidates[2] = element
+            if tag == 'div' and candidates[4] is None and MAIN_CONTENT_PATTERN.search(element_id):
+                candidates[4] = element
+
+        element_class = element.get('class')
+        if element_class and MAIN_CONTENT_PATTERN.search(element_class):
+            if candidates[3] is None:
+                candidates[3] = element
+            if tag == 'div' and candidates[5] is None:
+                candidates[5] = element
+
+    main_content = next((candidate for candidate in candidates if candidate is not None), None)
+    if main_content is None:
+        main_content = root.find('body')
+    if main_content is None:
+        main_content = root
+
+    return ' '.join(text.strip() for text in main_content.itertext() if text.strip())
+
+
+# 사용 가능한 파서 백엔드 (이름 -> 메인 콘텐츠 텍스트 추출 함수)
+PARSER_BACKENDS = {'bs4': _main_text_bs4}
+if lxml is not None:
+    PARSER_BACKENDS['lxml'] = _main_text_lxml
+
+
+def get_parser_backend():
+    """
+    설정된 HTML 파서 백엔드 이름 반환
+
+    config.py 설정:
+        HTML_PARSER_BACKEND: 'lxml' 또는 'bs4' (기본값: lxml이 설치되어 있으면 'lxml')
+    """
+    default = 'lxml' if 'lxml' in PARSER_BACKENDS else 'bs4'
+    backend = getattr(get_config(), "HTML_PARSER_BACKEND", default)
+    if backend not in PARSER_BACKENDS:
+        logger.warning(f"사용할 수 없는 HTML 파서 백엔드 '{backend}', '{default}' 사용")
+        return default
+    return backend
+
+
+def clean_text(text):
+    """추출한 텍스트의 공백, 줄바꿈, 제어 문자 정리"""
+    # 줄 단위로 분할하고 앞뒤 공백 제거
+    lines = (line.strip() for line in text.splitlines())
+
+    # 여러 줄의 제목을 한 줄로 합치기
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+
+    # 빈 줄 제거
+    text = '\n'.join(chunk for chunk in chunks if chunk)
+
+    # 텍스트 정리: 과도한 공백과 줄바꿈 제거
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\n+', '\n', text)
+
+    # 특수 문자 및 이상한 유니코드 대체 문자 정리
+    text = re.sub(r'[\x00-\x1F\x7F]', '', text)  # 제어 문자 제거
+    text = re.sub(r'', '', text)  # 대체 문자 제거
+
+    return text
+
+
+def extract_text_from_html(html_content, backend=None):
+    """
+    HTML에서 메인 콘텐츠 영역을 찾아 정리된 텍스트 추출
+
+    Args:
+        html_content (str): HTML 문자열
+        backend (str): 파서 백엔드 ('lxml' 또는 'bs4', 기본값: 설정값)
+
+    Returns:
+        str: 정리된 텍스트
+    """
+    extract_main_text = PARSER_BACKENDS[backend or get_parser_backend()]
+    return clean_text(extract_main_text(html_content))
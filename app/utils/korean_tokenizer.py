@@ -0,0 +1,206 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.settings import get_config
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 문장 경계 (문장부호 뒤 공백 또는 줄바꿈)
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?。？！])\s+|\n+')
+
+# 프로세스 전체에서 공유하는 풀 (get_korean_tokenizer()로 생성)
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+# 작업 프로세스(또는 프로세스 내 모드)에서 재사용하는 Okt 인스턴스
+_okt = None
+
+
+def normalize_korean_text(text):
+    """명사 추출 전 텍스트 정규화 (소문자 변환, 문장부호 제거, 공백 정리)"""
+    # 소문자 변환은 한국어에 적용할 필요 없으나, 혼합 텍스트가 있을 수 있어서 유지
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', ' ', text)  # 문장부호 제거
+    return re.sub(r'\s+', ' ', text).strip()  # 여러 공백을 하나로 변환
+
+
+def split_sentence_chunks(text, max_chars=1000):
+    """
+    텍스트를 문장 단위로 나누어 최대 max_chars자 묶음으로 합침
+
+    max_chars보다 긴 문장은 공백 위치에서 자릅니다.
+    """
+    chunks = []
+    current, current_chars = [], 0
+
+    for sentence in SENTENCE_BOUNDARY_PATTERN.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            chunks.append(sentence[:cut])
+            sentence = sentence[cut:].strip()
+        if not sentence:
+            continue
+
+        if current and current_chars + len(sentence) + 1 > max_chars:
+            chunks.append(' '.join(current))
+            current, current_chars = [], 0
+        current.append(sentence)
+        current_chars += len(sentence) + 1
+
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+
+def _get_okt(jvm_heap_mb=None):
+    """현재 프로세스의 Okt 인스턴스 (처음 호출할 때 힙 크기를 제한한 JVM과 함께 생성)"""
+    global _okt
+    if _okt is None:
+        import jpype
+        from konlpy import jvm
+        from konlpy.tag import Okt
+
+        if jvm_heap_mb and not jpype.isJVMStarted():
+            jvm.init_jvm(max_heap_size=jvm_heap_mb)
+        _okt = Okt()
+    return _okt
+
+
+def _init_worker(jvm_heap_mb):
+    """작업 프로세스 초기화 - JVM과 Okt를 한 번만 생성"""
+    _get_okt(jvm_heap_mb)
+
+
+def _nouns_batch(chunks):
+    """문장 묶음 목록의 명사 추출 (작업 프로세스에서 실행)"""
+    okt = _get_okt()
+    return [okt.nouns(chunk) for chunk in chunks]
+
+
+class KoreanTokenizerPool:
+    """
+    Okt 명사 추출 작업 프로세스 풀
+
+    Okt는 JPype로 JVM을 호출하므로 한 프로세스 안에서는 GIL에 묶여 순차 실행됩니다.
+    작업 프로세스마다 힙 크기를 제한한 JVM과 Okt 인스턴스를 하나씩 만들어 두고,
+    문서를 문장 묶음으로 나누어 여러 프로세스에 나눠 보냅니다.
+
+    workers가 0이면 현재 프로세스에서 Okt 하나를 재사용하여 순차 처리합니다.
+    """
+
+    def __init__(self, workers=None, jvm_heap_mb=512, chunk_chars=1000, batch_chars=20000):
+        """
+        Args:
+            workers (int): 작업 프로세스 수 (None이면 CPU 수와 4 중 작은 값, 0이면 프로세스 내 처리)
+            jvm_heap_mb (int): 작업 프로세스별 JVM 최대 힙 크기(MB)
+            chunk_chars (int): Okt 호출 한 번에 전달하는 최대 문자 수 (문장 단위로 묶음)
+            batch_chars (int): 작업 프로세스에 한 번에 보내는 최대 문자 수
+        """
+        self.workers = min(4, os.cpu_count() or 1) if workers is None else workers
+        self.jvm_heap_mb = jvm_heap_mb
+        self.chunk_chars = chunk_chars
+        self.batch_chars = batch_chars
+
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # 부모 프로세스의 스레드(요청 엔진 등)나 JVM 상태를 복제하지 않도록 spawn으로 시작
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.jvm_heap_mb,)
+                )
+            return self._executor
+
+    def _batches(self, chunks):
+        batch, batch_chars = [], 0
+        for chunk in chunks:
+            batch.append(chunk)
+            batch_chars += len(chunk)
+            if batch_chars >= self.batch_chars:
+                yield batch
+                batch, batch_chars = [], 0
+        if batch:
+            yield batch
+
+    def nouns_many(self, texts):
+        """
+        여러 텍스트의 명사 목록 추출
+
+        Returns:
+            list: 텍스트별 명사 목록 (입력 순서와 같음)
+        """
+        owners, chunks = [], []
+        for index, text in enumerate(texts):
+            for chunk in split_sentence_chunks(text or '', self.chunk_chars):
+                chunk = normalize_korean_text(chunk)
+                if chunk:
+                    owners.append(index)
+                    chunks.append(chunk)
+
+        if self.workers <= 0:
+            _get_okt(self.jvm_heap_mb)
+            chunk_nouns = _nouns_batch(chunks)
+        else:
+            try:
+                chunk_nouns = []
+                for nouns in self._get_executor().map(_nouns_batch, self._batches(chunks)):
+                    chunk_nouns.extend(nouns)
+            except BrokenProcessPool:
+                # 작업 프로세스 초기화 실패(JVM 없음 등) - 다음 호출에서 풀을 다시 생성
+                self.close()
+                raise
+
+        results = [[] for _ in texts]
+        for index, nouns in zip(owners, chunk_nouns):
+            results[index].extend(nouns)
+        return results
+
+    def nouns(self, text):
+        """텍스트 하나의 명사 목록 추출"""
+        return self.nouns_many([text])[0]
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+def get_korean_tokenizer():
+    """
+    공유 한국어 형태소 분석 풀 반환
+
+    config.py 설정:
+        KOREAN_TOKENIZER_WORKERS: 작업 프로세스 수 (기본값: CPU 수와 4 중 작은 값, 0이면 프로세스 내 처리)
+        KOREAN_JVM_HEAP_MB: 작업 프로세스별 JVM 최대 힙 크기(MB, 기본값: 512)
+        KOREAN_CHUNK_CHARS: Okt 호출 한 번에 전달하는 최대 문자 수 (기본값: 1000)
+        KOREAN_BATCH_CHARS: 작업 프로세스에 한 번에 보내는 최대 문자 수 (기본값: 20000)
+    """
+    global _tokenizer
+
+    with _tokenizer_lock:
+        if _tokenizer is None:
+            config = get_config()
+            workers = getattr(config, "KOREAN_TOKENIZER_WORKERS", None)
+            _tokenizer = KoreanTokenizerPool(
+                workers=int(workers) if workers is not None else None,
+                jvm_heap_mb=int(getattr(config, "KOREAN_JVM_HEAP_MB", 512)),
+                chunk_chars=int(getattr(config, "KOREAN_CHUNK_CHARS", 1000)),
+                batch_chars=int(getattr(config, "KOREAN_BATCH_CHARS", 20000))
+            )
+            atexit.register(_tokenizer.close)
+        return _tokenizer
@@ -0,0 +1,161 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+
+from app.settings import get_config
+from app.utils.disk_cache import DiskCache, CACHE_ROOT
+from app.utils.url_utils import canonicalize_url
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 캐시에 보관할 응답 헤더
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date')
+
+_MAX_AGE_PATTERN = re.compile(r'max-age=(\d+)', re.I)
+
+# 프로세스 전체에서 공유하는 캐시 (get_page_cache()로 생성)
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+
+class PageCache:
+    """
+    정규화된 URL 기준 HTTP 페이지 캐시
+
+    URL별 메타데이터(응답 헤더, ETag, Last-Modified, 저장 시각, 유효 시간)와
+    본문을 분리하여 저장합니다. 본문은 내용 해시를 키로 압축 저장하므로 여러 URL이
+    같은 내용을 반환해도 한 번만 저장됩니다. 유효 시간이 지난 항목은 버리지 않고
+    조건부 요청(If-None-Match / If-Modified-Since)의 검증자로 사용합니다.
+
+    Selenium으로 렌더링한 텍스트도 URL별로 보관하여 유효 시간 안에는 다시
+    렌더링하지 않습니다.
+    """
+
+    def __init__(self, directory, max_age=86400, max_bytes=512 * 1024 * 1024, max_entries=20000):
+        self.max_age = max_age
+        self._meta = DiskCache(os.path.join(directory, 'meta'), max_entries=max_entries, suffix='.json')
+        self._bodies = DiskCache(os.path.join(directory, 'body'), max_bytes=max_bytes, suffix='.bin')
+        self._rendered = DiskCache(os.path.join(directory, 'rendered'), ttl=max_age,
+                                   max_entries=max_entries, suffix='.txt')
+
+    def _entry_max_age(self, headers):
+        """응답의 Cache-Control을 반영한 유효 시간 (no-store면 None)"""
+        cache_control = (headers.get('Cache-Control') or '').lower()
+        if 'no-store' in cache_control:
+            return None
+        if 'no-cache' in cache_control:
+            return 0
+        match = _MAX_AGE_PATTERN.search(cache_control)
+        if match:
+            return min(self.max_age, int(match.group(1)))
+        return self.max_age
+
+    def lookup(self, url):
+        """
+        캐시 항목 조회
+
+        Returns:
+            tuple or None: (메타데이터, 본문, 유효 여부) - 항목이 없으면 None
+        """
+        key = canonicalize_url(url)
+        meta = self._meta.get_json(key)
+        if meta is None:
+            return None
+
+        compressed = self._bodies.get(meta['body_hash'])
+        if compressed is None:
+            # 본문이 용량 제한으로 삭제된 경우
+            self._meta.delete(key)
+            return None
+
+        fresh = time.time() - meta['fetched_at'] < meta['max_age']
+        return meta, zlib.decompress(compressed), fresh
+
+    def conditional_headers(self, meta):
+        """저장된 검증자로 조건부 요청 헤더 생성"""
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, url, final_url, status, headers, body):
+        """200 응답 저장 (Cache-Control: no-store 응답은 저장하지 않음)"""
+        max_age = self._entry_max_age(headers)
+        if max_age is None:
+            return
+
+        body_hash = hashlib.sha256(body).hexdigest()
+        self._bodies.set(body_hash, zlib.compress(body, 1))
+        self._meta.set_json(canonicalize_url(url), {
+            "url": url,
+            "final_url": final_url,
+            "status": status,
+            "headers": {name: headers[name] for name in STORED_HEADERS if name in headers},
+            "etag": headers.get('ETag'),
+            "last_modified": headers.get('Last-Modified'),
+            "body_hash": body_hash,
+            "fetched_at": time.time(),
+            "max_age": max_age
+        })
+
+    def refresh(self, url, meta, headers):
+        """304 Not Modified 응답을 받은 항목의 저장 시각과 헤더 갱신"""
+        stored_headers = dict(meta['headers'])
+        stored_headers.update({name: headers[name] for name in STORED_HEADERS if name in headers})
+        max_age = self._entry_max_age(stored_headers)
+        if max_age is None:
+            self._meta.delete(canonicalize_url(url))
+            return
+
+        meta = dict(meta, headers=stored_headers, fetched_at=time.time(), max_age=max_age,
+                    etag=stored_headers.get('ETag'), last_modified=stored_headers.get('Last-Modified'))
+        self._meta.set_json(canonicalize_url(url), meta)
+
+    def get_rendered_text(self, url):
+        """Selenium으로 렌더링하여 추출한 텍스트 조회"""
+        data = self._rendered.get(canonicalize_url(url))
+        return data.decode('utf-8') if data is not None else None
+
+    def set_rendered_text(self, url, text):
+        """Selenium으로 렌더링하여 추출한 텍스트 저장"""
+        self._rendered.set(canonicalize_url(url), text.encode('utf-8'))
+
+    def stats(self):
+        return {
+            "pages": self._meta.stats(),
+            "rendered": self._rendered.stats()
+        }
+
+
+def get_page_cache():
+    """
+    공유 페이지 캐시 반환 (PAGE_CACHE_ENABLED가 False이면 None)
+
+    config.py 설정:
+        PAGE_CACHE_DIR: 캐시 디렉토리 (기본값: cache/pages)
+        PAGE_CACHE_MAX_AGE: 최대 유효 시간(초, 기본값: 86400) - 응답의 max-age가 더 짧으면 그 값 사용
+        PAGE_CACHE_MAX_BYTES: 본문 저장 최대 크기 (기본값: 512MB)
+        PAGE_CACHE_MAX_ENTRIES: 최대 URL 수 (기본값: 20000)
+    """
+    global _page_cache
+
+    config = get_config()
+    if not getattr(config, "PAGE_CACHE_ENABLED", True):
+        return None
+
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageCache(
+                getattr(config, "PAGE_CACHE_DIR", os.path.join(CACHE_ROOT, 'pages')),
+                max_age=float(getattr(config, "PAGE_CACHE_MAX_AGE", 86400)),
+                max_bytes=int(getattr(config, "PAGE_CACHE_MAX_BYTES", 512 * 1024 * 1024)),
+                max_entries=int(getattr(config, "PAGE_CACHE_MAX_ENTRIES", 20000))
+            )
+        return _page_cache
@@ -0,0 +1,87 @@
+import threading
+import time
+
+# 이름별로 공유되는 토큰 버킷 (모든 /search 요청이 같은 인스턴스를 사용)
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    스레드 안전한 토큰 버킷 속도 제한기
+
+    초당 rate개의 토큰이 채워지고, 최대 capacity개까지 누적됩니다.
+    요청 하나를 보내기 전에 acquire()로 토큰을 하나 가져갑니다.
+    """
+
+    def __init__(self, rate, capacity):
+        self._lock = threading.Lock()
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def configure(self, rate, capacity):
+        """설정 값이 바뀐 경우 속도와 버킷 크기를 갱신"""
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
+            self.capacity = float(capacity)
+            self._tokens = min(self._tokens, self.capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rate > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        토큰을 가져올 때까지 대기
+
+        Args:
+            tokens (int): 필요한 토큰 수
+            timeout (float): 최대 대기 시간(초), None이면 무제한
+
+        Returns:
+            bool: 토큰 획득 여부 (timeout 초과 시 False)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                # rate가 0 이하이면 속도 제한 없음
+                if self.rate <= 0:
+                    return True
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+def get_rate_limiter(name, rate, capacity):
+    """
+    이름으로 공유 토큰 버킷을 가져오거나 생성
+
+    Args:
+        name (str): 제한기 이름 (예: 'serpapi', 'google_cse')
+        rate (float): 초당 허용 요청 수
+        capacity (float): 순간적으로 허용하는 최대 요청 수
+
+    Returns:
+        TokenBucket: 프로세스 전체에서 공유되는 제한기
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = TokenBucket(rate, capacity)
+            _limiters[name] = limiter
+        elif limiter.rate != float(rate) or limiter.capacity != float(capacity):
+            limiter.configure(rate, capacity)
+        return limiter
@@ -1,21 +1,45 @@
 import requests
 from bs4 import BeautifulSoup
-from serpapi import GoogleSearch
 import os
 import sys
-import importlib.util
 import json
-import time
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, TimeoutError as FutureTimeoutError
+from app.settings import get_config
+from app.utils.search_providers import (
+    get_provider, get_fanout_provider_names, normalize_query,
+    SerpApiProvider, GoogleCseProvider
+)
+from app.utils.disk_cache import DiskCache, CACHE_ROOT
+from app.utils.url_utils import UrlIndex
 
-def get_search_results(query, language, num_results=40):
+# 검색 API 응답 캐시 (load_search_cache()로 생성)
+_search_cache = None
+
+# 스니펫 보강 설정: 동시 요청 수와 문서당 최대 읽기 바이트
+ENRICH_MAX_WORKERS = 16
+ENRICH_MAX_BYTES = 64 * 1024
+_enrich_session = None
+_enrich_session_lock = threading.Lock()
+
+_HEAD_END = re.compile(rb'</head\s*>', re.I)
+_PARAGRAPH_END = re.compile(rb'</p\s*>', re.I)
+_META_DESCRIPTION = re.compile(rb'<meta[^>]+name=["\']?description', re.I)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.I)
+
+def get_search_results(query, language, num_results=40, deadline=None):
     """
     Get search results from Google for a given query.
-    Supports both SerpAPI and Google Custom Search API.
+    Supports SerpAPI, Google Custom Search API, both at once ('fanout')
+    and offline replay of recorded results (see app.utils.search_providers).
     
     Args:
         query (str): The search query
         language (str): The language code ('en' for English, 'ko' for Korean)
         num_results (int): Number of search results to retrieve
+        deadline (Deadline): 요청 시간 예산 - 검색 단계의 남은 시간을 검색 API와 스니펫 보강의
+                             제한 시간으로 사용하고, 생략한 작업은 note_cut('search', ...)으로 기록
         
     Returns:
         list: List of dictionaries containing search results (url, title, snippet)
@@ -24,242 +48,284 @@ def get_search_results(query, language, num_results=40):
     config = load_config()
     search_api = getattr(config, "SEARCH_API", "serpapi").lower()
     
+    provider = None if search_api == "fanout" else get_provider(search_api, config)
+    
+    # 같은 검색어/언어/API/결과 수로 최근에 검색한 적이 있으면 캐시된 결과 사용
+    cache = load_search_cache(config) if provider is None or provider.cacheable else None
+    cache_key = make_search_cache_key(query, language, provider.name if provider else search_api, num_results)
+    if cache is not None:
+        cached_results = cache.get_json(cache_key)
+        if cached_results is not None:
+            print(f"검색 결과 캐시 적중: '{query}' ({len(cached_results)}개 결과)")
+            return cached_results
+    
     # 선택된 API로 검색 수행
-    if search_api == "google_cse":
-        return get_results_from_google_cse(query, language, num_results, config)
+    cuts_before = len(deadline.cuts) if deadline is not None else 0
+    if provider is None:
+        search_results = get_results_fanout(query, language, num_results, config, deadline)
     else:
-        return get_results_from_serpapi(query, language, num_results, config)
+        search_results = search_with_provider(provider, query, language, num_results, deadline=deadline)
+    
+    # 빈 결과(API 오류 등)나 시간 예산 때문에 일부만 받은 결과는 캐시하지 않음
+    partial = deadline is not None and len(deadline.cuts) > cuts_before
+    if cache is not None and search_results and not partial:
+        cache.set_json(cache_key, search_results)
+    
+    return search_results
 
-def load_config():
-    """config.py 파일에서 설정 로드"""
-    try:
-        # 프로젝트 루트 경로에서 config.py 로드
-        spec = importlib.util.spec_from_file_location("config", "config.py")
-        config = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(config)
-        return config
-    except Exception as e:
-        print(f"config.py 파일을 로드하는 중 오류 발생: {str(e)}")
-        return type('obj', (object,), {})  # 빈 객체 반환
+def make_search_cache_key(query, language, search_api, num_results):
+    """정규화된 검색어, 언어, 검색 API, 결과 수로 캐시 키 생성"""
+    return json.dumps([normalize_query(query), language, search_api, int(num_results)],
+                      ensure_ascii=False)
 
-def get_results_from_google_cse(query, language, num_results, config):
-    """Google Custom Search API를 사용하여 검색 결과 가져오기"""
-    search_results = []
+def load_search_cache(config):
+    """
+    검색 결과 캐시 반환 (SEARCH_CACHE_ENABLED가 False이면 None)
     
-    # API 키와 검색 엔진 ID 가져오기
-    api_key = getattr(config, "GOOGLE_API_KEY", "")
-    cse_id = getattr(config, "GOOGLE_CSE_ID", "")
+    config.py 설정:
+        SEARCH_CACHE_DIR: 캐시 디렉토리 (기본값: cache/search)
+        SEARCH_CACHE_TTL: 유효 시간(초, 기본값: 86400)
+        SEARCH_CACHE_MAX_ENTRIES: 최대 항목 수 (기본값: 1000)
+    """
+    global _search_cache
     
-    # 키가 설정되어 있는지 확인
-    if not api_key or not cse_id:
-        print("경고: Google Custom Search API 키 또는 CSE ID가 설정되지 않았습니다.")
-        print("config.py 파일에 GOOGLE_API_KEY와 GOOGLE_CSE_ID를 설정하세요.")
-        return []
+    if not getattr(config, "SEARCH_CACHE_ENABLED", True):
+        return None
     
-    print(f"Google Custom Search API 사용 중 (API 키: {api_key[:5]}...)")
+    directory = getattr(config, "SEARCH_CACHE_DIR", os.path.join(CACHE_ROOT, 'search'))
+    if _search_cache is None or _search_cache.directory != os.path.abspath(directory):
+        _search_cache = DiskCache(directory, suffix='.json')
     
-    # 필요한 페이지 수 계산 (최대 10개 결과/페이지, 최대 10페이지)
-    results_per_page = 10
-    max_pages = min(min(10, (num_results + results_per_page - 1) // results_per_page), 10)
+    _search_cache.ttl = float(getattr(config, "SEARCH_CACHE_TTL", 86400))
+    _search_cache.max_entries = int(getattr(config, "SEARCH_CACHE_MAX_ENTRIES", 1000))
+    return _search_cache
+
+def get_search_cache_stats():
+    """검색 결과 캐시 적중/실패 통계 반환"""
+    if _search_cache is None:
+        return {"hits": 0, "misses": 0, "hit_rate": 0.0, "entries": 0, "bytes": 0, "evictions": 0}
+    return _search_cache.stats()
+
+def load_config():
+    """config.py 설정 반환 (app.settings에서 캐시된 설정을 가져옴)"""
+    return get_config()
+
+def stage_remaining(deadline):
+    """검색 단계의 남은 시간(초, 예산이 없으면 None)"""
+    return deadline.stage_remaining() if deadline is not None else None
+
+def search_with_provider(provider, query, language, num_results, enrich=True, deadline=None):
+    """검색 API로 검색한 뒤 필요하면 짧은 스니펫을 보강"""
+    search_results = provider.search(query, language, num_results, timeout=stage_remaining(deadline))
+    if deadline is not None and deadline.stage_expired():
+        # 시간 안에 응답하지 않은 페이지는 결과에서 빠짐
+        deadline.note_cut('search', 'deadline', provider=provider.name, results=len(search_results))
     
-    base_url = "https://www.googleapis.com/customsearch/v1"
+    # 추가 정보 추출 (필요한 경우)
+    if enrich and provider.needs_enrichment:
+        enrich_search_results(search_results, deadline)
+    
+    return search_results
+
+def get_results_from_google_cse(query, language, num_results, config, enrich=True):
+    """Google Custom Search API를 사용하여 검색 결과 가져오기"""
+    return search_with_provider(GoogleCseProvider(config), query, language, num_results, enrich)
+
+def get_results_from_serpapi(query, language, num_results, config, enrich=True):
+    """SerpAPI를 사용하여 검색 결과 가져오기"""
+    return search_with_provider(SerpApiProvider(config), query, language, num_results, enrich)
+
+def get_results_fanout(query, language, num_results, config, deadline=None):
+    """
+    여러 검색 API(SEARCH_FANOUT_PROVIDERS, 기본값: SerpAPI와 Google Custom Search)를
+    동시에 조회하여 결과 병합
+    
+    먼저 응답한 API의 결과만으로 중복 없는 결과가 num_results개 이상이면
+    다른 API의 응답을 기다리지 않고 바로 반환합니다. 부족하면 나머지 API의
+    결과를 정규화된 URL 기준으로 중복 제거하여 이어 붙입니다.
+    검색 단계 예산이 끝날 때까지 응답하지 않은 API는 기다리지 않습니다.
+    """
+    providers = [get_provider(name, config) for name in get_fanout_provider_names(config)]
+    providers = [provider for provider in providers if provider.is_configured()]
+    if not providers:
+        print("경고: fanout 모드에서 사용할 수 있는 검색 API가 없습니다.")
+        return []
     
-    for page in range(1, max_pages + 1):
-        params = {
-            "key": api_key,
-            "cx": cse_id,
-            "q": query,
-            "num": min(results_per_page, 10),  # 최대 10개 결과
-            "start": (page - 1) * results_per_page + 1,  # 1-based 인덱스
+    search_results = []
+    url_index = UrlIndex()
+    
+    timeout = stage_remaining(deadline)
+    executor = ThreadPoolExecutor(max_workers=len(providers))
+    pending = {provider.name for provider in providers}
+    try:
+        future_to_provider = {
+            executor.submit(provider.search, query, language, num_results, timeout): provider.name
+            for provider in providers
         }
         
-        # 언어 설정
-        if language == "ko":
-            params["lr"] = "lang_ko"
-            params["gl"] = "kr"
-        else:
-            params["lr"] = "lang_en"
-            params["gl"] = "us"
-        
-        try:
-            print(f"페이지 {page} 검색 중...")
-            response = requests.get(base_url, params=params)
-            data = response.json()
+        for future in as_completed(future_to_provider, timeout=timeout):
+            provider = future_to_provider[future]
+            pending.discard(provider)
+            try:
+                provider_results = future.result()
+            except Exception as e:
+                print(f"{provider} 검색 중 오류 발생: {str(e)}")
+                continue
             
-            # 에러 확인
-            if "error" in data:
-                error_msg = data["error"].get("message", "알 수 없는 오류")
-                print(f"Google API 오류: {error_msg}")
-                break
-                
-            # 검색 결과 추출
-            if "items" in data:
-                page_results = data["items"]
-                print(f"페이지 {page}에서 {len(page_results)}개의 결과를 찾았습니다.")
-                
-                for item in page_results:
-                    search_results.append({
-                        'url': item.get("link", ""),
-                        'title': item.get("title", ""),
-                        'snippet': item.get("snippet", "")
-                    })
-                    
-                    # 충분한 결과를 얻으면 중단
-                    if len(search_results) >= num_results:
-                        break
-            else:
-                print(f"페이지 {page}에서 결과를 찾을 수 없습니다.")
-                break
-                
-            # 다음 페이지로 가기 전 잠시 대기
-            if page < max_pages and len(search_results) < num_results:
-                time.sleep(1)
-                
-            # 충분한 결과를 얻었으면 중단
+            added = 0
+            for result in provider_results:
+                if len(search_results) >= num_results:
+                    break
+                if url_index.add(result.get('url', '')):
+                    search_results.append(result)
+                    added += 1
+            print(f"{provider}에서 {len(provider_results)}개 결과 수신, 새 결과 {added}개 추가")
+            
+            # 충분한 결과를 얻었으면 나머지 API는 기다리지 않음
             if len(search_results) >= num_results:
                 break
-                
-        except Exception as e:
-            print(f"Google Custom Search API 호출 중 오류 발생: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-            break
+    except FutureTimeoutError:
+        print(f"검색 단계 시간 예산이 끝나 응답하지 않은 API를 기다리지 않습니다: {sorted(pending)}")
+        deadline.note_cut('search', 'deadline', skipped_providers=sorted(pending), results=len(search_results))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
     
-    print(f"총 {len(search_results)}개의 검색 결과를 Google Custom Search에서 가져왔습니다.")
+    print(f"총 {len(search_results)}개의 검색 결과를 병합했습니다.")
     
-    # 추가 정보 추출 (필요한 경우)
-    enrich_search_results(search_results)
+    # 추가 정보 추출 (병합된 결과에 대해 한 번만 수행)
+    if any(provider.needs_enrichment for provider in providers):
+        enrich_search_results(search_results, deadline)
     
     return search_results
 
-def get_results_from_serpapi(query, language, num_results, config):
-    """SerpAPI를 사용하여 검색 결과 가져오기"""
-    search_results = []
+def get_enrich_session():
+    """스니펫 보강용 공유 HTTP 세션 반환 (연결 풀과 keep-alive 재사용)"""
+    global _enrich_session
     
-    # SerpAPI 키 가져오기
-    api_key = getattr(config, "SERPAPI_KEY", "")
-    
-    if not api_key or api_key == "여기에_당신의_SERPAPI_키를_입력하세요":
-        print("경고: SERPAPI_KEY가 설정되지 않았습니다. config.py 파일에 API 키를 입력하세요.")
-        print("SerpAPI에 가입하여 API 키를 얻으세요: https://serpapi.com")
-        return []  # API 키가 없으면 빈 결과 반환
-    
-    print(f"SerpAPI 사용 중 (API 키: {api_key[:5]}...)")
+    with _enrich_session_lock:
+        if _enrich_session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=ENRICH_MAX_WORKERS,
+                                                    pool_maxsize=ENRICH_MAX_WORKERS)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.8'
+            })
+            _enrich_session = session
+        return _enrich_session
+
+def fetch_document_head(url, max_bytes=ENRICH_MAX_BYTES, timeout=5):
+    """
+    스니펫 추출에 필요한 문서 앞부분만 스트리밍으로 가져오기
     
-    # 각 페이지에서 가져올 결과 수
-    results_per_page = 10
+    </head>까지 읽었을 때 메타 설명이 있으면 그 자리에서, 없으면 첫 번째
+    </p>가 나올 때 읽기를 멈춥니다. 어느 경우든 max_bytes를 넘게 읽지 않습니다.
     
-    # 필요한 페이지 수 계산 (최대 4페이지)
-    max_pages = min(4, (num_results + results_per_page - 1) // results_per_page)
+    Args:
+        url (str): 가져올 URL
+        max_bytes (int): 최대 읽기 바이트 수
+        timeout (int): 요청 제한 시간(초)
+        
+    Returns:
+        str: 디코딩된 문서 앞부분
+    """
+    session = get_enrich_session()
+    buffer = bytearray()
     
-    for page in range(1, max_pages + 1):
-        # 검색 매개변수 설정
-        params = {
-            "engine": "google",
-            "q": query,
-            "api_key": api_key,
-            "num": results_per_page
-        }
+    with session.get(url, timeout=timeout, stream=True) as response:
+        for chunk in response.iter_content(chunk_size=8192):
+            # 경계에 걸친 태그도 찾을 수 있도록 직전 청크의 끝부분부터 검색
+            search_from = max(0, len(buffer) - 16)
+            buffer.extend(chunk)
+            
+            if _PARAGRAPH_END.search(buffer, search_from):
+                break
+            if _HEAD_END.search(buffer, search_from) and _META_DESCRIPTION.search(buffer):
+                break
+            if len(buffer) >= max_bytes:
+                break
         
-        # 두 번째 페이지부터는 페이지 번호 추가
-        if page > 1:
-            params["start"] = (page - 1) * results_per_page
+        # 인코딩: 헤더에 명시된 charset > 메타 태그 charset > UTF-8
+        encoding = None
+        if 'charset' in response.headers.get('Content-Type', '').lower():
+            encoding = response.encoding
+        if not encoding:
+            meta_charset = _META_CHARSET.search(buffer)
+            encoding = meta_charset.group(1).decode('ascii') if meta_charset else 'utf-8'
+    
+    try:
+        return bytes(buffer[:max_bytes]).decode(encoding, errors='replace')
+    except LookupError:
+        return bytes(buffer[:max_bytes]).decode('utf-8', errors='replace')
+
+def extract_head_snippet(url, timeout=5):
+    """문서 앞부분의 메타 설명 또는 첫 문단으로 스니펫 생성 (찾지 못하면 None)"""
+    try:
+        head_html = fetch_document_head(url, timeout=timeout)
+        soup = BeautifulSoup(head_html, 'html.parser')
         
-        # 언어 설정
-        if language == "ko":
-            params["gl"] = "kr"
-            params["hl"] = "ko"
+        # 메타 설명에서 스니펫 추출 시도
+        snippet = None
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        if meta_desc and 'content' in meta_desc.attrs:
+            snippet = meta_desc['content']
         else:
-            params["gl"] = "us"
-            params["hl"] = "en"
-        
-        print(f"페이지 {page} 검색 매개변수: {json.dumps({k: v for k, v in params.items() if k != 'api_key'})}")
+            first_p = soup.find('p')
+            if first_p:
+                snippet = first_p.get_text()
         
-        try:
-            # SerpAPI 검색 실행
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            
-            print(f"페이지 {page} SerpAPI 응답 키: {list(results.keys())}")
-            
-            # 검색 결과 추출
-            if "organic_results" in results:
-                page_results = results["organic_results"]
-                print(f"페이지 {page} 유기적 검색 결과 수: {len(page_results)}")
-                
-                for result in page_results:
-                    url = result.get("link", "")
-                    title = result.get("title", "")
-                    snippet = result.get("snippet", "")
-                    
-                    # 중복 검사 (URL 기준)
-                    if not any(r.get('url') == url for r in search_results):
-                        search_results.append({
-                            'url': url,
-                            'title': title,
-                            'snippet': snippet
-                        })
-                    
-                    # 충분한 결과를 얻었으면 중단
-                    if len(search_results) >= num_results:
-                        break
-            else:
-                print(f"페이지 {page} SerpAPI 응답에 'organic_results' 키가 없습니다.")
-                if "error" in results:
-                    print(f"SerpAPI 오류: {results['error']}")
-                else:
-                    print(f"응답 데이터: {json.dumps(results, indent=2)[:500]}...")
-            
-            # 다음 페이지 결과를 가져오기 전에 잠시 대기 (API 속도 제한 방지)
-            if page < max_pages and len(search_results) < num_results:
-                print(f"다음 페이지를 가져오기 전 2초 대기...")
-                time.sleep(2)
-            
-            # 충분한 결과를 얻었거나 응답에 결과가 없으면 더 이상 요청하지 않음
-            if len(search_results) >= num_results or "organic_results" not in results or not results["organic_results"]:
-                break
-                
-        except Exception as e:
-            print(f"페이지 {page} 검색 중 오류 발생: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-            # 오류 발생 시 다음 페이지로 진행
-            continue
+        # 스니펫이 너무 길면 자름
+        if snippet and len(snippet) > 200:
+            snippet = snippet[:200] + '...'
+        return snippet
+    except Exception as e:
+        print(f"URL 처리 중 오류 발생 {url[:30]}: {str(e)}")
+        return None
+
+def enrich_search_result(result):
+    """단일 검색 결과의 스니펫을 메타 설명 또는 첫 문단으로 보강"""
+    snippet = extract_head_snippet(result['url'])
+    if snippet is not None:
+        result['snippet'] = snippet
+
+def enrich_search_results(search_results, deadline=None):
+    """
+    검색 결과에서 추가 정보 추출 (스니펫이 짧은 결과만 병렬로 처리)
     
-    print(f"총 {len(search_results)}개의 검색 결과를 SerpAPI에서 가져왔습니다.")
+    검색 단계 예산이 끝날 때까지 끝나지 않은 결과는 원래 스니펫을 유지하고
+    note_cut('search', ...)으로 기록합니다. 결과 수정은 이 함수를 호출한 스레드에서만 하므로
+    시간 안에 끝나지 않은 요청이 나중에 결과를 바꾸지 않습니다.
+    """
+    if not search_results:
+        return
     
-    # 추가 정보 추출
-    enrich_search_results(search_results)
+    targets = [result for result in search_results
+               if not result['snippet'] or len(result['snippet']) < 50]
+    if not targets:
+        return
     
-    return search_results
-
-def enrich_search_results(search_results):
-    """검색 결과에서 추가 정보 추출"""
-    if not search_results:
+    timeout = stage_remaining(deadline)
+    if timeout is not None and timeout <= 0:
+        deadline.note_cut('search', 'deadline', skipped='snippet_enrichment', urls=len(targets))
         return
-        
-    print("URL에서 추가 정보 추출 중...")
     
-    # 더 많은 정보가 필요하면 URL에서 추가 데이터 추출
-    for i, result in enumerate(search_results):
-        try:
-            if not result['snippet'] or len(result['snippet']) < 50:
-                print(f"URL {i+1}/{len(search_results)}에서 추가 정보 추출 중: {result['url'][:50]}...")
-                response = requests.get(result['url'], timeout=5)
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 메타 설명에서 스니펫 추출 시도
-                meta_desc = soup.find('meta', attrs={'name': 'description'})
-                if meta_desc and 'content' in meta_desc.attrs:
-                    result['snippet'] = meta_desc['content']
-                else:
-                    first_p = soup.find('p')
-                    if first_p:
-                        result['snippet'] = first_p.get_text()
-                
-                # 스니펫이 너무 길면 자름
-                if len(result['snippet']) > 200:
-                    result['snippet'] = result['snippet'][:200] + '...'
-        except Exception as e:
-            print(f"URL 처리 중 오류 발생 {result['url'][:30]}: {str(e)}")
-            continue
\ No newline at end of file
+    print(f"URL {len(targets)}개에서 추가 정보 추출 중...")
+    
+    request_timeout = 5 if timeout is None else max(0.5, min(5, timeout))
+    executor = ThreadPoolExecutor(max_workers=min(ENRICH_MAX_WORKERS, len(targets)))
+    try:
+        futures = [executor.submit(extract_head_snippet, result['url'], request_timeout) for result in targets]
+        wait(futures, timeout=timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    skipped = 0
+    for result, future in zip(targets, futures):
+        if not future.done():
+            skipped += 1
+        elif future.result() is not None:
+            result['snippet'] = future.result()
+    if skipped:
+        deadline.note_cut('search', 'deadline', skipped='snippet_enrichment', urls=skipped)
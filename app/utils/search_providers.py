@@ -0,0 +1,500 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from serpapi import GoogleSearch
+
+from app.utils.rate_limiter import get_rate_limiter
+from app.utils.url_utils import UrlIndex
+
+# 녹화된 검색 결과(routes.py가 저장하는 *_search_results.json)의 기본 위치
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'results')
+
+# 등록된 검색 API 구현 (이름 -> 클래스)
+PROVIDERS = {}
+
+
+def register_provider(cls):
+    """검색 API 구현 클래스를 이름으로 등록하는 데코레이터"""
+    PROVIDERS[cls.name] = cls
+    return cls
+
+
+def get_provider(name, config):
+    """
+    이름에 해당하는 검색 API 인스턴스 생성
+
+    알 수 없는 이름이면 기존 동작과 같이 SerpAPI를 사용합니다.
+    """
+    provider_cls = PROVIDERS.get((name or '').lower(), SerpApiProvider)
+    return provider_cls(config)
+
+
+def get_fanout_provider_names(config):
+    """fanout 모드에서 동시에 조회할 검색 API 이름 목록"""
+    names = getattr(config, "SEARCH_FANOUT_PROVIDERS", ["serpapi", "google_cse"])
+    return [name.lower() for name in names if name.lower() in PROVIDERS]
+
+
+def normalize_query(query):
+    """검색어 정규화 (유니코드 정규화, 소문자, 공백 정리)"""
+    query = unicodedata.normalize('NFKC', query or '')
+    return re.sub(r'\s+', ' ', query).strip().lower()
+
+
+def get_provider_rate_limiter(provider, config):
+    """
+    검색 API별 공유 속도 제한기 반환
+
+    config.py의 <PROVIDER>_RATE_LIMIT (초당 요청 수)와 <PROVIDER>_RATE_BURST
+    (순간 최대 요청 수)로 설정하며, 0 이하의 속도는 제한 없음을 의미합니다.
+    """
+    prefix = provider.upper()
+    defaults = {"serpapi": (1.0, 2), "google_cse": (2.0, 4)}
+    default_rate, default_burst = defaults.get(provider, (1.0, 1))
+    rate = float(getattr(config, f"{prefix}_RATE_LIMIT", default_rate))
+    burst = max(1, int(getattr(config, f"{prefix}_RATE_BURST", default_burst)))
+    return get_rate_limiter(provider, rate, burst)
+
+
+def fetch_pages_concurrently(fetch_page, page_params, limiter, timeout=None):
+    """
+    검색 결과 페이지들을 동시에 요청
+
+    Args:
+        fetch_page (callable): (page, params)를 받아 응답 데이터를 반환하는 함수
+        page_params (list): 페이지별 요청 매개변수 목록 (1페이지부터 순서대로)
+        limiter (TokenBucket): 요청마다 토큰을 가져올 공유 속도 제한기
+        timeout (float): 최대 대기 시간(초, None이면 제한 없음). 시간 안에 응답하지 않은
+                         페이지는 TimeoutError를 예외로 반환합니다. 속도 제한 토큰도 이 시간
+                         안에만 기다리므로, 시간이 지나면 남은 페이지는 요청하지 않습니다
+
+    Returns:
+        list: 페이지 순서대로 정렬된 (응답 데이터, 예외) 튜플 목록
+    """
+    if not page_params:
+        return []
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    expired = threading.Event()
+
+    def timeout_error():
+        return TimeoutError(f"{timeout:.1f}초 안에 응답하지 않음")
+
+    def run(page, params):
+        # 시간이 지난 뒤에는 토큰을 가져가거나 유료 API를 호출하지 않음
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if expired.is_set() or (remaining is not None and remaining <= 0):
+            return None, timeout_error()
+        if not limiter.acquire(timeout=remaining) or expired.is_set():
+            return None, timeout_error()
+        try:
+            return fetch_page(page, params), None
+        except Exception as e:
+            return None, e
+
+    executor = ThreadPoolExecutor(max_workers=len(page_params))
+    try:
+        futures = []
+        for page, params in enumerate(page_params, 1):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            futures.append(executor.submit(run, page, params))
+        wait(futures, timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+        expired.set()
+        futures += [None] * (len(page_params) - len(futures))
+        return [future.result() if future is not None and future.done() else (None, timeout_error())
+                for future in futures]
+    finally:
+        # 시간 안에 끝나지 않은 요청은 기다리지 않음
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SearchProvider:
+    """
+    검색 API 공통 인터페이스
+
+    하위 클래스는 name을 지정하고 check()와 search()를 구현합니다.
+    search()는 {'url', 'title', 'snippet'} 사전 목록을 반환하며,
+    스니펫 보강과 캐시는 app.utils.search에서 처리합니다.
+    """
+
+    name = None
+    display_name = None
+    needs_enrichment = True  # 짧은 스니펫을 페이지에서 보강해야 하는지 여부
+    cacheable = True  # 검색 결과 캐시에 저장할지 여부
+
+    def __init__(self, config):
+        self.config = config
+
+    def check(self):
+        """설정 확인 - 사용할 수 없으면 오류 메시지, 사용 가능하면 None 반환"""
+        return None
+
+    def is_configured(self):
+        return self.check() is None
+
+    def search(self, query, language, num_results, timeout=None):
+        """timeout(초)이 지나면 그때까지 받은 결과만 반환"""
+        raise NotImplementedError
+
+
+@register_provider
+class SerpApiProvider(SearchProvider):
+    """SerpAPI(Google 검색 결과) 검색"""
+
+    name = "serpapi"
+    display_name = "SerpAPI"
+
+    def check(self):
+        api_key = getattr(self.config, "SERPAPI_KEY", "")
+        if not api_key or api_key == "여기에_당신의_SERPAPI_키를_입력하세요":
+            return "SerpAPI 키가 설정되지 않았습니다."
+        return None
+
+    def search(self, query, language, num_results, timeout=None):
+        """SerpAPI를 사용하여 검색 결과 가져오기"""
+        search_results = []
+        url_index = UrlIndex()
+
+        # SerpAPI 키 가져오기
+        api_key = getattr(self.config, "SERPAPI_KEY", "")
+
+        if self.check():
+            print("경고: SERPAPI_KEY가 설정되지 않았습니다. config.py 파일에 API 키를 입력하세요.")
+            print("SerpAPI에 가입하여 API 키를 얻으세요: https://serpapi.com")
+            return []  # API 키가 없으면 빈 결과 반환
+
+        print(f"SerpAPI 사용 중 (API 키: {api_key[:5]}...)")
+
+        # 각 페이지에서 가져올 결과 수
+        results_per_page = 10
+    
+        # 필요한 페이지 수 계산 (최대 4페이지)
+        max_pages = min(4, (num_results + results_per_page - 1) // results_per_page)
+    
+        limiter = get_provider_rate_limiter(self.name, self.config)
+    
+        page_params = []
+        for page in range(1, max_pages + 1):
+            # 검색 매개변수 설정
+            params = {
+                "engine": "google",
+                "q": query,
+                "api_key": api_key,
+                "num": results_per_page
+            }
+        
+            # 두 번째 페이지부터는 페이지 번호 추가
+            if page > 1:
+                params["start"] = (page - 1) * results_per_page
+        
+            # 언어 설정
+            if language == "ko":
+                params["gl"] = "kr"
+                params["hl"] = "ko"
+            else:
+                params["gl"] = "us"
+                params["hl"] = "en"
+        
+            print(f"페이지 {page} 검색 매개변수: {json.dumps({k: v for k, v in params.items() if k != 'api_key'})}")
+            page_params.append(params)
+    
+        def fetch_page(page, params):
+            # SerpAPI 검색 실행
+            search = GoogleSearch(params)
+            if timeout is not None:
+                search.timeout = max(1.0, timeout)
+            results = search.get_dict()
+            print(f"페이지 {page} SerpAPI 응답 키: {list(results.keys())}")
+            return results
+    
+        # 모든 페이지를 동시에 요청 (속도 제한기를 통해 전송)
+        page_responses = fetch_pages_concurrently(fetch_page, page_params, limiter, timeout)
+    
+        # 페이지 순서대로 결과 병합
+        for page, (results, error) in enumerate(page_responses, 1):
+            if error is not None:
+                print(f"페이지 {page} 검색 중 오류 발생: {str(error)}")
+                # 오류 발생 시 다음 페이지로 진행
+                continue
+        
+            # 검색 결과 추출
+            if "organic_results" in results:
+                page_results = results["organic_results"]
+                print(f"페이지 {page} 유기적 검색 결과 수: {len(page_results)}")
+            
+                for result in page_results:
+                    url = result.get("link", "")
+                    title = result.get("title", "")
+                    snippet = result.get("snippet", "")
+                
+                    # 중복 검사 (정규화된 URL 기준)
+                    if url_index.add(url):
+                        search_results.append({
+                            'url': url,
+                            'title': title,
+                            'snippet': snippet
+                        })
+                
+                    # 충분한 결과를 얻었으면 중단
+                    if len(search_results) >= num_results:
+                        break
+            else:
+                print(f"페이지 {page} SerpAPI 응답에 'organic_results' 키가 없습니다.")
+                if "error" in results:
+                    print(f"SerpAPI 오류: {results['error']}")
+                else:
+                    print(f"응답 데이터: {json.dumps(results, indent=2)[:500]}...")
+        
+            # 충분한 결과를 얻었거나 응답에 결과가 없으면 더 이상 사용하지 않음
+            if len(search_results) >= num_results or "organic_results" not in results or not results["organic_results"]:
+                break
+    
+        print(f"총 {len(search_results)}개의 검색 결과를 SerpAPI에서 가져왔습니다.")
+
+        return search_results
+
+
+@register_provider
+class GoogleCseProvider(SearchProvider):
+    """Google Custom Search JSON API 검색"""
+
+    name = "google_cse"
+    display_name = "Google Custom Search API"
+
+    def check(self):
+        api_key = getattr(self.config, "GOOGLE_API_KEY", "")
+        cse_id = getattr(self.config, "GOOGLE_CSE_ID", "")
+
+        if not api_key or api_key == "여기에_당신의_GOOGLE_API_키를_입력하세요":
+            return "Google API 키가 설정되지 않았습니다."
+
+        if not cse_id or cse_id == "여기에_당신의_검색엔진_ID를_입력하세요":
+            return "Google 검색 엔진 ID가 설정되지 않았습니다."
+
+        return None
+
+    def search(self, query, language, num_results, timeout=None):
+        """Google Custom Search API를 사용하여 검색 결과 가져오기"""
+        search_results = []
+        url_index = UrlIndex()
+
+        # API 키와 검색 엔진 ID 가져오기
+        api_key = getattr(self.config, "GOOGLE_API_KEY", "")
+        cse_id = getattr(self.config, "GOOGLE_CSE_ID", "")
+
+        # 키가 설정되어 있는지 확인
+        if not api_key or not cse_id:
+            print("경고: Google Custom Search API 키 또는 CSE ID가 설정되지 않았습니다.")
+            print("config.py 파일에 GOOGLE_API_KEY와 GOOGLE_CSE_ID를 설정하세요.")
+            return []
+
+        print(f"Google Custom Search API 사용 중 (API 키: {api_key[:5]}...)")
+
+        # 필요한 페이지 수 계산 (최대 10개 결과/페이지, 최대 10페이지)
+        results_per_page = 10
+        max_pages = min(min(10, (num_results + results_per_page - 1) // results_per_page), 10)
+    
+        base_url = "https://www.googleapis.com/customsearch/v1"
+        limiter = get_provider_rate_limiter(self.name, self.config)
+    
+        page_params = []
+        for page in range(1, max_pages + 1):
+            params = {
+                "key": api_key,
+                "cx": cse_id,
+                "q": query,
+                "num": min(results_per_page, 10),  # 최대 10개 결과
+                "start": (page - 1) * results_per_page + 1,  # 1-based 인덱스
+            }
+        
+            # 언어 설정
+            if language == "ko":
+                params["lr"] = "lang_ko"
+                params["gl"] = "kr"
+            else:
+                params["lr"] = "lang_en"
+                params["gl"] = "us"
+        
+            page_params.append(params)
+    
+        def fetch_page(page, params):
+            print(f"페이지 {page} 검색 중...")
+            response = requests.get(base_url, params=params,
+                                    timeout=10 if timeout is None else max(1.0, min(10, timeout)))
+            return response.json()
+    
+        # 모든 페이지를 동시에 요청 (속도 제한기를 통해 전송)
+        page_responses = fetch_pages_concurrently(fetch_page, page_params, limiter, timeout)
+    
+        # 페이지 순서대로 결과 병합
+        for page, (data, error) in enumerate(page_responses, 1):
+            if error is not None:
+                print(f"Google Custom Search API 호출 중 오류 발생: {str(error)}")
+                break
+        
+            # 에러 확인
+            if "error" in data:
+                error_msg = data["error"].get("message", "알 수 없는 오류")
+                print(f"Google API 오류: {error_msg}")
+                break
+            
+            # 검색 결과 추출
+            if "items" in data:
+                page_results = data["items"]
+                print(f"페이지 {page}에서 {len(page_results)}개의 결과를 찾았습니다.")
+            
+                for item in page_results:
+                    # 중복 검사 (정규화된 URL 기준)
+                    if url_index.add(item.get("link", "")):
+                        search_results.append({
+                            'url': item.get("link", ""),
+                            'title': item.get("title", ""),
+                            'snippet': item.get("snippet", "")
+                        })
+                
+                    # 충분한 결과를 얻으면 중단
+                    if len(search_results) >= num_results:
+                        break
+            else:
+                print(f"페이지 {page}에서 결과를 찾을 수 없습니다.")
+                break
+            
+            # 충분한 결과를 얻었으면 중단
+            if len(search_results) >= num_results:
+                break
+    
+        print(f"총 {len(search_results)}개의 검색 결과를 Google Custom Search에서 가져왔습니다.")
+
+        return search_results
+
+
+@register_provider
+class ReplayProvider(SearchProvider):
+    """
+    녹화된 검색 결과를 디스크에서 재생하는 오프라인 검색
+
+    REPLAY_DIR(기본값: results/)의 '<검색어>_<YYYYmmdd_HHMMSS>_search_results.json'
+    파일을 검색어와 언어별로 색인하여 가장 최근 녹화본을 반환합니다. 검색 API 호출 없이
+    /search 파이프라인의 나머지 단계를 부하 테스트하거나 측정할 때 사용합니다.
+
+    녹화본의 언어는 같은 이름의 '_lda_analysis.json' 파일의 language 값이며, 분석 파일이 없는
+    녹화본은 요청 언어의 녹화본이 없을 때만 사용합니다.
+
+    config.py 설정:
+        REPLAY_DIR: 녹화 파일 디렉토리
+        REPLAY_MATCH: 'exact'(기본값, 같은 검색어만) 또는 'any'(없으면 검색어 해시로 임의 녹화본 선택)
+        REPLAY_LATENCY: 응답 전 지연 시간(초, 기본값: 0) - 실제 API 지연 흉내
+    """
+
+    name = "replay"
+    display_name = "녹화된 검색 결과"
+    needs_enrichment = False  # 녹화본은 이미 보강된 결과
+    cacheable = False
+
+    RECORDING_PATTERN = re.compile(r'^(?P<query>.+)_(?P<timestamp>\d{8}_\d{6})_search_results\.json$')
+
+    # 디렉토리별 녹화 색인: 디렉토리 -> (디렉토리 mtime, {(정규화된 검색어, 언어): 최신 파일 경로})
+    _indexes = {}
+    # 녹화 파일의 언어: 파일 경로 -> 언어 (분석 파일이 없으면 None, 색인을 다시 만들 때 재사용)
+    _languages = {}
+    # 녹화 파일 내용: 파일 경로 -> (파일 mtime, 결과 목록)
+    _recordings = {}
+    _lock = threading.Lock()
+
+    @property
+    def directory(self):
+        return os.path.abspath(getattr(self.config, "REPLAY_DIR", RESULTS_DIR))
+
+    def _load_index(self):
+        directory = self.directory
+        try:
+            mtime = os.path.getmtime(directory)
+        except OSError:
+            return {}
+
+        with self._lock:
+            cached = self._indexes.get(directory)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+            latest = {}
+            for file_name in os.listdir(directory):
+                match = self.RECORDING_PATTERN.match(file_name)
+                if not match:
+                    continue
+                path = os.path.join(directory, file_name)
+                key = (normalize_query(match.group('query')), self._recording_language(path))
+                timestamp = match.group('timestamp')
+                if key not in latest or latest[key][0] < timestamp:
+                    latest[key] = (timestamp, path)
+
+            index = {key: path for key, (_, path) in latest.items()}
+            self._indexes[directory] = (mtime, index)
+            return index
+
+    def _recording_language(self, path):
+        """녹화본과 같은 요청에서 저장된 분석 파일의 언어 (호출하는 쪽에서 _lock을 잡고 있어야 함)"""
+        if path not in self._languages:
+            analysis_path = path[:-len('_search_results.json')] + '_lda_analysis.json'
+            try:
+                with open(analysis_path, 'r', encoding='utf-8') as f:
+                    self._languages[path] = json.load(f).get('language')
+            except (OSError, ValueError, AttributeError):
+                self._languages[path] = None
+        return self._languages[path]
+
+    def _load_recording(self, path):
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            cached = self._recordings.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+        with open(path, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+
+        with self._lock:
+            self._recordings[path] = (mtime, results)
+        return results
+
+    def check(self):
+        if not self._load_index():
+            return f"녹화된 검색 결과가 없습니다: {self.directory}"
+        return None
+
+    def search(self, query, language, num_results, timeout=None):
+        index = self._load_index()
+        key = normalize_query(query)
+        # 같은 언어의 녹화본 우선, 없으면 언어를 알 수 없는 녹화본
+        path = index.get((key, language)) or index.get((key, None))
+
+        if path is None and getattr(self.config, "REPLAY_MATCH", "exact") == "any":
+            # 같은 검색어의 녹화본이 없으면 같은 언어의 녹화본 중에서 검색어 해시로 고정적으로 선택
+            keys = sorted(k for k in index if k[1] == language) or sorted(k for k in index if k[1] is None)
+            if keys:
+                digest = int(hashlib.sha1(key.encode('utf-8')).hexdigest(), 16)
+                path = index[keys[digest % len(keys)]]
+
+        if path is None:
+            print(f"'{query}'에 대한 녹화된 검색 결과가 없습니다.")
+            return []
+
+        latency = float(getattr(self.config, "REPLAY_LATENCY", 0))
+        if timeout is not None:
+            latency = min(latency, timeout)
+        if latency > 0:
+            time.sleep(latency)
+
+        results = self._load_recording(path)
+        print(f"녹화된 검색 결과 재생: {os.path.basename(path)} ({len(results)}개 결과)")
+
+        # 호출하는 쪽에서 결과를 수정해도 녹화본이 바뀌지 않도록 복사
+        return [dict(result) for result in results[:num_results]]
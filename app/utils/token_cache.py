@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import os
+import threading
+import zlib
+
+from app.settings import get_config
+from app.utils.disk_cache import DiskCache, CACHE_ROOT
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 프로세스 전체에서 공유하는 캐시 (get_token_cache()로 생성)
+_token_cache = None
+_token_cache_lock = threading.Lock()
+
+
+class TokenCache:
+    """
+    텍스트 내용 기준 전처리 결과(토큰 목록) 캐시
+
+    키는 전처리기 버전, 언어, 텍스트의 SHA-256 해시로 구성되므로 URL이 달라도 본문이
+    같으면 다시 토큰화하지 않고, 전처리 방식이 바뀌면(버전 변경) 이전 결과는 사용하지 않습니다.
+    값은 토큰을 줄바꿈으로 이은 문자열을 zlib으로 압축하여 저장합니다.
+    """
+
+    def __init__(self, directory, version, max_bytes=256 * 1024 * 1024, max_entries=50000):
+        """
+        Args:
+            directory (str): 캐시 디렉토리
+            version (str): 전처리기 버전 (전처리 결과가 바뀌면 변경)
+            max_bytes (int): 최대 전체 크기(바이트)
+            max_entries (int): 최대 항목 수
+        """
+        self.version = version
+        self._cache = DiskCache(directory, max_entries=max_entries, max_bytes=max_bytes, suffix='.tok')
+
+    def _key(self, text, language):
+        digest = hashlib.sha256(text.strip().encode('utf-8', 'surrogatepass')).hexdigest()
+        return f"{self.version}:{language}:{digest}"
+
+    def get(self, text, language):
+        """캐시된 토큰 목록 조회 (없으면 None)"""
+        key = self._key(text, language)
+        data = self._cache.get(key)
+        if data is None:
+            return None
+        try:
+            joined = zlib.decompress(data).decode('utf-8')
+        except (zlib.error, UnicodeDecodeError):
+            logger.warning("손상된 토큰 캐시 항목 삭제")
+            self._cache.delete(key)
+            return None
+        return joined.split('\n') if joined else []
+
+    def set(self, text, language, tokens):
+        """토큰 목록 저장 (토큰에는 공백 문자가 없으므로 줄바꿈으로 구분)"""
+        self._cache.set(self._key(text, language), zlib.compress('\n'.join(tokens).encode('utf-8')))
+
+    def stats(self):
+        return self._cache.stats()
+
+
+def get_token_cache(version):
+    """
+    공유 토큰 캐시 반환 (TOKEN_CACHE_ENABLED가 False이면 None)
+
+    Args:
+        version (str): 전처리기 버전
+
+    config.py 설정:
+        TOKEN_CACHE_DIR: 캐시 디렉토리 (기본값: cache/tokens)
+        TOKEN_CACHE_MAX_BYTES: 최대 전체 크기 (기본값: 256MB)
+        TOKEN_CACHE_MAX_ENTRIES: 최대 항목 수 (기본값: 50000)
+    """
+    global _token_cache
+
+    config = get_config()
+    if not getattr(config, "TOKEN_CACHE_ENABLED", True):
+        return None
+
+    with _token_cache_lock:
+        if _token_cache is None or _token_cache.version != version:
+            _token_cache = TokenCache(
+                getattr(config, "TOKEN_CACHE_DIR", os.path.join(CACHE_ROOT, 'tokens')),
+                version,
+                max_bytes=int(getattr(config, "TOKEN_CACHE_MAX_BYTES", 256 * 1024 * 1024)),
+                max_entries=int(getattr(config, "TOKEN_CACHE_MAX_ENTRIES", 50000))
+            )
+        return _token_cache
+
+
+def get_token_cache_stats():
+    """토큰 캐시 적중/실패 통계 반환"""
+    if _token_cache is None:
+        return {"hits": 0, "misses": 0, "hit_rate": 0.0, "entries": 0, "bytes": 0, "evictions": 0}
+    return _token_cache.stats()
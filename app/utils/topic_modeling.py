@@ -5,17 +5,30 @@ import nltk
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 import re
-import json
-from konlpy.tag import Okt
 import numpy as np
 from nltk.stem import WordNetLemmatizer
 from collections import defaultdict
+from functools import lru_cache
 import logging
 import os
+import atexit
+import multiprocessing
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from app.settings import get_config
+
+from app.utils.korean_tokenizer import get_korean_tokenizer
+from app.utils.token_cache import get_token_cache
 
 # Download required NLTK data
+# (전처리/토픽 수 후보 작업 프로세스는 이 모듈을 다시 import하므로 부모 프로세스에서만 다운로드)
 nltk_data_path = os.path.join(os.path.expanduser('~'), 'nltk_data')
-if not os.path.exists(os.path.join(nltk_data_path, 'corpora', 'stopwords')):
+if (multiprocessing.parent_process() is None
+        and not os.path.exists(os.path.join(nltk_data_path, 'corpora', 'stopwords'))):
     print("NLTK 데이터 다운로드 중...")
     nltk.download('stopwords', quiet=True)
     nltk.download('punkt', quiet=True)
@@ -24,39 +37,81 @@ if not os.path.exists(os.path.join(nltk_data_path, 'corpora', 'stopwords')):
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+# 전처리기 버전 - 전처리 결과가 바뀌는 변경(토큰화, 불용어, 필터 기준 등)을 하면 올려서
+# 토큰 캐시의 이전 결과를 사용하지 않도록 함
+PREPROCESSOR_VERSION = "1"
+
+# 표제어 캐시 크기 (문서와 요청 사이에서 공유)
+LEMMA_CACHE_SIZE = 50000
+
+# 한국어 불용어 (필요에 따라 추가)
+KOREAN_STOPWORDS = frozenset(['있다', '하다', '되다', '이다', '돌다', '보다', '않다', '이렇다', '그렇다', '어떻다'])
+
+# LDATopicModeler의 한국어 불용어 (의미를 더하지 않는 대명사와 조사)
+MODELER_KOREAN_STOPWORDS = frozenset(['이', '그', '저', '것', '이것', '저것', '그것', '및', '에', '에서',
+                                      '의', '을', '를', '이런', '그런', '와', '과', '은', '는', '이나',
+                                      '나', '또는', '혹은', '등', '들'])
+
+# 모든 호출에서 공유하는 표제어 추출기
+_lemmatizer = WordNetLemmatizer()
+
+# 문서 전처리 작업 프로세스 풀 (_get_preprocess_executor()로 생성)
+_preprocess_executor = None
+_preprocess_lock = threading.Lock()
+
+# 토픽 수 후보 학습용 작업 프로세스 풀 (_get_topic_executor()로 생성)
+_topic_executor = None
+_topic_lock = threading.Lock()
+# 토픽 수 선택 한 번에 쓰는 코퍼스: 임시 파일 경로 -> 데이터 (_load_topic_data()로 읽음)
+_topic_data = {}
+
+# 작업 프로세스에서 발생한 표제어 캐시 적중/실패 횟수 (부모 프로세스에서 합산)
+_worker_lemma_counts = {"hits": 0, "misses": 0}
+
+
+@lru_cache(maxsize=None)
+def get_english_stopwords():
+    """영어 불용어 집합 (처음 호출할 때 한 번 로드)"""
+    return frozenset(stopwords.words('english'))
+
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemmatize_english(word):
+    """단어의 표제어 (같은 단어는 캐시된 결과 사용)"""
+    return _lemmatizer.lemmatize(word)
+
+
+def get_lemma_cache_stats():
+    """표제어 캐시 적중/실패 통계 (현재 프로세스와 전처리 작업 프로세스의 합계, size는 현재 프로세스)"""
+    info = lemmatize_english.cache_info()
+    with _preprocess_lock:
+        hits = info.hits + _worker_lemma_counts["hits"]
+        misses = info.misses + _worker_lemma_counts["misses"]
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+    }
+
 class LDATopicModeler:
     def __init__(self, language='en'):
         self.language = language
-        self.stopwords = set(stopwords.words('english'))
+        self.stopwords = get_english_stopwords()
         self.tokenizer = word_tokenize
         
         # Set up Korean processor if needed
         if language == 'ko':
-            self.okt = Okt()
             # Korean stopwords (common words that don't add meaning)
-            self.stopwords = {'이', '그', '저', '것', '이것', '저것', '그것', '및', '에', '에서', 
-                              '의', '을', '를', '이런', '그런', '와', '과', '은', '는', '이나', 
-                              '나', '또는', '혹은', '등', '들'}
+            self.stopwords = MODELER_KOREAN_STOPWORDS
     
     def preprocess_text(self, texts):
-        processed_texts = []
-        
-        for text in texts:
-            if not text or len(text.strip()) < 10:
-                continue  # 너무 짧은 텍스트는 건너뜀
-                
-            if self.language == 'en':
-                # Tokenize, lowercase, remove stopwords and short words
-                tokens = self.tokenizer(text.lower())
-                tokens = [token for token in tokens if token.isalpha() and token not in self.stopwords and len(token) > 1]
-            
-            elif self.language == 'ko':
-                # Use Okt for Korean text processing
-                tokens = self.okt.nouns(text)  # Extract nouns which are most meaningful for topics
-                tokens = [token for token in tokens if token not in self.stopwords and len(token) > 1]
-            
-            if tokens:
-                processed_texts.append(tokens)
+        # 너무 짧은 텍스트는 빈 목록으로 반환되어 건너뜀
+        # (/search와 같은 작업 프로세스 풀과 토큰 캐시를 쓰되, 표제어 추출 없이 이 클래스의 토큰 규칙 사용)
+        token_lists = preprocess_many(texts, self.language, lemmatize=False)
+        processed_texts = [tokens for tokens in token_lists if tokens]
         
         print(f"전처리 후 텍스트 수: {len(processed_texts)}")
         if processed_texts:
@@ -106,10 +161,10 @@ class LDATopicModeler:
             raise ValueError("처리된 텍스트에서 단어를 찾을 수 없습니다. 데이터를 확인하세요.")
         
         # Train LDA model (LDA는 최소한 몇 개의 단어라도 있으면 돌아갑니다)
-        lda_model = models.LdaModel(
-            corpus=corpus,
-            id2word=dictionary,
-            num_topics=num_topics,
+        lda_model, _ = _train_lda(
+            corpus,
+            dictionary,
+            num_topics,
             passes=15,  # 적은 데이터에서는 passes 증가
             iterations=50,
             alpha='auto',
@@ -207,44 +262,74 @@ def preprocess_text(text, language='en'):
 
 def preprocess_korean(text):
     """한국어 텍스트 전처리"""
+    return _preprocess_korean_many([text])[0][0]
+
+def preprocess_korean_many(texts):
+    """여러 한국어 텍스트 전처리 (Okt 작업 프로세스 풀에 한 번에 전달)"""
+    return _preprocess_korean_many(texts)[0]
+
+def _preprocess_korean_many(texts, lemmatize=True):
+    """
+    여러 한국어 텍스트 전처리 - (텍스트별 토큰 목록, 대체 처리 없이 완료했는지) 반환
+    
+    lemmatize가 False이면 LDATopicModeler의 불용어(MODELER_KOREAN_STOPWORDS)를 사용합니다.
+    """
+    stop_words = KOREAN_STOPWORDS if lemmatize else MODELER_KOREAN_STOPWORDS
     try:
         # 항상 Okt 사용 (MeCab 사용하지 않음)
-        okt = Okt()
-        
-        # 텍스트 정규화
-        # 소문자 변환은 한국어에 적용할 필요 없으나, 혼합 텍스트가 있을 수 있어서 유지
-        text = text.lower() if hasattr(text, 'lower') else text
-        text = re.sub(r'[^\w\s]', ' ', text)  # 문장부호 제거
-        text = re.sub(r'\s+', ' ', text).strip()  # 여러 공백을 하나로 변환
-        
-        # 명사 추출 (Okt 사용)
-        nouns = okt.nouns(text)
+        # 문장 단위로 나눈 뒤 정규화하여 Okt 작업 프로세스 풀에서 명사 추출
+        noun_lists = get_korean_tokenizer().nouns_many(texts)
         
-        # 한글자 단어 필터링 (선택적)
-        filtered_words = [w for w in nouns if len(w) > 1]
-        
-        # 불용어 제거 (한국어 불용어 목록은 필요에 따라 추가)
-        ko_stop_words = set(['있다', '하다', '되다', '이다', '돌다', '보다', '않다', '이렇다', '그렇다', '어떻다'])
-        result = [w for w in filtered_words if w not in ko_stop_words]
-        
-        logger.info(f"한국어 전처리 완료: {len(result)} 토큰 생성")
-        return result
+        results = []
+        for nouns in noun_lists:
+            # 한글자 단어 필터링 (선택적)
+            filtered_words = [w for w in nouns if len(w) > 1]
+            
+            # 불용어 제거 (한국어 불용어 목록은 필요에 따라 추가)
+            result = [w for w in filtered_words if w not in stop_words]
+            
+            logger.info(f"한국어 전처리 완료: {len(result)} 토큰 생성")
+            results.append(result)
+        return results, True
         
     except Exception as e:
         logger.error(f"한국어 전처리 중 오류 발생: {str(e)}")
         # 오류 발생 시 빈 목록 반환하지 않고 최소한의 처리된 텍스트 반환
-        try:
-            # 간단한 공백 기반 토큰화로 대체
-            simple_tokens = re.sub(r'[^\w\s]', ' ', text.lower() if hasattr(text, 'lower') else str(text)).split()
-            filtered = [w for w in simple_tokens if len(w) > 1]
-            logger.info(f"간단한 토큰화로 대체: {len(filtered)} 토큰")
-            return filtered
-        except:
-            logger.error("대체 처리도 실패")
-            return []
+        results = []
+        for text in texts:
+            try:
+                # 간단한 공백 기반 토큰화로 대체
+                simple_tokens = re.sub(r'[^\w\s]', ' ', text.lower() if hasattr(text, 'lower') else str(text)).split()
+                filtered = [w for w in simple_tokens if len(w) > 1]
+                logger.info(f"간단한 토큰화로 대체: {len(filtered)} 토큰")
+                results.append(filtered)
+            except:
+                logger.error("대체 처리도 실패")
+                results.append([])
+        return results, False
 
 def preprocess_english(text):
     """영어 텍스트 전처리"""
+    return _preprocess_english(text)[0]
+
+def _preprocess_english_plain(text):
+    """
+    LDATopicModeler의 영어 토큰 규칙 - (토큰 목록, 대체 처리 없이 완료했는지) 반환
+    
+    소문자로 바꿔 토큰화한 뒤 알파벳으로만 된 2자 이상의 불용어가 아닌 토큰을 남깁니다 (표제어 추출 없음).
+    """
+    stop_words = get_english_stopwords()
+    try:
+        tokens, complete = word_tokenize(text.lower()), True
+    except Exception as e:
+        logger.error(f"영어 전처리 중 오류 발생: {str(e)}")
+        tokens, complete = text.lower().split(), False
+    return [w for w in tokens if w.isalpha() and w not in stop_words and len(w) > 1], complete
+
+def _preprocess_english(text, lemmatize=True):
+    """영어 텍스트 전처리 - (토큰 목록, 대체 처리 없이 완료했는지) 반환"""
+    if not lemmatize:
+        return _preprocess_english_plain(text)
     try:
         # 텍스트 정규화
         text = text.lower()
@@ -255,15 +340,15 @@ def preprocess_english(text):
         tokens = word_tokenize(text)
         
         # 불용어 제거
-        stop_words = set(stopwords.words('english'))
+        stop_words = get_english_stopwords()
         filtered_words = [w for w in tokens if w not in stop_words and len(w) > 2]
         
-        # 표제어 추출
-        lemmatizer = WordNetLemmatizer()
-        lemmatized = [lemmatizer.lemmatize(w) for w in filtered_words]
+        # 표제어 추출 (반복되는 단어는 캐시 사용)
+        lemmatized = [lemmatize_english(w) for w in filtered_words]
         
-        logger.info(f"영어 전처리 완료: {len(lemmatized)} 토큰 생성")
-        return lemmatized
+        logger.info(f"영어 전처리 완료: {len(lemmatized)} 토큰 생성 "
+                    f"(표제어 캐시 적중률 {get_lemma_cache_stats()['hit_rate']:.1%})")
+        return lemmatized, True
         
     except Exception as e:
         logger.error(f"영어 전처리 중 오류 발생: {str(e)}")
@@ -271,12 +356,614 @@ def preprocess_english(text):
         try:
             # 간단한 공백 기반 토큰화로 대체
             simple_tokens = re.sub(r'[^\w\s]', ' ', text.lower()).split()
-            filtered = [w for w in simple_tokens if len(w) > 2 and w not in set(stopwords.words('english'))]
+            stop_words = get_english_stopwords()
+            filtered = [w for w in simple_tokens if len(w) > 2 and w not in stop_words]
             logger.info(f"간단한 토큰화로 대체: {len(filtered)} 토큰")
-            return filtered
+            return filtered, False
         except:
             logger.error("대체 처리도 실패")
-            return []
+            return [], False
+
+def _get_preprocess_executor(workers):
+    global _preprocess_executor
+    with _preprocess_lock:
+        if _preprocess_executor is None:
+            # 부모 프로세스의 스레드(요청 엔진 등)를 복제하지 않도록 spawn으로 시작
+            _preprocess_executor = ProcessPoolExecutor(max_workers=workers,
+                                                       mp_context=multiprocessing.get_context('spawn'))
+            atexit.register(_preprocess_executor.shutdown, wait=False, cancel_futures=True)
+        return _preprocess_executor
+
+def _reset_preprocess_executor():
+    global _preprocess_executor
+    with _preprocess_lock:
+        if _preprocess_executor is not None:
+            _preprocess_executor.shutdown(wait=False, cancel_futures=True)
+            _preprocess_executor = None
+
+def _preprocess_chunk(texts, lemmatize=True):
+    """
+    영어 문서 묶음 전처리 (작업 프로세스에서 실행)
+    
+    Returns:
+        tuple: (토큰 목록, 대체 처리 없이 완료했는지 목록, 표제어 캐시 적중 증가분, 실패 증가분)
+    """
+    before = lemmatize_english.cache_info()
+    pairs = [_preprocess_english(text, lemmatize) for text in texts]
+    after = lemmatize_english.cache_info()
+    return ([tokens for tokens, _ in pairs], [complete for _, complete in pairs],
+            after.hits - before.hits, after.misses - before.misses)
+
+def _preprocess_uncached(texts, language, timeout, lemmatize=True):
+    """캐시에 없는 텍스트 전처리 - (토큰 목록, 대체 처리 없이 완료했는지 목록) 반환"""
+    if not texts:
+        return [], []
+    
+    if language == 'ko':
+        token_lists, complete = _preprocess_korean_many(texts, lemmatize)
+        return token_lists, [complete] * len(texts)
+    
+    config = get_config()
+    workers = getattr(config, "PREPROCESS_WORKERS", None)
+    workers = min(4, os.cpu_count() or 1) if workers is None else int(workers)
+    chunk_docs = max(1, int(getattr(config, "PREPROCESS_CHUNK_DOCS", 4)))
+    chunks = [texts[i:i + chunk_docs] for i in range(0, len(texts), chunk_docs)]
+    
+    started = time.monotonic()
+    token_lists, completes = [], []
+    
+    # 작업 프로세스가 하나 이하이거나 묶음이 하나뿐이면 현재 프로세스에서 처리
+    if workers <= 1 or len(chunks) < 2:
+        for chunk in chunks:
+            if token_lists and timeout is not None and time.monotonic() - started >= timeout:
+                token_lists.extend([None] * len(chunk))
+                completes.extend([False] * len(chunk))
+                continue
+            for text in chunk:
+                tokens, complete = _preprocess_english(text, lemmatize)
+                token_lists.append(tokens)
+                completes.append(complete)
+        return token_lists, completes
+    
+    executor = _get_preprocess_executor(workers)
+    futures = [executor.submit(_preprocess_chunk, chunk, lemmatize) for chunk in chunks]
+    wait(futures[:1])
+    if timeout is not None:
+        wait(futures, timeout=max(0.0, timeout - (time.monotonic() - started)))
+    else:
+        wait(futures)
+    
+    for chunk, future in zip(chunks, futures):
+        if not future.done():
+            future.cancel()
+            token_lists.extend([None] * len(chunk))
+            completes.extend([False] * len(chunk))
+            continue
+        try:
+            chunk_tokens, chunk_completes, hits, misses = future.result()
+        except Exception as e:
+            # 작업 프로세스 오류 - 풀을 다시 만들도록 정리하고 현재 프로세스에서 처리
+            logger.error(f"전처리 작업 프로세스 오류: {str(e)}")
+            _reset_preprocess_executor()
+            pairs = [_preprocess_english(text, lemmatize) for text in chunk]
+            chunk_tokens, chunk_completes = [tokens for tokens, _ in pairs], [complete for _, complete in pairs]
+            hits = misses = 0
+        with _preprocess_lock:
+            _worker_lemma_counts["hits"] += hits
+            _worker_lemma_counts["misses"] += misses
+        token_lists.extend(chunk_tokens)
+        completes.extend(chunk_completes)
+    
+    return token_lists, completes
+
+def preprocess_many(texts, language='en', timeout=None, lemmatize=True):
+    """
+    여러 텍스트를 전처리하고 토큰화합니다.
+    
+    내용이 같은 텍스트의 이전 결과는 토큰 캐시에서 가져오고, 나머지 중 영어 문서는
+    PREPROCESS_CHUNK_DOCS개씩 묶어 작업 프로세스 풀에 나눠 보내고,
+    한국어 문서는 Okt 작업 프로세스 풀에 문장 묶음으로 한 번에 보냅니다.
+    
+    Args:
+        texts (list): 전처리할 텍스트 목록
+        language (str): 언어 코드 ('en' 또는 'ko')
+        timeout (float): 영어 전처리 최대 대기 시간(초). 시간 안에 끝나지 않은 문서는
+                         None으로 반환합니다 (첫 묶음은 항상 기다림)
+        lemmatize (bool): False이면 표제어 추출 없이 LDATopicModeler의 토큰 규칙 사용
+                          (영어: 알파벳으로만 된 2자 이상 토큰, 한국어: MODELER_KOREAN_STOPWORDS)
+        
+    Returns:
+        list: 텍스트별 토큰 목록 (입력 순서와 같음)
+    
+    config.py 설정:
+        PREPROCESS_WORKERS: 작업 프로세스 수 (기본값: CPU 수와 4 중 작은 값, 1 이하이면 프로세스 내 처리)
+        PREPROCESS_CHUNK_DOCS: 작업 프로세스에 한 번에 보내는 문서 수 (기본값: 4)
+    """
+    texts = list(texts)
+    results = [[] for _ in texts]
+    valid = [i for i, text in enumerate(texts) if isinstance(text, str) and len(text.strip()) >= 10]
+    
+    # 내용이 같은 텍스트를 이전에 전처리한 결과 사용
+    cache = get_token_cache(PREPROCESSOR_VERSION)
+    # 토큰 규칙이 다른 결과는 별도 키로 저장
+    cache_language = language if lemmatize else f"{language}-plain"
+    pending = []
+    for i in valid:
+        tokens = cache.get(texts[i], cache_language) if cache is not None else None
+        if tokens is None:
+            pending.append(i)
+        else:
+            results[i] = tokens
+    
+    if cache is not None and len(pending) < len(valid):
+        logger.info(f"토큰 캐시 적중: {len(valid) - len(pending)}/{len(valid)}개 문서")
+    
+    token_lists, completes = _preprocess_uncached([texts[i] for i in pending], language, timeout, lemmatize)
+    for i, tokens, complete in zip(pending, token_lists, completes):
+        results[i] = tokens
+        # 대체 토큰화 결과나 시간 초과로 처리하지 못한 문서는 저장하지 않음
+        if cache is not None and complete and tokens is not None:
+            cache.set(texts[i], cache_language, tokens)
+    
+    return results
+
+def _continue_training(model, corpus, pass_index, num_updates):
+    """
+    학습된 모델을 코퍼스로 한 번 더 반복 학습
+    
+    한 번의 호출에서 여러 passes로 학습할 때와 같은 학습률이 되도록 offset에 반복 횟수를 더하고,
+    반복 학습에서는 늘지 않는 num_updates와 문서 수(state.numdocs)를 첫 반복 후의 값으로 유지합니다.
+    LdaMulticore는 update()가 model.passes를 사용하므로 잠시 1로 바꾼 뒤 되돌립니다.
+    """
+    offset = model.offset
+    numdocs = model.state.numdocs
+    passes = model.passes
+    model.offset = offset + pass_index
+    model.num_updates = num_updates
+    # update()가 시작할 때 코퍼스 문서 수를 더하므로 미리 빼 둠
+    model.state.numdocs = numdocs - len(corpus)
+    try:
+        if isinstance(model, models.LdaMulticore):
+            model.passes = 1
+            model.update(corpus)
+        else:
+            model.update(corpus, passes=1)
+    finally:
+        model.offset = offset
+        model.num_updates = num_updates
+        model.state.numdocs = numdocs
+        model.passes = passes
+
+def _corpus_bound(model, corpus):
+    """코퍼스의 단어당 log 우도 (추론에 쓰인 난수 상태는 되돌려 학습 결과에 영향을 주지 않음)"""
+    state = model.random_state.get_state()
+    try:
+        return model.log_perplexity(corpus)
+    finally:
+        model.random_state.set_state(state)
+
+def _train_passes(model, corpus, passes_run, num_updates, max_passes, tol, deadline_at=None):
+    """
+    학습된 모델을 max_passes까지 한 번씩 더 학습 (수렴하거나 deadline_at이 지나면 중단)
+    
+    Returns:
+        tuple: (누적 반복 횟수, 수렴 여부, 시간 예산 초과 여부)
+    """
+    bound = _corpus_bound(model, corpus) if tol > 0 else None
+    while passes_run < max_passes:
+        if deadline_at is not None and time.monotonic() >= deadline_at:
+            return passes_run, False, True
+        
+        _continue_training(model, corpus, passes_run, num_updates)
+        passes_run += 1
+        
+        if tol > 0:
+            new_bound = _corpus_bound(model, corpus)
+            improvement = (new_bound - bound) / max(abs(bound), 1e-12)
+            bound = new_bound
+            if improvement < tol:
+                return passes_run, True, False
+    return passes_run, False, False
+
+def _lda_model_params(corpus, dictionary, num_topics, iterations=50, alpha='auto',
+                      engine=None, workers=None, chunksize=None, **kwargs):
+    """학습 엔진에 맞는 모델 클래스와 생성 인수 - (엔진 이름, 모델 클래스, 인수 딕셔너리)"""
+    config = get_config()
+    engine = engine or getattr(config, "LDA_ENGINE", "single")
+    chunksize = chunksize or getattr(config, "LDA_CHUNKSIZE", None)
+    
+    params = dict(
+        id2word=dictionary,
+        num_topics=num_topics,
+        iterations=iterations,
+        alpha=alpha,
+        random_state=getattr(config, "LDA_RANDOM_STATE", 42),
+        **kwargs
+    )
+    
+    if engine == 'multicore':
+        if workers is None:
+            workers = getattr(config, "LDA_WORKERS", None)
+        workers = int(workers) if workers else max(1, (os.cpu_count() or 2) - 1)
+        if alpha == 'auto':
+            params["alpha"] = 'symmetric'
+        params["workers"] = workers
+        params["chunksize"] = int(chunksize) if chunksize else max(1, -(-len(corpus) // workers))
+        return engine, models.LdaMulticore, params
+    
+    if engine != 'single':
+        logger.warning(f"알 수 없는 LDA_ENGINE: {engine}. single로 학습합니다.")
+    params["chunksize"] = int(chunksize) if chunksize else 2000
+    return 'single', models.LdaModel, params
+
+def _train_lda(corpus, dictionary, num_topics, passes, iterations=50, alpha='auto',
+               engine=None, workers=None, chunksize=None, timeout=None, **kwargs):
+    """
+    LDA 모델 학습 (학습 방식은 config.py 설정을 따름)
+    
+    multicore 엔진은 gensim LdaMulticore로 E-step을 작업 프로세스에 나누어 실행합니다.
+    LdaMulticore는 alpha='auto'를 지원하지 않으므로 이때는 'symmetric'을 사용합니다.
+    코퍼스가 chunksize보다 작으면 묶음이 하나뿐이라 병렬로 처리되지 않으므로,
+    chunksize를 정하지 않으면 문서를 작업 프로세스 수만큼 나눕니다.
+    
+    최소 반복 횟수(LDA_MIN_PASSES) 이후에는 반복마다 코퍼스의 단어당 log 우도(log_perplexity)를
+    계산하여, 개선 비율이 LDA_CONVERGENCE_TOL보다 작으면 수렴한 것으로 보고 학습을 멈춥니다.
+    timeout이 지나면 최소 반복 이후의 반복을 더 하지 않습니다.
+    
+    Args:
+        corpus (list): BoW 코퍼스
+        dictionary (Dictionary): 단어 사전
+        num_topics (int): 토픽 수
+        passes (int): 최대 코퍼스 반복 학습 횟수 (LDA_MAX_PASSES가 있으면 그 값 사용)
+        iterations (int): 문서별 최대 추론 반복 횟수
+        alpha: 문서-토픽 사전 분포
+        engine (str): 'single' 또는 'multicore' (None이면 LDA_ENGINE)
+        workers (int): multicore 작업 프로세스 수 (None이면 LDA_WORKERS)
+        chunksize (int): 한 번에 처리하는 문서 수 (None이면 LDA_CHUNKSIZE)
+        timeout (float): 학습 시간 예산(초, None이면 제한 없음)
+        
+    Returns:
+        tuple: (학습된 모델, 학습 정보 {"engine", "passes_run", "max_passes", "converged", "timed_out"})
+    
+    config.py 설정:
+        LDA_ENGINE: 'single'(기본값, LdaModel) 또는 'multicore'(LdaMulticore)
+        LDA_WORKERS: multicore 작업 프로세스 수 (기본값: CPU 수 - 1, 최소 1)
+        LDA_CHUNKSIZE: 한 번에 처리하는 문서 수 (기본값: single은 2000, multicore는 문서 수 / 작업 프로세스 수)
+        LDA_RANDOM_STATE: 난수 시드 (기본값: 42)
+        LDA_MIN_PASSES: 수렴 여부를 보기 전 최소 반복 횟수 (기본값: 2)
+        LDA_MAX_PASSES: 최대 반복 횟수 (기본값: 호출한 곳의 passes)
+        LDA_CONVERGENCE_TOL: 반복당 단어당 log 우도 개선 비율 기준 (기본값: 0.002, 0이면 항상 최대 반복)
+    """
+    started = time.monotonic()
+    config = get_config()
+    min_passes = max(1, int(getattr(config, "LDA_MIN_PASSES", 2)))
+    max_passes = int(getattr(config, "LDA_MAX_PASSES", None) or passes)
+    tol = float(getattr(config, "LDA_CONVERGENCE_TOL", 0.002))
+    engine, model_class, params = _lda_model_params(corpus, dictionary, num_topics, iterations, alpha,
+                                                    engine, workers, chunksize, **kwargs)
+    
+    # 수렴 판단이나 시간 제한이 없으면 한 번에 최대 반복
+    if (tol <= 0 and timeout is None) or max_passes <= min_passes or not corpus:
+        model = model_class(corpus=corpus, passes=max_passes, **params)
+        return model, {"engine": engine, "passes_run": max_passes, "max_passes": max_passes,
+                       "converged": False, "timed_out": False}
+    
+    # 반복마다 코퍼스 전체의 우도를 직접 계산하므로 gensim의 반복 중 perplexity 기록은 끔
+    model = model_class(corpus=corpus, passes=min_passes, eval_every=0, **params)
+    passes_run, converged, timed_out = _train_passes(
+        model, corpus, min_passes, model.num_updates, max_passes, tol,
+        None if timeout is None else started + timeout)
+    
+    logger.info(f"LDA 학습: {passes_run}/{max_passes}회 반복 "
+                f"({'수렴' if converged else '시간 예산 초과' if timed_out else '최대 반복'})")
+    return model, {"engine": engine, "passes_run": passes_run, "max_passes": max_passes,
+                   "converged": converged, "timed_out": timed_out}
+
+def _get_topic_executor(workers):
+    global _topic_executor
+    with _topic_lock:
+        if _topic_executor is None:
+            # 부모 프로세스의 스레드(요청 엔진 등)를 복제하지 않도록 spawn으로 시작
+            _topic_executor = ProcessPoolExecutor(max_workers=workers,
+                                                  mp_context=multiprocessing.get_context('spawn'))
+            atexit.register(_topic_executor.shutdown, wait=False, cancel_futures=True)
+        return _topic_executor
+
+def _reset_topic_executor():
+    global _topic_executor
+    with _topic_lock:
+        if _topic_executor is not None:
+            _topic_executor.shutdown(wait=False, cancel_futures=True)
+            _topic_executor = None
+
+def _split_heldout(corpus, fraction):
+    """
+    문서마다 토큰 일부를 평가용으로 떼어 (학습 코퍼스, 평가 문서 번호 목록, 평가 코퍼스) 반환
+    
+    단어별 출현 횟수를 펼쳐 round(1 / fraction)번째마다 평가용으로 보내므로 평가 문서는
+    학습 코퍼스에도 나머지 토큰이 들어갑니다. 토큰이 5개 미만인 문서는 모두 학습에 사용합니다.
+    """
+    step = max(2, int(round(1 / fraction)))
+    train, heldout_ids, heldout = [], [], []
+    for bow in corpus:
+        if sum(count for _, count in bow) < 5:
+            train.append(bow)
+            continue
+        train_counts, heldout_counts = defaultdict(int), defaultdict(int)
+        position = 0
+        for word_id, count in bow:
+            for _ in range(count):
+                position += 1
+                if position % step == 0:
+                    heldout_counts[word_id] += 1
+                else:
+                    train_counts[word_id] += 1
+        heldout_ids.append(len(train))
+        train.append(sorted(train_counts.items()))
+        heldout.append(sorted(heldout_counts.items()))
+    return train, heldout_ids, heldout
+
+def _heldout_log_likelihood(model, train_corpus, heldout_ids, heldout_corpus):
+    """
+    평가용 토큰의 단어당 log 우도 (문서 완성 방식)
+    
+    같은 문서의 학습 토큰으로 추론한 토픽 분포와 토픽별 단어 분포로 평가용 토큰의 확률을 계산합니다.
+    변분 하한(log_perplexity)은 토픽 수가 늘수록 커지는 사전 분포 항이 들어가 작은 코퍼스에서는
+    항상 토픽 수가 적은 후보를 고르므로 사용하지 않습니다.
+    """
+    state = model.random_state.get_state()
+    try:
+        gamma, _ = model.inference([train_corpus[i] for i in heldout_ids])
+    finally:
+        model.random_state.set_state(state)
+    theta = gamma / gamma.sum(axis=1, keepdims=True)
+    topic_words = model.get_topics()
+    
+    total, count = 0.0, 0
+    for doc_theta, bow in zip(theta, heldout_corpus):
+        if not bow:
+            continue
+        word_ids = [word_id for word_id, _ in bow]
+        counts = np.array([c for _, c in bow], dtype=float)
+        total += float(np.dot(counts, np.log(doc_theta @ topic_words[:, word_ids] + 1e-12)))
+        count += counts.sum()
+    return total / max(count, 1)
+
+def _load_topic_data(data_path):
+    """
+    토픽 수 후보 학습에 쓰는 코퍼스 (작업 프로세스마다 선택 한 번에 파일에서 한 번만 읽음)
+    
+    Returns:
+        tuple: (학습 코퍼스, 평가 문서 번호 목록, 평가 코퍼스, 단어 사전, 모델 생성 인수)
+    """
+    data = _topic_data.get(data_path)
+    if data is None:
+        with open(data_path, 'rb') as f:
+            data = pickle.load(f)
+        # 이전 선택의 코퍼스는 더 쓰이지 않으므로 정리
+        _topic_data.clear()
+        _topic_data[data_path] = data
+    return data
+
+def _candidate_state(model, num_updates, passes_done):
+    """후보 모델의 다음 단계 학습에 필요한 상태 - 토픽-단어 통계, 문서 수, alpha, 난수 상태, 반복 정보"""
+    return (model.state.sstats, model.state.numdocs, model.alpha, model.random_state.get_state(),
+            num_updates, passes_done)
+
+def _restore_candidate(num_topics, dictionary, params, state):
+    """_candidate_state()로 저장한 상태에서 후보 모델 복원 - (모델, num_updates, 누적 반복 횟수)"""
+    sstats, numdocs, alpha, random_state, num_updates, passes_done = state
+    model = models.LdaModel(id2word=dictionary, num_topics=num_topics, eval_every=0, **params)
+    model.state.sstats = sstats
+    model.state.numdocs = numdocs
+    model.alpha = alpha
+    model.random_state.set_state(random_state)
+    model.sync_state()
+    return model, num_updates, passes_done
+
+def _train_candidate(data_path, num_topics, state, passes):
+    """
+    토픽 수 후보 하나를 passes번 더 학습하고 평가용 토큰의 단어당 log 우도 계산 (작업 프로세스에서 실행)
+    
+    코퍼스는 작업 프로세스가 data_path에서 한 번만 읽고, 단계마다 주고받는 것은 후보의 상태뿐입니다.
+    
+    Returns:
+        tuple: (_candidate_state() 상태, 평가용 토큰 단어당 log 우도)
+    """
+    train_corpus, heldout_ids, heldout_corpus, dictionary, params = _load_topic_data(data_path)
+    if state is None:
+        model = models.LdaModel(corpus=train_corpus, id2word=dictionary, num_topics=num_topics,
+                                passes=passes, eval_every=0, **params)
+        num_updates, passes_done = model.num_updates, passes
+    else:
+        model, num_updates, passes_done = _restore_candidate(num_topics, dictionary, params, state)
+        for _ in range(passes):
+            _continue_training(model, train_corpus, passes_done, num_updates)
+            passes_done += 1
+    score = _heldout_log_likelihood(model, train_corpus, heldout_ids, heldout_corpus)
+    return _candidate_state(model, num_updates, passes_done), score
+
+def select_num_topics(corpus, dictionary, candidates, passes=10, iterations=50, alpha='auto', timeout=None):
+    """
+    토픽 수 후보들을 함께 학습하여 평가용 토큰의 단어당 log 우도가 가장 높은 토픽 수 선택
+    (최고 후보와 LDA_AUTO_TIE_MARGIN 비율 이내인 후보가 있으면 그중 토픽 수가 가장 적은 후보)
+    
+    문서마다 LDA_AUTO_HOLDOUT 비율의 토큰을 떼어 두고 나머지로 학습합니다.
+    후보마다 LDA_AUTO_ROUND_PASSES번씩 나누어 학습하고, 매 단계 후 평가용 토큰 우도가
+    가장 좋은 후보보다 LDA_AUTO_PRUNE_MARGIN 비율 이상 낮은 후보는 더 학습하지 않고 제외합니다.
+    개선 비율이 LDA_CONVERGENCE_TOL보다 작아진 후보는 학습을 멈추고 비교에만 남습니다.
+    
+    후보는 단계마다 작업 프로세스 풀에 나눠 보내므로, 작업 프로세스가 후보 수만큼 있으면
+    요청 시간은 후보 하나를 학습하는 시간과 비슷합니다. 코퍼스는 임시 파일로 한 번만 전달하고
+    단계마다 후보의 상태(토픽-단어 통계, alpha, 난수 상태)만 주고받습니다.
+    작업 프로세스 안에서는 LdaModel(single 엔진)로 학습합니다.
+    
+    선택한 토픽 수의 모델은 평가용 토큰을 포함한 전체 코퍼스로 이어서 학습(최소 1회,
+    최대 LDA_AUTO_ROUND_PASSES회)한 뒤 반환하므로, 토픽과 문서별 분포에는 모든 토큰이 반영됩니다.
+    
+    Args:
+        corpus (list): BoW 코퍼스 (평가용 토큰을 떼어 내기 전)
+        dictionary (Dictionary): 단어 사전
+        candidates (list): 토픽 수 후보
+        passes (int): 후보별 최대 반복 학습 횟수 (LDA_MAX_PASSES가 있으면 그 값 사용)
+        iterations (int): 문서별 최대 추론 반복 횟수
+        alpha: 문서-토픽 사전 분포
+        timeout (float): 시간 예산(초, None이면 제한 없음) - 지나면 진행 중인 단계를 기다리지 않고
+                         그때까지의 점수로 선택 (첫 단계와 전체 코퍼스 학습 1회는 항상 실행)
+        
+    Returns:
+        tuple: (전체 코퍼스로 학습한 선택된 모델 또는 None, 선택 정보
+                {"num_topics", "bounds", "pruned", "passes_run", "full_corpus_passes", "max_passes",
+                 "converged", "timed_out"})
+               - 평가할 토큰이 없으면 (None, {})
+    
+    config.py 설정:
+        LDA_AUTO_HOLDOUT: 평가용으로 떼어 두는 토큰 비율 (기본값: 0.2)
+        LDA_AUTO_ROUND_PASSES: 후보 비교 사이의 반복 학습 횟수 (기본값: 2)
+        LDA_AUTO_PRUNE_MARGIN: 최고 후보보다 이 비율 이상 낮으면 제외 (기본값: 0.01)
+        LDA_AUTO_TIE_MARGIN: 최고 후보와 이 비율 이내이면 토픽 수가 적은 후보 선택 (기본값: 0.002)
+        LDA_AUTO_WORKERS: 작업 프로세스 수 (기본값: 후보 수와 CPU 수 중 작은 값, 1 이하이면 프로세스 내 처리)
+    """
+    started = time.monotonic()
+    deadline_at = None if timeout is None else started + timeout
+    config = get_config()
+    max_passes = int(getattr(config, "LDA_MAX_PASSES", None) or passes)
+    round_passes = max(1, int(getattr(config, "LDA_AUTO_ROUND_PASSES", 2)))
+    margin = float(getattr(config, "LDA_AUTO_PRUNE_MARGIN", 0.01))
+    tol = float(getattr(config, "LDA_CONVERGENCE_TOL", 0.002))
+    workers = getattr(config, "LDA_AUTO_WORKERS", None)
+    workers = min(len(candidates), os.cpu_count() or 1) if workers is None else int(workers)
+    
+    train_corpus, heldout_ids, heldout_corpus = _split_heldout(
+        corpus, float(getattr(config, "LDA_AUTO_HOLDOUT", 0.2)))
+    if not heldout_corpus:
+        return None, {}
+    _, _, params = _lda_model_params(train_corpus, dictionary, candidates[0], iterations, alpha, engine='single')
+    for name in ("num_topics", "id2word"):
+        del params[name]
+    
+    # 현재 프로세스에서 학습할 때는 파일을 읽지 않도록 같은 키로 등록하고,
+    # 작업 프로세스를 쓸 때만 코퍼스를 임시 파일에 한 번 저장
+    fd, data_path = tempfile.mkstemp(prefix='seox-lda-', suffix='.pkl')
+    os.close(fd)
+    data = (train_corpus, heldout_ids, heldout_corpus, dictionary, params)
+    _topic_data[data_path] = data
+    executor = None
+    if workers > 1 and len(candidates) > 1:
+        with open(data_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        executor = _get_topic_executor(workers)
+    
+    # 후보별 상태: _candidate_state() 상태, 평가 우도
+    states = {k: None for k in candidates}
+    scores = {}
+    active = list(candidates)
+    pruned, converged = [], []
+    timed_out = False
+    
+    try:
+        while active:
+            first_round = not scores
+            # 첫 단계는 항상 학습하고, 이후에는 시간 예산이 남아 있을 때만 계속
+            if not first_round and deadline_at is not None and time.monotonic() >= deadline_at:
+                timed_out = True
+                break
+            round_size = min(round_passes, max_passes - max(states[k][5] if states[k] else 0 for k in active))
+            if round_size <= 0:
+                break
+            
+            results = {}
+            if executor is not None and len(active) > 1:
+                try:
+                    futures = {executor.submit(_train_candidate, data_path, k, states[k], round_size): k
+                               for k in active}
+                    wait(futures, timeout=None if first_round or deadline_at is None
+                         else max(0.0, deadline_at - time.monotonic()))
+                    for future, k in futures.items():
+                        if future.done():
+                            results[k] = future.result()
+                        else:
+                            future.cancel()
+                except Exception as e:
+                    # 작업 프로세스 오류 - 풀을 다시 만들도록 정리하고 남은 후보는 현재 프로세스에서 처리
+                    logger.error(f"토픽 수 후보 학습 작업 프로세스 오류: {str(e)}")
+                    _reset_topic_executor()
+                    executor = None
+                    results = {k: _train_candidate(data_path, k, states[k], round_size) for k in active}
+            else:
+                for k in active:
+                    if not first_round and deadline_at is not None and time.monotonic() >= deadline_at:
+                        break
+                    results[k] = _train_candidate(data_path, k, states[k], round_size)
+            
+            # 시간 안에 이번 단계를 끝내지 못한 후보는 이전 단계의 점수로 비교
+            if len(results) < len(active):
+                timed_out = True
+            for k, (state, score) in results.items():
+                previous = scores.get(k)
+                states[k], scores[k] = state, score
+                if previous is not None and tol > 0 and (score - previous) / max(abs(previous), 1e-12) < tol:
+                    converged.append(k)
+            
+            best = max(scores[k] for k in candidates if states[k] is not None)
+            for k in list(active):
+                if (best - scores[k]) / max(abs(best), 1e-12) > margin:
+                    pruned.append(k)
+                    active.remove(k)
+                    states[k] = None  # 제외된 후보의 상태는 바로 해제
+                elif k in converged or k not in results:
+                    active.remove(k)
+    finally:
+        _topic_data.pop(data_path, None)
+        try:
+            os.remove(data_path)
+        except OSError:
+            pass
+    
+    # 평가 우도는 실제 토픽 수를 넘어서면 거의 같아지므로, 최고 후보와 차이가 작으면 토픽 수가 적은 후보 선택
+    scored = [k for k in candidates if states[k] is not None]
+    best = max(scores[k] for k in scored)
+    tie_margin = float(getattr(config, "LDA_AUTO_TIE_MARGIN", 0.002))
+    selected = min(k for k in scored if (best - scores[k]) / max(abs(best), 1e-12) <= tie_margin)
+    
+    # 선택한 모델을 평가용 토큰까지 포함한 전체 코퍼스로 이어서 학습 (첫 반복은 항상 실행)
+    model, num_updates, passes_done = _restore_candidate(selected, dictionary, params, states[selected])
+    _continue_training(model, corpus, passes_done, num_updates)
+    full_passes, _, full_timed_out = _train_passes(model, corpus, passes_done + 1, num_updates,
+                                                   passes_done + round_passes, tol, deadline_at)
+    
+    logger.info(f"토픽 수 자동 선택: {selected}개 (후보 {list(candidates)}, 제외 {pruned}, "
+                f"전체 코퍼스 {full_passes - passes_done}회 반복)")
+    return model, {
+        "num_topics": selected,
+        "bounds": {k: round(float(scores[k]), 4) for k in candidates if k in scores},
+        "pruned": pruned,
+        "passes_run": passes_done,
+        "full_corpus_passes": full_passes - passes_done,
+        "max_passes": max_passes,
+        "converged": selected in converged,
+        "timed_out": timed_out or full_timed_out
+    }
+
+def _adjust_num_topics(token_count, num_topics):
+    """전체 토큰 수에 맞춘 토픽 수"""
+    if token_count < 100:
+        # 토큰이 매우 적은 경우에만 토픽 수 조정
+        if token_count < 30:
+            num_topics = min(2, num_topics)
+            logger.warning(f"토큰 수({token_count})가 적어 토픽 수를 {num_topics}로 조정합니다.")
+        elif token_count < 70:
+            num_topics = min(3, num_topics)
+            logger.warning(f"토큰 수({token_count})가 적어 토픽 수를 {num_topics}로 조정합니다.")
+        else:
+            # 100개 미만이지만 70개 이상이면 최소 4개 토픽
+            num_topics = min(4, num_topics)
+            logger.warning(f"토큰 수({token_count})가 충분하지 않아 토픽 수를 {num_topics}로 조정합니다.")
+    elif num_topics != 5:
+        # 토큰이 충분하면 강제로 5개 토픽으로 설정
+        num_topics = 5
+        logger.info(f"토픽 수를 기본값 5로 설정합니다. (충분한 토큰: {token_count}개)")
+    return num_topics
 
 def generate_lda_model(tokens, num_topics=5, language='en'):
     """
@@ -297,24 +984,7 @@ def generate_lda_model(tokens, num_topics=5, language='en'):
     try:
         # 토픽 수를 기본 5개로 설정하고 토큰이 적을 때만 조정
         token_count = len(tokens)
-        orig_num_topics = num_topics
-        
-        if token_count < 100:
-            # 토큰이 매우 적은 경우에만 토픽 수 조정
-            if token_count < 30:
-                num_topics = min(2, num_topics)
-                logger.warning(f"토큰 수({token_count})가 적어 토픽 수를 {num_topics}로 조정합니다.")
-            elif token_count < 70:
-                num_topics = min(3, num_topics)
-                logger.warning(f"토큰 수({token_count})가 적어 토픽 수를 {num_topics}로 조정합니다.")
-            else:
-                # 100개 미만이지만 70개 이상이면 최소 4개 토픽
-                num_topics = min(4, num_topics)
-                logger.warning(f"토큰 수({token_count})가 충분하지 않아 토픽 수를 {num_topics}로 조정합니다.")
-        elif orig_num_topics != 5:
-            # 토큰이 충분하면 강제로 5개 토픽으로 설정
-            num_topics = 5
-            logger.info(f"토픽 수를 기본값 5로 설정합니다. (충분한 토큰: {token_count}개)")
+        num_topics = _adjust_num_topics(token_count, num_topics)
         
         # 빈도수가 너무 적거나 많은 단어 필터링
         frequency = defaultdict(int)
@@ -348,15 +1018,7 @@ def generate_lda_model(tokens, num_topics=5, language='en'):
             num_topics = min(2, num_topics)
         
         # LDA 모델 생성
-        lda_model = models.LdaModel(
-            corpus=corpus,
-            id2word=dictionary,
-            num_topics=num_topics,
-            passes=10,
-            alpha='auto',
-            iterations=50,
-            random_state=42
-        )
+        lda_model, _ = _train_lda(corpus, dictionary, num_topics, passes=10, iterations=50, alpha='auto')
         
         # 토픽 추출
         topics = {}
@@ -376,6 +1038,103 @@ def generate_lda_model(tokens, num_topics=5, language='en'):
         logger.error(traceback.format_exc())
         return {}
 
+def _topic_candidates():
+    """LDA_AUTO_TOPICS가 켜져 있으면 토픽 수 후보 목록, 아니면 None"""
+    config = get_config()
+    if not getattr(config, "LDA_AUTO_TOPICS", False):
+        return None
+    candidates = getattr(config, "LDA_TOPIC_CANDIDATES", None) or [3, 4, 5, 6, 7, 8]
+    if isinstance(candidates, str):
+        candidates = candidates.split(',')
+    return sorted({int(k) for k in candidates if int(k) >= 2}) or None
+
+def generate_document_topics(token_lists, num_topics=5, language='en', timeout=None):
+    """
+    문서별 코퍼스로 LDA 모델을 한 번 학습하여 토픽과 문서별 토픽 분포를 함께 계산합니다.
+    
+    토픽 키워드/가중치와 문서별 분포가 같은 모델에서 나오므로 서로 일치합니다.
+    
+    Args:
+        token_lists (list): 문서별 전처리된 토큰 리스트
+        num_topics (int): 추출할 토픽 수 (전체 토큰이 적으면 줄임)
+        language (str): 텍스트 언어 ('en' 또는 'ko')
+        timeout (float): 학습 시간 예산(초, None이면 제한 없음) - 지나면 반복 학습을 더 하지 않고
+                         학습 정보의 timed_out을 True로 설정
+        
+    Returns:
+        tuple: (토픽 ID -> (키워드 리스트, 가중치) 딕셔너리,
+                문서별 [(토픽 ID, 비율)] 목록 - 사전에 남은 단어가 없는 문서는 None,
+                학습 정보 {"engine", "passes_run", "max_passes", "converged", "timed_out", "num_topics"})
+    
+    config.py 설정:
+        LDA_AUTO_TOPICS: True이면 num_topics 대신 LDA_TOPIC_CANDIDATES 중에서 토픽 수를 선택
+                         (select_num_topics() 참고, 전체 토큰이 100개 미만이면 사용하지 않음)
+        LDA_TOPIC_CANDIDATES: 토픽 수 후보 (기본값: [3, 4, 5, 6, 7, 8])
+    """
+    started = time.monotonic()
+    token_count = sum(len(tokens) for tokens in token_lists)
+    if not token_count:
+        logger.warning("토큰이 없어 LDA 모델을 생성할 수 없습니다.")
+        return {}, [None] * len(token_lists), {}
+    
+    try:
+        num_topics = _adjust_num_topics(token_count, num_topics)
+        
+        # 딕셔너리 생성 - 대부분의 문서에 나오는 단어는 토픽 구분에 도움이 되지 않으므로 제외
+        dictionary = corpora.Dictionary(token_lists)
+        if len(token_lists) > 1:
+            dictionary.filter_extremes(no_below=1, no_above=0.9)
+        
+        # 최소 단어 수 확인
+        if len(dictionary) < 5:
+            logger.warning(f"딕셔너리 크기가 너무 작습니다: {len(dictionary)}. 필터링 기준을 완화합니다.")
+            dictionary = corpora.Dictionary(token_lists)
+        
+        corpus = [dictionary.doc2bow(tokens) for tokens in token_lists]
+        if sum(len(bow) for bow in corpus) < 3:
+            logger.warning("코퍼스 데이터가 부족합니다. 토픽 수를 줄입니다.")
+            num_topics = min(2, num_topics)
+        
+        # LDA 모델 생성 (빈 문서는 학습에서 제외)
+        remaining = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+        lda_model = None
+        candidates = _topic_candidates() if token_count >= 100 else None
+        if candidates:
+            lda_model, selection = select_num_topics([bow for bow in corpus if bow], dictionary, candidates,
+                                                     passes=10, iterations=50, alpha='auto', timeout=remaining)
+            if lda_model is not None:
+                num_topics = selection["num_topics"]
+                training = {"engine": "auto", "passes_run": selection["passes_run"], "max_passes": selection["max_passes"],
+                            "converged": selection["converged"], "timed_out": selection["timed_out"],
+                            "auto_topics": {"candidates": candidates, "bounds": selection["bounds"],
+                                            "pruned": selection["pruned"],
+                                            "full_corpus_passes": selection["full_corpus_passes"]}}
+        if lda_model is None:
+            lda_model, training = _train_lda([bow for bow in corpus if bow], dictionary, num_topics,
+                                             passes=10, iterations=50, alpha='auto', timeout=remaining)
+        
+        # 토픽 추출
+        topics = {}
+        for i in range(num_topics):
+            # 각 토픽의 주요 키워드 추출
+            topic_keywords = lda_model.show_topic(i, topn=10)
+            keywords = [word for word, prob in topic_keywords]
+            weight = float(sum(prob for _, prob in topic_keywords))
+            topics[i] = (keywords, weight)
+        
+        # 같은 모델로 문서별 토픽 분포 계산
+        doc_topics = [lda_model.get_document_topics(bow) if bow else None for bow in corpus]
+        
+        logger.info(f"LDA 모델 생성 완료: {num_topics}개 토픽, {len(corpus)}개 문서, {training['passes_run']}회 반복")
+        training["num_topics"] = num_topics
+        return topics, doc_topics, training
+        
+    except Exception as e:
+        logger.error(f"LDA 모델 생성 중 오류 발생: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return {}, [None] * len(token_lists), {}
+
 def perform_lda(texts, language='en', num_topics=5):
     """
     Perform LDA topic modeling on the extracted content
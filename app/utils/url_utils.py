@@ -0,0 +1,88 @@
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 페이지 내용과 무관한 추적용 쿼리 매개변수
+TRACKING_PARAMS = {
+    'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'ref_src', 'spm', 'srsltid'
+}
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url):
+    """
+    중복 판정을 위한 URL 정규화
+
+    - http/https 구분 없이 https로 통일
+    - 호스트 소문자 변환, 기본 포트 제거
+    - 경로 끝의 슬래시 제거 (루트 경로 제외)
+    - 추적용 쿼리 매개변수(utm_*, gclid 등) 제거 및 나머지 매개변수 정렬
+    - 프래그먼트(#...) 제거
+
+    Args:
+        url (str): 원본 URL
+
+    Returns:
+        str: 정규화된 URL (해석할 수 없는 URL은 앞뒤 공백만 제거하여 반환)
+    """
+    url = (url or '').strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS:
+        return url
+
+    host = (parts.hostname or '').lower()
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def url_fingerprint(url):
+    """정규화된 URL의 고정 길이 해시 (캐시 키 등에 사용)"""
+    return hashlib.sha1(canonicalize_url(url).encode('utf-8')).hexdigest()
+
+
+class UrlIndex:
+    """정규화된 URL 기준 중복 검사용 해시 인덱스 (조회/추가 O(1))"""
+
+    def __init__(self, urls=()):
+        self._seen = set()
+        for url in urls:
+            self.add(url)
+
+    def add(self, url):
+        """
+        URL을 인덱스에 추가
+
+        Returns:
+            bool: 새로운 URL이면 True, 이미 있는 URL이면 False
+        """
+        key = canonicalize_url(url)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+    def __contains__(self, url):
+        return canonicalize_url(url) in self._seen
+
+    def __len__(self):
+        return len(self._seen)
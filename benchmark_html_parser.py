@@ -0,0 +1,121 @@
+import argparse
+import glob
+import os
+import sys
+import time
+import zlib
+from collections import Counter
+
+from app.settings import get_config
+from app.utils.disk_cache import CACHE_ROOT
+from app.utils.content_extractor import decode_html, is_binary_content
+from app.utils.html_parser import PARSER_BACKENDS, extract_text_from_html
+
+
+def load_pages(paths=None):
+    """
+    벤치마크에 사용할 HTML 문서 로드
+
+    경로를 지정하지 않으면 페이지 캐시에 저장된 본문(cache/pages/body)을 사용합니다.
+
+    Returns:
+        list: (이름, HTML 문자열) 목록
+    """
+    pages = []
+
+    if paths:
+        for pattern in paths:
+            for path in sorted(glob.glob(pattern)):
+                with open(path, 'rb') as f:
+                    pages.append((path, decode_html(f.read(), '', path)))
+        return pages
+
+    config = get_config()
+    body_dir = os.path.join(getattr(config, "PAGE_CACHE_DIR", os.path.join(CACHE_ROOT, 'pages')), 'body')
+    # DiskCache는 본문을 body/<해시 앞 2자리>/<해시>.bin에 저장
+    for path in sorted(glob.glob(os.path.join(body_dir, '*', '*.bin'))):
+        with open(path, 'rb') as f:
+            try:
+                content = zlib.decompress(f.read())
+            except zlib.error:
+                continue
+        if is_binary_content('', content[:4096]):
+            continue
+        pages.append((os.path.basename(path), decode_html(content, '', path)))
+
+    return pages
+
+
+def text_similarity(a, b):
+    """두 추출 결과의 단어 빈도 기준 유사도 (0.0 ~ 1.0)"""
+    words_a, words_b = Counter(a.split()), Counter(b.split())
+    total = max(sum(words_a.values()), sum(words_b.values()))
+    if total == 0:
+        return 1.0
+    return sum((words_a & words_b).values()) / total
+
+
+def benchmark_html_parser(paths=None, repeat=3):
+    """
+    HTML 파서 백엔드별 텍스트 추출 시간과 결과 일치도를 비교합니다.
+
+    Args:
+        paths (list): HTML 파일 경로 또는 glob 패턴 (없으면 페이지 캐시 사용)
+        repeat (int): 문서별 반복 횟수 (가장 빠른 시간 사용)
+    """
+    pages = load_pages(paths)
+    if not pages:
+        sys.exit("벤치마크할 HTML 문서가 없습니다. 검색을 한 번 실행하여 페이지 캐시를 채우거나 파일을 지정하세요.")
+
+    backends = sorted(PARSER_BACKENDS)
+    print(f"문서 {len(pages)}개, 백엔드: {', '.join(backends)}, 반복 {repeat}회")
+    print("-" * 80)
+
+    timings = {backend: [] for backend in backends}
+    outputs = {backend: [] for backend in backends}
+
+    for name, html in pages:
+        for backend in backends:
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                text = extract_text_from_html(html, backend=backend)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[backend].append(best)
+            outputs[backend].append(text)
+
+    for backend in backends:
+        values = sorted(timings[backend])
+        total = sum(values)
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        print(f"{backend:>5}: 전체 {total * 1000:.1f}ms, 문서당 평균 {total / len(values) * 1000:.2f}ms, "
+              f"p95 {p95 * 1000:.2f}ms")
+
+    if 'bs4' in backends and 'lxml' in backends:
+        print(f"\nlxml 속도 향상: {sum(timings['bs4']) / max(sum(timings['lxml']), 1e-9):.1f}배")
+
+        identical = 0
+        similarities = []
+        for (name, _), bs4_text, lxml_text in zip(pages, outputs['bs4'], outputs['lxml']):
+            if bs4_text == lxml_text:
+                identical += 1
+                similarities.append(1.0)
+                continue
+            similarity = text_similarity(bs4_text, lxml_text)
+            similarities.append(similarity)
+            if similarity < 0.95:
+                print(f"  차이 큼: {name} (유사도 {similarity:.2f}, bs4 {len(bs4_text)}자 / lxml {len(lxml_text)}자)")
+
+        print(f"결과 일치: {identical}/{len(pages)}개 동일, 평균 유사도 {sum(similarities) / len(similarities):.3f}")
+
+
+if __name__ == "__main__":
+    # 명령행 인수 파싱
+    parser = argparse.ArgumentParser(description='HTML 파서 백엔드 벤치마크')
+    parser.add_argument('paths', nargs='*', help='HTML 파일 경로 또는 glob 패턴 (기본값: 페이지 캐시)')
+    parser.add_argument('--repeat', '-r', type=int, default=3, help='문서별 반복 횟수 (기본값: 3)')
+
+    args = parser.parse_args()
+
+    benchmark_html_parser(paths=args.paths, repeat=args.repeat)
@@ -0,0 +1,122 @@
+import argparse
+import os
+import random
+import time
+
+from gensim import corpora
+
+from benchmark_html_parser import load_pages
+from app.utils.html_parser import extract_text_from_html
+from app.utils.topic_modeling import _train_lda, preprocess_many
+
+
+def load_corpus_from_cache(docs=35, language='en'):
+    """
+    페이지 캐시에 저장된 문서로 토큰 목록 생성 (토큰이 충분한 문서만 사용)
+
+    Returns:
+        list: 문서별 토큰 목록 (최대 docs개)
+    """
+    texts = []
+    for _, html in load_pages():
+        text = extract_text_from_html(html)
+        if len(text) >= 500:
+            texts.append(text)
+        if len(texts) >= docs:
+            break
+    return [tokens for tokens in preprocess_many(texts, language) if tokens and len(tokens) > 5]
+
+
+def make_synthetic_corpus(docs=35, doc_tokens=1500, vocab_size=5000, topics=8, seed=0):
+    """
+    검색 결과 문서와 비슷한 크기의 합성 코퍼스 생성
+
+    토픽마다 단어 분포(Zipf 분포)를 두고, 문서는 주 토픽 하나와 다른 토픽 몇 개를 섞어 만듭니다.
+    """
+    rng = random.Random(seed)
+    vocab = [f"word{i}" for i in range(vocab_size)]
+    zipf_weights = [1.0 / (rank + 1) for rank in range(vocab_size // topics * 2)]
+    topic_words = [rng.sample(vocab, len(zipf_weights)) for _ in range(topics)]
+
+    corpus = []
+    for _ in range(docs):
+        main_topic = rng.randrange(topics)
+        mixture = [main_topic] * 6 + rng.sample(range(topics), 3)
+        tokens = []
+        for _ in range(doc_tokens):
+            topic = rng.choice(mixture)
+            tokens.append(rng.choices(topic_words[topic], weights=zipf_weights)[0])
+        corpus.append(tokens)
+    return corpus
+
+
+def benchmark_lda(docs=35, num_topics=5, passes=10, repeat=3, synthetic=False, language='en', max_workers=None):
+    """
+    LDA 학습 엔진(single / multicore 작업 프로세스 수별) 학습 시간을 비교합니다.
+
+    Args:
+        docs (int): 코퍼스 문서 수
+        num_topics (int): 토픽 수
+        passes (int): 학습 반복 횟수
+        repeat (int): 설정별 반복 횟수 (가장 빠른 시간 사용)
+        synthetic (bool): 페이지 캐시 대신 합성 코퍼스 사용
+        language (str): 페이지 캐시 문서의 전처리 언어
+        max_workers (int): 비교할 최대 작업 프로세스 수 (기본값: CPU 수)
+    """
+    token_lists = [] if synthetic else load_corpus_from_cache(docs, language)
+    source = "페이지 캐시"
+    if len(token_lists) < 10:
+        if not synthetic:
+            print(f"페이지 캐시에서 문서를 {len(token_lists)}개만 찾아 합성 코퍼스를 사용합니다.")
+        token_lists = make_synthetic_corpus(docs)
+        source = "합성"
+
+    dictionary = corpora.Dictionary(token_lists)
+    dictionary.filter_extremes(no_below=1, no_above=0.9)
+    corpus = [bow for bow in (dictionary.doc2bow(tokens) for tokens in token_lists) if bow]
+
+    print(f"{source} 코퍼스: 문서 {len(corpus)}개, 토큰 {sum(len(tokens) for tokens in token_lists)}개, "
+          f"사전 {len(dictionary)}개 단어 / 토픽 {num_topics}개, passes {passes}, 반복 {repeat}회")
+    print("-" * 80)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    configurations = [('single', None)]
+    workers = 1
+    while workers <= max_workers:
+        configurations.append(('multicore', workers))
+        workers *= 2
+    if configurations[-1][1] != max_workers:
+        configurations.append(('multicore', max_workers))
+
+    baseline = None
+    for engine, workers in configurations:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            model, training = _train_lda(corpus, dictionary, num_topics, passes=passes,
+                                         engine=engine, workers=workers)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        baseline = baseline or best
+        bound = model.log_perplexity(corpus)
+        label = engine if workers is None else f"{engine} x{workers}"
+        print(f"{label:>14}: {best * 1000:.0f}ms (single 대비 {baseline / best:.2f}배), "
+              f"{training['passes_run']}/{training['max_passes']}회 반복, 단어당 log 우도 {bound:.3f}")
+
+
+if __name__ == "__main__":
+    # 명령행 인수 파싱
+    parser = argparse.ArgumentParser(description='LDA 학습 엔진 벤치마크')
+    parser.add_argument('--docs', '-d', type=int, default=35, help='코퍼스 문서 수 (기본값: 35)')
+    parser.add_argument('--topics', '-t', type=int, default=5, help='토픽 수 (기본값: 5)')
+    parser.add_argument('--passes', '-p', type=int, default=10, help='학습 반복 횟수 (기본값: 10)')
+    parser.add_argument('--repeat', '-r', type=int, default=3, help='설정별 반복 횟수 (기본값: 3)')
+    parser.add_argument('--synthetic', action='store_true', help='페이지 캐시 대신 합성 코퍼스 사용')
+    parser.add_argument('--language', '-l', default='en', help='페이지 캐시 문서 언어 (기본값: en)')
+    parser.add_argument('--max-workers', '-w', type=int, default=None, help='최대 작업 프로세스 수 (기본값: CPU 수)')
+
+    args = parser.parse_args()
+
+    benchmark_lda(docs=args.docs, num_topics=args.topics, passes=args.passes, repeat=args.repeat,
+                  synthetic=args.synthetic, language=args.language, max_workers=args.max_workers)
@@ -35,23 +35,24 @@ def debug_search_results(query="검색엔진최적화", language="ko", num_resul
     print("\n\n[2] 검색 결과에서 콘텐츠 추출")
     print("-" * 80)
     
-    content_list = extract_content(search_results[:3])  # 처리 시간 단축을 위해 처음 3개만 처리
+    documents = extract_content(search_results[:3])  # 처리 시간 단축을 위해 처음 3개만 처리
     
-    print(f"추출된 콘텐츠 {len(content_list)}개")
+    print(f"추출된 콘텐츠 {len(documents)}개")
     
-    for i, content in enumerate(content_list, 1):
-        print(f"\n콘텐츠 #{i}:")
-        content_preview = content[:300].replace('\n', ' ')
-        print(f"{content_preview}{'...' if len(content) > 300 else ''}")
-        print(f"길이: {len(content)} 문자")
+    for i, document in enumerate(documents, 1):
+        print(f"\n콘텐츠 #{i}: {document.url} ({document.strategy}, 품질 점수: {document.score:.2f})")
+        content_preview = document.preview[:300].replace('\n', ' ')
+        print(f"{content_preview}{'...' if len(document.content) > 300 else ''}")
+        print(f"길이: {len(document.content)} 문자")
     
     # 3. 텍스트 전처리 및 토큰화
     print("\n\n[3] 콘텐츠 텍스트 전처리 및 토큰화")
     print("-" * 80)
     
     all_tokens = []
-    for i, content in enumerate(content_list, 1):
-        if not isinstance(content, str) or len(content.strip()) < 50:
+    for i, document in enumerate(documents, 1):
+        content = document.content
+        if len(content.strip()) < 50:
             print(f"콘텐츠 #{i}: 전처리 건너뜀 (너무 짧거나 유효하지 않은 콘텐츠)")
             continue
             
@@ -104,14 +105,13 @@ def debug_search_results(query="검색엔진최적화", language="ko", num_resul
     
     # 콘텐츠 저장
     with open("extracted_content.json", "w", encoding="utf-8") as f:
-        content_data = [{"url": result.get("url", ""), "content_preview": content[:500]} 
-                        for result, content in zip(search_results[:len(content_list)], content_list)]
+        content_data = [document.to_dict() for document in documents]
         json.dump(content_data, f, ensure_ascii=False, indent=2)
     
     print("검색 결과를 'search_results.json' 파일에 저장했습니다.")
     print("추출된 콘텐츠를 'extracted_content.json' 파일에 저장했습니다.")
     
-    return search_results, content_list, all_tokens
+    return search_results, documents, all_tokens
 
 if __name__ == "__main__":
     # 명령행 인수 파싱
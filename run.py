@@ -1,6 +1,10 @@
+import multiprocessing
+
 from app import create_app
 
-app = create_app()
+# 작업 프로세스(spawn)는 주 모듈을 다시 import하므로 앱은 주 프로세스에서만 생성
+# (flask --app run, gunicorn run:app에서 쓰는 WSGI 객체)
+app = create_app() if multiprocessing.parent_process() is None else None
 
 if __name__ == '__main__':
-    app.run(debug=True, port=8080)
\ No newline at end of file
+    app.run(debug=True, port=8080)